@@ -0,0 +1,3 @@
+"""Performance benchmarks for the pipeline hot paths."""
+
+__all__ = ["bench_pipeline", "bench_cli_startup"]
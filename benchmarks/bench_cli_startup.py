@@ -0,0 +1,139 @@
+"""
+CLI start-up benchmark.
+
+Runs ``python -m src.cli.main`` with ``--help`` and a few light subcommand
+invocations in fresh interpreters, reports the median wall time of each and
+fails when any exceeds the budget.  Besides the help forms (which exit while
+parsing arguments) it runs real light subcommands in a temporary workspace,
+so the lazily imported subcommand modules are measured too, and fails when
+any of them pulls in a library reserved for the heavy subcommands::
+
+    python -m benchmarks.bench_cli_startup --budget 0.5 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Invocations that must stay light: top-level help and per-subcommand help.
+LIGHT_INVOCATIONS: List[List[str]] = [
+    ["--help"],
+    ["ingest", "--help"],
+    ["train", "--help"],
+    ["predict", "--help"],
+    ["backtest", "--help"],
+    ["serve", "--help"],
+]
+
+# Light subcommands run for real (from a temporary working directory, so the
+# relative data paths of base.yaml point into it).
+LIGHT_RUNS: List[List[str]] = [
+    ["backtest", "--seasons", "2019-2020", "--models", "elo", "--protocol", "loso",
+     "--scoring_systems", "espn", "--export", "outputs/backtests"],
+]
+
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "scipy", "streamlit", "jinja2")
+# Only the model, optimisation and dashboard subcommands may import these.
+FORBIDDEN_IN_LIGHT = ("sklearn", "scipy", "streamlit")
+
+# Runs the CLI as ``python -m`` would and reports the heavy packages it imported.
+_RUNNER = (
+    "import atexit, runpy, sys\n"
+    f"heavy = set({HEAVY_MODULES!r})\n"
+    "atexit.register(lambda: print('HEAVY:' + ' '.join(sorted({m.split('.')[0] for m in sys.modules} & heavy)),"
+    " file=sys.stderr))\n"
+    "sys.argv = ['src.cli.main'] + sys.argv[1:]\n"
+    "runpy.run_module('src.cli.main', run_name='__main__', alter_sys=True)\n"
+)
+
+
+def time_invocation(argv: List[str], repeat: int = 5, cwd: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Median and best wall time of ``python -m src.cli.main <argv>``, plus the
+    heavy packages it imported (``imported``), run from ``cwd`` (default:
+    the repository root).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]))}
+    if cwd is not None:
+        env["MM_CACHE_DIR"] = str(Path(cwd) / "cache")
+    samples, imported = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", _RUNNER, *argv], cwd=cwd or REPO_ROOT, env=env, capture_output=True, text=True
+        )
+        samples.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(f"CLI {' '.join(argv)} failed: {proc.stderr.strip()}")
+        marker = [line for line in proc.stderr.splitlines() if line.startswith("HEAVY:")]
+        imported = marker[-1][len("HEAVY:"):].split() if marker else []
+    return {
+        "argv": argv,
+        "median_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "imported": imported,
+    }
+
+
+def light_runs(repeat: int = 5) -> List[Dict[str, Any]]:
+    """Time each of :data:`LIGHT_RUNS` in a fresh temporary workspace."""
+    results = []
+    for argv in LIGHT_RUNS:
+        with tempfile.TemporaryDirectory(prefix="mm-cli-bench-") as tmp:
+            results.append(time_invocation(argv, repeat, cwd=Path(tmp)))
+    return results
+
+
+def heavy_imports_at_startup() -> List[str]:
+    """Heavy top-level packages imported just by loading the CLI module."""
+    code = (
+        "import sys, src.cli.main\n"
+        f"print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r}))))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CLI start-up time")
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum median seconds per invocation")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = [time_invocation(inv, args.repeat) for inv in LIGHT_INVOCATIONS]
+    runs = light_runs(args.repeat)
+    heavy = heavy_imports_at_startup()
+    forbidden = {" ".join(r["argv"][:1]): sorted(set(r["imported"]) & set(FORBIDDEN_IN_LIGHT)) for r in runs}
+    forbidden = {cmd: mods for cmd, mods in forbidden.items() if mods}
+    report = {"budget_s": args.budget, "heavy_imports": heavy, "results": results, "runs": runs}
+    for rec in results:
+        flag = "ok" if rec["median_s"] <= args.budget else "OVER BUDGET"
+        print(f"{' '.join(rec['argv']):<20} {rec['median_s']:.3f}s {flag}", file=sys.stderr)
+    # Real runs do their work too, so they are reported but not held to the start-up budget.
+    for rec in runs:
+        print(f"{rec['argv'][0] + ' (run)':<20} {rec['median_s']:.3f}s imports {' '.join(rec['imported'])}", file=sys.stderr)
+    if heavy:
+        print(f"Heavy modules imported at start-up: {', '.join(heavy)}", file=sys.stderr)
+    for cmd, mods in forbidden.items():
+        print(f"Light subcommand {cmd} imported: {', '.join(mods)}", file=sys.stderr)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if not heavy and not forbidden and all(r["median_s"] <= args.budget for r in results) else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
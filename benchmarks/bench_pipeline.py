@@ -0,0 +1,356 @@
+"""
+Benchmark suite for the pipeline hot paths.
+
+Each benchmark builds seeded synthetic inputs (league data comes from
+:mod:`src.data_acquisition.synthetic`) at a given size preset, times
+one call of the function under test and records throughput and peak traced
+memory.  Results are written as JSON so that two runs on the same machine can
+be compared for regressions::
+
+    python -m benchmarks.bench_pipeline --sizes small,medium --output outputs/bench/run.json
+    python -m benchmarks.bench_pipeline --sizes small --compare outputs/bench/run.json
+
+The ``large`` preset matches production scale (363 teams x 25 seasons,
+10^6 bracket simulations) and can take several minutes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtesting import runner as backtest_runner
+from src.data_acquisition import etl as etl_mod, synthetic
+from src.evaluation import bracket_scoring, pool_simulator
+from src.simulation import aggregators, bayes, elo, features as feat_mod, monte_carlo
+from src.utils import io as uio
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SIZES: Dict[str, Dict[str, int]] = {
+    "small": {
+        "n_teams": 16, "n_seasons": 1, "nonconf_games": 4, "n_pairs": 200,
+        "n_sims": 1_000, "n_brackets": 1_000, "n_competitors": 10, "n_trials": 100,
+    },
+    "medium": {
+        "n_teams": 68, "n_seasons": 5, "nonconf_games": 11, "n_pairs": 1_000,
+        "n_sims": 100_000, "n_brackets": 10_000, "n_competitors": 100, "n_trials": 1_000,
+    },
+    "large": {
+        "n_teams": 363, "n_seasons": 25, "nonconf_games": 11, "n_pairs": 5_000,
+        "n_sims": 1_000_000, "n_brackets": 100_000, "n_competitors": 10_000, "n_trials": 10_000,
+    },
+}
+
+# A benchmark setup returns (callable to time, number of items processed, unit).
+Setup = Callable[[Dict[str, int], Path, np.random.Generator], Tuple[Callable[[], Any], int, str]]
+
+
+def _team_ids(n_teams: int) -> List[str]:
+    return [f"T{idx:03d}" for idx in range(n_teams)]
+
+
+def _write_league(size: Dict[str, int], raw_dir: Path) -> List[int]:
+    """Write seeded synthetic seasons to ``raw_dir`` and return the season list."""
+    seasons = list(range(2000, 2000 + size["n_seasons"]))
+    cfg = {
+        "seed": 1337,
+        "n_teams": size["n_teams"],
+        "n_conferences": max(1, size["n_teams"] // 11),
+        "nonconf_games": size["nonconf_games"],
+    }
+    synthetic.generate_league(seasons, raw_dir, cfg)
+    return seasons
+
+
+def _synthetic_games(size: Dict[str, int], workdir: Path) -> pd.DataFrame:
+    """Chronologically sorted games from the synthetic league generator."""
+    raw_dir = workdir / "league"
+    seasons = _write_league(size, raw_dir)
+    frames = [pd.read_csv(raw_dir / f"{season}_games.csv").assign(season=season) for season in seasons]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _bracket(n_teams: int, rng: np.random.Generator) -> Tuple[List[str], np.ndarray]:
+    """Power-of-two bracket (at most 64 teams) and a pairwise win-probability matrix."""
+    size = 1 << min(6, int(np.log2(n_teams)))
+    teams = _team_ids(size)
+    rating = rng.normal(0.0, 150.0, size)
+    probs = 1.0 / (1.0 + 10 ** (-(rating[:, None] - rating[None, :]) / 400.0))
+    return teams, probs
+
+
+def _picks(teams: List[str], rng: np.random.Generator) -> Dict[str, str]:
+    """A random but internally consistent set of picks keyed by game id."""
+    picks: Dict[str, str] = {}
+    alive = list(teams)
+    rnd = 0
+    while len(alive) > 1:
+        nxt = []
+        for g in range(len(alive) // 2):
+            winner = alive[2 * g + int(rng.integers(0, 2))]
+            picks[f"R{rnd}G{g}"] = winner
+            nxt.append(winner)
+        alive = nxt
+        rnd += 1
+    return picks
+
+
+def setup_train_elo(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    games = _synthetic_games(size, workdir)
+    cfg = {"k_base": 30, "home_adv": 40}
+    return (lambda: elo.train_elo(games, cfg)), len(games), "games"
+
+
+def setup_bayes_posteriors(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    games = _synthetic_games(size, workdir)
+    cfg = {"prior_strength": 20}
+    # Time the computation itself, not the tiered cache in front of it.
+    return (lambda: bayes.bayes_posteriors.__wrapped__(games, cfg)), len(games), "games"
+
+
+def setup_head_to_head_features(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    n = size["n_teams"]
+    feats = pd.DataFrame(
+        {
+            "team_id": _team_ids(n),
+            "adj_o": rng.normal(105, 6, n),
+            "adj_d": rng.normal(100, 6, n),
+            "tempo": rng.normal(68, 3, n),
+            "sos": rng.normal(0, 5, n),
+            "luck": rng.normal(0, 0.03, n),
+        }
+    )
+    ids = feats["team_id"].to_numpy()
+    pairs = [(ids[a], ids[b]) for a, b in rng.integers(0, n, (size["n_pairs"], 2))]
+
+    def run() -> None:
+        for a, b in pairs:
+            feat_mod.head_to_head_features(feats, a, b)
+
+    return run, len(pairs), "pairs"
+
+
+def setup_simulate_bracket(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    teams, probs = _bracket(size["n_teams"], rng)
+    n_sims = size["n_sims"]
+    return (lambda: monte_carlo.simulate_bracket(teams, probs, n_sims, seed=1337)), n_sims, "sims"
+
+
+def setup_simulate_stream(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    teams, probs = _bracket(size["n_teams"], rng)
+    n_sims, n = size["n_sims"], len(teams)
+
+    def run() -> None:
+        aggs = {
+            "reach": aggregators.RoundReach(n),
+            "final_four": aggregators.ChampionFinalFour(n),
+            "top": aggregators.TopBrackets(n),
+        }
+        monte_carlo.simulate_stream(teams, probs, n_sims, seed=1337, aggregators=aggs)
+
+    return run, n_sims, "sims"
+
+
+def setup_score_bracket(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    teams, _ = _bracket(size["n_teams"], rng)
+    truth = _picks(teams, rng)
+    brackets = [_picks(teams, rng) for _ in range(min(size["n_brackets"], 1_000))]
+    n = size["n_brackets"]
+    cfg = uio.read_yaml(REPO_ROOT / "config" / "scoring.yaml")
+
+    def run() -> None:
+        for i in range(n):
+            bracket_scoring.score_bracket(brackets[i % len(brackets)], truth, "espn", cfg)
+
+    return run, n, "brackets"
+
+
+def setup_simulate_pool(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    teams, probs = _bracket(size["n_teams"], rng)
+    picks = _picks(teams, rng)
+    public: Dict[str, Dict[str, float]] = {}
+    for game_id in picks:
+        share = rng.dirichlet(np.ones(2))
+        public[game_id] = {picks[game_id]: float(share[0]), "other": float(share[1])}
+    n_comp, n_trials = size["n_competitors"], size["n_trials"]
+    cfg = uio.read_yaml(REPO_ROOT / "config" / "scoring.yaml")
+    run = lambda: pool_simulator.simulate_pool(picks, public, ["espn"], n_comp, n_trials, teams, probs, cfg)  # noqa: E731
+    return run, n_comp * n_trials, "entry-trials"
+
+
+def setup_ingest_to_sqlite(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    raw_dir = workdir / "raw"
+    seasons = _write_league(size, raw_dir)
+    n_games = 0
+    for season in seasons:
+        with open(raw_dir / f"{season}_games.csv", "r", encoding="utf-8") as f:
+            n_games += sum(1 for _ in f) - 1
+    db_path = workdir / "bench.db"
+
+    def run() -> None:
+        if db_path.exists():
+            db_path.unlink()
+        etl_mod.ingest_to_sqlite(seasons, raw_dir, str(db_path))
+
+    return run, n_games, "games"
+
+
+def setup_run_backtest(size: Dict[str, int], workdir: Path, rng: np.random.Generator):
+    seasons = list(range(2000, 2000 + size["n_seasons"]))
+    models = ["elo", "logit", "bayes", "ensemble"]
+    export_dir = str(workdir / "backtest")
+    run = lambda: backtest_runner.run_backtest(seasons, "loso", models, ["espn", "yahoo"], export_dir, seed=1337)  # noqa: E731
+    return run, len(seasons) * len(models), "cells"
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "train_elo": setup_train_elo,
+    "bayes_posteriors": setup_bayes_posteriors,
+    "head_to_head_features": setup_head_to_head_features,
+    "simulate_bracket": setup_simulate_bracket,
+    "simulate_stream": setup_simulate_stream,
+    "score_bracket": setup_score_bracket,
+    "simulate_pool": setup_simulate_pool,
+    "ingest_to_sqlite": setup_ingest_to_sqlite,
+    "run_backtest": setup_run_backtest,
+}
+
+
+def run_one(name: str, size_name: str, measure_memory: bool = True, seed: int = 1337) -> Dict[str, Any]:
+    """Run a single benchmark at one size preset and return its result record."""
+    size = SIZES[size_name]
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as tmp:
+        fn, n_items, unit = BENCHMARKS[name](size, Path(tmp), np.random.default_rng(seed))
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start
+        peak = None
+        if measure_memory:
+            # Separate pass so tracing overhead does not distort the timing.
+            gc.collect()
+            tracemalloc.start()
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {
+        "name": name,
+        "size": size_name,
+        "n_items": n_items,
+        "unit": unit,
+        "seconds": round(seconds, 6),
+        "throughput": round(n_items / seconds, 3) if seconds > 0 else None,
+        "peak_mem_bytes": peak,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(names: List[str], sizes: List[str], measure_memory: bool = True) -> Dict[str, Any]:
+    """Run the selected benchmarks at every requested size."""
+    results = []
+    for size_name in sizes:
+        for name in names:
+            rec = run_one(name, size_name, measure_memory)
+            print(
+                f"{name:<24} {size_name:<7} {rec['seconds']:>10.4f}s "
+                f"{rec['throughput'] or 0:>14,.1f} {rec['unit']}/s",
+                file=sys.stderr,
+            )
+            results.append(rec)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "machine": {
+            "node": platform.node(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark runs.
+
+    Returns one row per benchmark/size present in both runs with the time
+    ratio (current / baseline) and a ``regression`` flag set when the ratio
+    exceeds ``1 + tolerance``.
+    """
+    old = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for rec in current.get("results", []):
+        prev = old.get((rec["name"], rec["size"]))
+        if prev is None or not prev["seconds"]:
+            continue
+        ratio = rec["seconds"] / prev["seconds"]
+        rows.append(
+            {"name": rec["name"], "size": rec["size"], "ratio": round(ratio, 3), "regression": ratio > 1 + tolerance}
+        )
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline hot paths")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help="Comma separated benchmark names")
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma separated size presets ({', '.join(SIZES)})")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.benchmarks.split(",") if n.strip()]
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [n for n in names if n not in BENCHMARKS] + [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"Unknown benchmark or size: {', '.join(unknown)}")
+
+    report = run_suite(names, sizes, measure_memory=not args.no_memory)
+    if args.output:
+        out = Path(args.output)
+        uio.ensure_dir(out.parent)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report, args.tolerance)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['name']:<24} {row['size']:<7} x{row['ratio']:<8} {flag}", file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,3 +1,3 @@
 """Backtesting routines for the March Madness model."""
 
-__all__ = ["runner"]
+__all__ = ["job_queue", "runner"]
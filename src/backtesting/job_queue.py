@@ -0,0 +1,232 @@
+"""
+Resumable task queue for backtest cells, backed by one SQLite file.
+
+Every backtest cell (season x protocol x model x hyperparameters) is one row
+of the ``tasks`` table, keyed by a deterministic id so enqueueing the same
+grid twice adds nothing.  Workers -- processes on one machine or on several
+machines sharing the file -- claim a task by taking a lease on it, and store
+its result in the same row when done, so every finished cell is checkpointed
+the moment it completes.  A worker that dies leaves its lease to expire, after
+which another worker reclaims the task; re-running an interrupted backtest
+only computes the cells that are not done.  While a cell runs, its worker
+renews the lease from a heartbeat thread, so long cells are not reclaimed.
+
+Claims run in ``BEGIN IMMEDIATE`` transactions (one writer at a time), with a
+rollback journal rather than WAL so the file also works on network
+filesystems.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=60.0, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_queue(path: Path) -> None:
+    """Create the queue file and ``tasks`` table if missing."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = _connect(path)
+    try:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id     TEXT PRIMARY KEY,
+                params      TEXT NOT NULL,
+                status      TEXT NOT NULL DEFAULT 'pending',
+                worker      TEXT,
+                lease_until REAL,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                result      TEXT,
+                error       TEXT,
+                updated     REAL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+    finally:
+        conn.close()
+
+
+def task_id(params: Dict[str, Any]) -> str:
+    """Deterministic id of a cell (its parameters as canonical JSON)."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(path: Path, cells: Iterable[Dict[str, Any]]) -> int:
+    """Add cells that are not queued yet; returns how many were added."""
+    init_queue(path)
+    now = time.time()
+    rows = [(task_id(c), json.dumps(c, sort_keys=True), now) for c in cells]
+    conn = _connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO tasks (task_id, params, updated) VALUES (?, ?, ?)", rows)
+        added = conn.total_changes - before
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return added
+
+
+def claim(path: Path, worker: str, lease_s: float = 600.0) -> Optional[Dict[str, Any]]:
+    """
+    Lease the next pending task, or one whose lease has expired.
+
+    Returns
+    -------
+    dict or None
+        ``{"task_id", "params", "attempts"}``, or None when nothing is
+        claimable (all tasks done, failed or leased by live workers).
+    """
+    now = time.time()
+    conn = _connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            """
+            SELECT task_id, params, attempts FROM tasks
+            WHERE status = ? OR (status = ? AND lease_until < ?)
+            ORDER BY status = ? DESC, task_id LIMIT 1
+            """,
+            (PENDING, RUNNING, now, PENDING),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE tasks SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? "
+            "WHERE task_id = ?",
+            (RUNNING, worker, now + lease_s, now, row["task_id"]),
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return {"task_id": row["task_id"], "params": json.loads(row["params"]), "attempts": row["attempts"] + 1}
+
+
+def _update_held(path: Path, task: str, worker: str, sql: str, values: tuple) -> bool:
+    """Run ``UPDATE tasks SET <sql>`` only while ``worker`` holds the lease."""
+    conn = _connect(path)
+    try:
+        cur = conn.execute(
+            f"UPDATE tasks SET {sql}, updated = ? WHERE task_id = ? AND worker = ? AND status = ?",
+            (*values, time.time(), task, worker, RUNNING),
+        )
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+
+def renew(path: Path, task: str, worker: str, lease_s: float = 600.0) -> bool:
+    """Extend a held lease; False if the task was reclaimed by another worker."""
+    return _update_held(path, task, worker, "lease_until = ?", (time.time() + lease_s,))
+
+
+def complete(path: Path, task: str, worker: str, result: Dict[str, Any]) -> bool:
+    """Checkpoint a task's result; False if the lease was lost (result dropped)."""
+    return _update_held(
+        path, task, worker, "status = ?, result = ?, lease_until = NULL, error = NULL", (DONE, json.dumps(result))
+    )
+
+
+def fail(path: Path, task: str, worker: str, error: str, max_attempts: int = 3) -> bool:
+    """Record an error; the task is retried until ``max_attempts`` claims."""
+    conn = _connect(path)
+    try:
+        row = conn.execute("SELECT attempts FROM tasks WHERE task_id = ?", (task,)).fetchone()
+    finally:
+        conn.close()
+    status = FAILED if row is not None and row["attempts"] >= max_attempts else PENDING
+    return _update_held(path, task, worker, "status = ?, error = ?, lease_until = NULL", (status, error))
+
+
+def reset(path: Path, statuses: Iterable[str] = (FAILED,)) -> int:
+    """Put tasks with the given statuses back to pending (e.g. to retry failures)."""
+    statuses = list(statuses)
+    conn = _connect(path)
+    try:
+        cur = conn.execute(
+            f"UPDATE tasks SET status = ?, attempts = 0, worker = NULL, lease_until = NULL "
+            f"WHERE status IN ({','.join('?' for _ in statuses)})",
+            (PENDING, *statuses),
+        )
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def counts(path: Path) -> Dict[str, int]:
+    """Number of tasks per status."""
+    conn = _connect(path)
+    try:
+        rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+    finally:
+        conn.close()
+    out = {s: 0 for s in (PENDING, RUNNING, DONE, FAILED)}
+    out.update({r["status"]: r["n"] for r in rows})
+    return out
+
+
+def results(path: Path, task_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Results of the finished tasks.
+
+    With ``task_ids`` only those tasks are returned, in the given order
+    (unfinished ones are skipped); otherwise all, in task id order.
+    """
+    conn = _connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT task_id, result FROM tasks WHERE status = ? ORDER BY task_id", (DONE,)
+        ).fetchall()
+    finally:
+        conn.close()
+    done = {r["task_id"]: r["result"] for r in rows}
+    order = list(done) if task_ids is None else [t for t in task_ids if t in done]
+    return [json.loads(done[t]) for t in order]
+
+
+@contextmanager
+def heartbeat(path: Path, task: str, worker: str, lease_s: float = 600.0) -> Iterator[threading.Event]:
+    """
+    Keep renewing a held lease while the body runs.
+
+    A daemon thread calls :func:`renew` every ``lease_s / 3`` seconds.  The
+    yielded event is set if the lease was lost (another worker reclaimed
+    the task), in which case the result will not be accepted.
+    """
+    stop, lost = threading.Event(), threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(lease_s / 3):
+            if not renew(path, task, worker, lease_s):
+                lost.set()
+                return
+
+    thread = threading.Thread(target=beat, name=f"lease-{task}", daemon=True)
+    thread.start()
+    try:
+        yield lost
+    finally:
+        stop.set()
+        thread.join()
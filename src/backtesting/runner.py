@@ -2,38 +2,180 @@
 
 from __future__ import annotations
 
+import itertools
 import os
 import random
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Mapping, Optional
 
 import pandas as pd
 
+from ..simulation import artifacts
 from ..utils import io as uio
+from ..utils.logging import get_logger
+from . import job_queue
 
+logger = get_logger("backtest")
 
-def run_backtest(seasons: List[int], protocol: str, models: List[str], systems: List[str], export_dir: str, seed: int) -> None:
+
+def backtest_cells(
+    seasons: List[int],
+    protocol: str,
+    models: List[str],
+    grid: Optional[Mapping[str, Mapping[str, List[Any]]]] = None,
+) -> List[Dict[str, Any]]:
     """
-    Run backtests over the specified seasons using the given protocol and models.
+    Enumerate the cells of a backtest: season x model x hyperparameters.
 
-    This placeholder implementation generates synthetic metrics for each model
-    and season and writes them to a CSV file in the export directory.
+    ``grid`` maps a model to ``{param: [values, ...]}``; every combination
+    becomes its own cell.  Models without a grid get one cell with no
+    parameters.
     """
-    random.seed(seed)
-    export_path = Path(export_dir)
-    uio.ensure_dir(export_path)
-    rows = []
+    cells = []
     for season in seasons:
         for model in models:
-            rows.append(
-                {
-                    "season": season,
-                    "model": model,
-                    "brier": round(random.uniform(0.15, 0.25), 3),
-                    "log_loss": round(random.uniform(0.5, 0.7), 3),
-                    "auc_roc": round(random.uniform(0.6, 0.8), 3),
-                }
-            )
+            space = (grid or {}).get(model, {})
+            names = sorted(space)
+            for values in itertools.product(*(space[n] for n in names)):
+                cells.append({"season": season, "protocol": protocol, "model": model, "params": dict(zip(names, values))})
+    return cells
+
+
+def _artifact_versions(models: List[str], artifacts_root: Optional[str]) -> Dict[str, str]:
+    versions = {}
+    for model in models:
+        if artifacts_root and artifacts.latest_version(Path(artifacts_root), model):
+            versions[model] = artifacts.load_model(Path(artifacts_root), model)["manifest"]["version"]
+    return versions
+
+
+def run_cell(cell: Mapping[str, Any], seed: int, versions: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """
+    Metrics for one backtest cell.
+
+    This placeholder implementation generates synthetic metrics.  They are
+    seeded by the run seed and the cell itself, so a cell gives the same
+    row whichever worker computes it and in whatever order.  The loaded
+    artifacts are not evaluated yet: only the version in ``versions`` is
+    recorded with the row, so the metrics say nothing about that artifact.
+    """
+    key = {k: cell[k] for k in ("season", "protocol", "model", "params") if k in cell}
+    rng = random.Random(f"{seed}:{job_queue.task_id(key)}")
+    return {
+        "season": cell["season"],
+        "model": cell["model"],
+        **cell.get("params", {}),
+        "brier": round(rng.uniform(0.15, 0.25), 3),
+        "log_loss": round(rng.uniform(0.5, 0.7), 3),
+        "auc_roc": round(rng.uniform(0.6, 0.8), 3),
+        "artifact": (versions or {}).get(cell["model"], ""),
+    }
+
+
+def _write_summary(rows: List[Dict[str, Any]], export_dir: str) -> Path:
+    export_path = Path(export_dir)
+    uio.ensure_dir(export_path)
     df = pd.DataFrame(rows)
     summary_file = export_path / "backtest_summary.csv"
-    df.to_csv(summary_file, index=False)
+    # Write then rename: queue workers finishing together may both export.
+    tmp = summary_file.with_name(f".{summary_file.name}.{os.getpid()}")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, summary_file)
+    return summary_file
+
+
+def run_backtest(
+    seasons: List[int],
+    protocol: str,
+    models: List[str],
+    systems: List[str],
+    export_dir: str,
+    seed: int,
+    artifacts_root: Optional[str] = None,
+    grid: Optional[Mapping[str, Mapping[str, List[Any]]]] = None,
+) -> None:
+    """
+    Run backtests over the specified seasons using the given protocol and models.
+
+    Every cell of :func:`backtest_cells` is computed by :func:`run_cell` and
+    the rows are written to ``backtest_summary.csv`` in the export
+    directory.  When ``artifacts_root`` is given, each model's latest stored
+    artifact is opened (memory-mapped) once and its version recorded
+    alongside the metrics.
+    """
+    versions = _artifact_versions(models, artifacts_root)
+    rows = [run_cell(cell, seed, versions) for cell in backtest_cells(seasons, protocol, models, grid)]
+    _write_summary(rows, export_dir)
+
+
+def run_backtest_queue(
+    queue_path: str,
+    seasons: List[int],
+    protocol: str,
+    models: List[str],
+    systems: List[str],
+    export_dir: str,
+    seed: int,
+    artifacts_root: Optional[str] = None,
+    grid: Optional[Mapping[str, Mapping[str, List[Any]]]] = None,
+    worker: Optional[str] = None,
+    lease_s: float = 600.0,
+    max_tasks: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Run a backtest as a worker of a shared, resumable task queue.
+
+    The grid's cells are enqueued (cells already queued, running or done are
+    left alone), then this process claims and computes cells until none is
+    claimable or ``max_tasks`` are done.  Each result is checkpointed in the
+    queue as soon as its cell finishes, so any number of workers -- on this
+    machine or others sharing ``queue_path`` -- can run the same command,
+    and re-running it after a crash only computes the missing cells.  When
+    no cell is left pending or running, the worker that stops last writes
+    ``backtest_summary.csv`` from the queue's results for this grid, in the
+    same row order as :func:`run_backtest`.  Tasks are keyed by the cell,
+    the seed and the model's artifact version, so results checkpointed under
+    another seed or artifact are never reused.  A heartbeat renews each
+    lease while its cell runs.
+
+    Returns
+    -------
+    dict
+        Task counts per status after this worker stops, plus ``computed``
+        (cells this worker finished).
+    """
+    path = Path(queue_path)
+    versions = _artifact_versions(models, artifacts_root)
+    # The seed and artifact version are part of each task's key, so a rerun
+    # with another seed or after retraining computes fresh cells.
+    cells = [
+        {**cell, "seed": seed, "artifact": versions.get(cell["model"], "")}
+        for cell in backtest_cells(seasons, protocol, models, grid)
+    ]
+    added = job_queue.enqueue(path, cells)
+    worker = worker or job_queue.worker_name()
+    logger.info(f"Queue {path}: {added} new of {len(cells)} cells; worker {worker}")
+    computed = 0
+    while max_tasks is None or computed < max_tasks:
+        task = job_queue.claim(path, worker, lease_s)
+        if task is None:
+            break
+        cell = task["params"]
+        try:
+            with job_queue.heartbeat(path, task["task_id"], worker, lease_s):
+                row = run_cell(cell, cell["seed"], {cell["model"]: cell["artifact"]})
+        except Exception as exc:  # keep serving other cells; the task is retried
+            logger.warning(f"Cell {task['task_id']} failed: {exc}")
+            job_queue.fail(path, task["task_id"], worker, repr(exc))
+            continue
+        if job_queue.complete(path, task["task_id"], worker, row):
+            computed += 1
+        else:
+            logger.warning(f"Lease on {task['task_id']} expired; result discarded")
+    status = job_queue.counts(path)
+    if status[job_queue.PENDING] == status[job_queue.RUNNING] == 0:
+        if status[job_queue.FAILED]:
+            logger.warning(f"{status[job_queue.FAILED]} cells failed; see the queue's error column")
+        _write_summary(job_queue.results(path, [job_queue.task_id(c) for c in cells]), export_dir)
+    logger.info(f"Worker {worker} computed {computed} cells; queue {status}")
+    return {**status, "computed": computed}
@@ -3,28 +3,44 @@ Command line interface for the March Madness model.
 
 This module defines a single entry point with subcommands for ingesting data,
 taking snapshots, training models, predicting brackets, running backtests,
-generating writeups and serving the dashboard.  Each subcommand delegates to
-functions in the respective modules under ``src``.
+optimizing pool brackets, generating writeups, serving the dashboard and
+running the prediction service.  Each subcommand delegates to functions in the respective modules
+under ``src``.
+
+Subcommands live in a registry: each one contributes an argument builder and
+a runner, and the runner imports the modules it needs (pandas, sklearn,
+streamlit, jinja2, ...) only when that subcommand actually executes.  This
+keeps ``--help`` and light subcommands fast for cron jobs and shell wrappers;
+``benchmarks/bench_cli_startup.py`` guards the start-up budget.
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List
 
+from ..utils import caching
 from ..utils import io as uio
-from ..utils import dates as udates
-from ..data_acquisition import schema as schema_mod
-from ..data_acquisition import etl as etl_mod
-from ..data_acquisition import scraper_torvik, scraper_sportsref, scraper_ncaa, scraper_wikipedia  # type: ignore
-from ..data_cleaning import standardize, join_features, leakage_guards
-from ..simulation import elo, logit, bayes, ensemble, calibration, monte_carlo, features as feat_mod
-from ..evaluation import metrics as eval_metrics, bracket_scoring, pool_simulator, reports  # type: ignore
-from ..backtesting import runner as backtest_runner
-from ..visualization import dashboard_streamlit
-from ..writeups import generator as writeups_gen
+from ..utils import profiling
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / "config"
+
+# name -> {"help": str, "configure": fn(parser), "run": fn(args, base_cfg, providers_cfg)}
+COMMANDS: Dict[str, Dict[str, Any]] = {}
+
+
+def register(name: str, help: str, configure: Callable[[argparse.ArgumentParser], None]):
+    """Register a subcommand runner under ``name``."""
+
+    def decorator(run: Callable[[argparse.Namespace, dict, dict], None]):
+        COMMANDS[name] = {"help": help, "configure": configure, "run": run}
+        return run
+
+    return decorator
 
 
 def _parse_season_range(season_range: str) -> List[int]:
@@ -36,140 +52,391 @@ def _parse_season_range(season_range: str) -> List[int]:
         return [int(season_range)]
 
 
-def main(argv: List[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="March Madness prediction CLI")
-    subparsers = parser.add_subparsers(dest="command", required=True)
+def _scrape(prov: str, seasons: List[int], raw_dir: Path, providers_cfg: dict) -> None:
+    """Dispatch one provider's scraper."""
+    if prov == "torvik":
+        from ..data_acquisition import scraper_torvik
 
-    # Ingest subcommand
-    p_ingest = subparsers.add_parser("ingest", help="Ingest raw data for seasons")
-    p_ingest.add_argument("--seasons", required=True, help="Season range, e.g. 2010-2024")
-    p_ingest.add_argument("--providers", required=True, help="Comma separated provider list")
-
-    # Snapshot subcommand
-    p_snapshot = subparsers.add_parser("snapshot", help="Freeze data as of a given date")
-    p_snapshot.add_argument("--season", type=int, required=True, help="Season year")
-    p_snapshot.add_argument("--asof", required=True, help="As-of date YYYY-MM-DD")
-
-    # Train subcommand
-    p_train = subparsers.add_parser("train", help="Train models on historical seasons")
-    p_train.add_argument("--train_seasons", required=True, help="Range of seasons for training")
-    p_train.add_argument("--models", required=True, help="Comma separated list of models to train")
-
-    # Predict subcommand
-    p_predict = subparsers.add_parser("predict", help="Generate predictions for a season")
-    p_predict.add_argument("--season", type=int, required=True, help="Season year to predict")
-    p_predict.add_argument("--asof", required=True, help="As-of date YYYY-MM-DD")
-    p_predict.add_argument("--export", required=True, help="Export directory for predictions")
-
-    # Backtest subcommand
-    p_backtest = subparsers.add_parser("backtest", help="Run backtests across seasons")
-    p_backtest.add_argument("--seasons", required=True, help="Season range for backtesting")
-    p_backtest.add_argument("--models", required=True, help="Comma separated model list")
-    p_backtest.add_argument("--protocol", required=True, choices=["loso", "expanding", "fixed"], help="Backtest protocol")
-    p_backtest.add_argument("--scoring_systems", required=True, help="Comma separated scoring systems")
-    p_backtest.add_argument("--export", required=True, help="Directory to export backtest results")
-
-    # Writeups subcommand
-    p_writeups = subparsers.add_parser("writeups", help="Generate game preview writeups")
-    p_writeups.add_argument("--season", type=int, required=True)
-    p_writeups.add_argument("--asof", required=True)
-    p_writeups.add_argument("--style", required=True, help="Writeup style (e.g. stats-heavy)")
-    p_writeups.add_argument("--export", required=True, help="Export directory for writeups")
-
-    # Dashboard subcommand
-    p_dashboard = subparsers.add_parser("dashboard", help="Run or build the dashboard")
-    p_dashboard.add_argument("--serve", action="store_true", help="Serve the dashboard (default)")
-    p_dashboard.add_argument("--build-static", action="store_true", help="Build static assets instead of serving")
-
-    args = parser.parse_args(argv)
+        scraper_torvik.scrape_torvik(seasons, raw_dir, providers_cfg["sources"]["torvik"])  # type: ignore[attr-defined]
+    elif prov == "sportsref":
+        from ..data_acquisition import scraper_sportsref
 
-    # Load base configuration
-    base_cfg = uio.read_yaml(Path(__file__).resolve().parent.parent.parent / "config" / "base.yaml")
-    providers_cfg = uio.read_yaml(Path(__file__).resolve().parent.parent.parent / "config" / "providers.yaml")
-
-    if args.command == "ingest":
-        seasons = _parse_season_range(args.seasons)
-        providers = [p.strip() for p in args.providers.split(',') if p.strip()]
-        raw_dir = Path(base_cfg["raw_dir"])
-        # ensure directories exist
-        uio.ensure_dir(raw_dir)
-        # initialise database
-        db_path = Path(base_cfg["processed_dir"]) / "mm.db"
-        uio.ensure_dir(db_path.parent)
-        schema_mod.init_db(str(db_path))
-        # scrape each provider
-        for prov in providers:
-            if prov == "torvik":
-                scraper_torvik.scrape_torvik(seasons, raw_dir, providers_cfg["sources"]["torvik"])  # type: ignore[attr-defined]
-            elif prov == "sportsref":
-                scraper_sportsref.scrape_sportsref(seasons, raw_dir, providers_cfg["sources"]["sportsref"])  # type: ignore[attr-defined]
-            elif prov == "ncaa":
-                scraper_ncaa.scrape_ncaa(seasons, raw_dir, providers_cfg["sources"]["ncaa"])  # type: ignore[attr-defined]
-            elif prov == "wikipedia":
-                scraper_wikipedia.scrape_wikipedia(seasons, raw_dir, providers_cfg["sources"]["wikipedia"])  # type: ignore[attr-defined]
-            else:
-                print(f"Unknown provider: {prov}", file=sys.stderr)
-        # ingest raw to sqlite
-        etl_mod.ingest_to_sqlite(seasons, raw_dir, str(db_path))
+        scraper_sportsref.scrape_sportsref(seasons, raw_dir, providers_cfg["sources"]["sportsref"])  # type: ignore[attr-defined]
+    elif prov == "ncaa":
+        from ..data_acquisition import scraper_ncaa
+
+        scraper_ncaa.scrape_ncaa(seasons, raw_dir, providers_cfg["sources"]["ncaa"])  # type: ignore[attr-defined]
+    elif prov == "wikipedia":
+        from ..data_acquisition import scraper_wikipedia
+
+        scraper_wikipedia.scrape_wikipedia(seasons, raw_dir, providers_cfg["sources"]["wikipedia"])  # type: ignore[attr-defined]
+    elif prov == "synthetic":
+        from ..data_acquisition import synthetic
+
+        synthetic.generate_league(seasons, raw_dir, providers_cfg["sources"]["synthetic"])
+    else:
+        print(f"Unknown provider: {prov}", file=sys.stderr)
+
+
+# Ingest subcommand
+def _configure_ingest(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--seasons", required=True, help="Season range, e.g. 2010-2024")
+    p.add_argument("--providers", required=True, help="Comma separated provider list")
+    p.add_argument("--chunksize", type=int, default=100_000, help="Rows per ingest chunk")
+
+
+@register("ingest", "Ingest raw data for seasons", _configure_ingest)
+def _run_ingest(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..data_acquisition import schema as schema_mod
+    from ..data_acquisition import etl as etl_mod
+
+    seasons = _parse_season_range(args.seasons)
+    providers = [p.strip() for p in args.providers.split(',') if p.strip()]
+    raw_dir = Path(base_cfg["raw_dir"])
+    # ensure directories exist
+    uio.ensure_dir(raw_dir)
+    # initialise database
+    db_path = Path(base_cfg["processed_dir"]) / "mm.db"
+    uio.ensure_dir(db_path.parent)
+    schema_mod.init_db(str(db_path))
+    # scrape each provider
+    for prov in providers:
+        with profiling.span("scrape", provider=prov):
+            _scrape(prov, seasons, raw_dir, providers_cfg)
+    # ingest raw to sqlite
+    with profiling.span("ingest", seasons=len(seasons)):
+        stats = etl_mod.ingest_to_sqlite(seasons, raw_dir, str(db_path), chunksize=args.chunksize)
+    with profiling.span("index"):
         etl_mod.index_db(str(db_path))
-        print("Ingestion complete")
+    print(f"Ingestion complete: {stats['games']} games, {stats['teams']} teams ({stats['rows_per_s']:.0f} rows/s)")
+
+
+# Snapshot subcommand
+def _configure_snapshot(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--season", type=int, required=True, help="Season year")
+    p.add_argument("--asof", required=True, help="As-of date YYYY-MM-DD")
+
+
+@register("snapshot", "Freeze data as of a given date", _configure_snapshot)
+def _run_snapshot(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..data_acquisition import snapshot_store
+    from ..data_cleaning import standardize, join_features, leakage_guards, travel
+    from ..visualization import dashboard_data
 
-    elif args.command == "snapshot":
-        season = args.season
-        asof = args.asof
-        db_path = Path(base_cfg["processed_dir"]) / "mm.db"
-        # Standardize names and compute experience etc.
+    season = args.season
+    asof = args.asof
+    db_path = Path(base_cfg["processed_dir"]) / "mm.db"
+    # Standardize names and compute experience etc.
+    with profiling.span("standardize"):
         standardize.standardize_team_names(str(db_path))
         standardize.compute_experience_proxy(str(db_path))
-        # Build feature table and apply leakage guards
+    # Build feature table and apply leakage guards
+    with profiling.span("feature_build", season=season, asof=asof):
         join_features.build_feature_table(str(db_path), season, asof)
+    with profiling.span("travel", season=season):
+        travel.season_travel(str(db_path), season, Path(base_cfg["snapshots_dir"]))
+    with profiling.span("guards"):
         leakage_guards.assert_no_post_asof_rows(str(db_path), season, asof)
         leakage_guards.assert_feature_dates_valid(str(db_path), season, asof)
-        print(f"Snapshot for season {season} as of {asof} created")
+    # Freeze games and features into the deduplicated snapshot store
+    with profiling.span("freeze", season=season, asof=asof):
+        frozen = snapshot_store.write_snapshot(str(db_path), season, asof, Path(base_cfg["snapshots_dir"]) / "store")
+    # Precompute the dashboard tables for this snapshot
+    with profiling.span("dashboard_tables", season=season, asof=asof):
+        dashboard_data.materialize_snapshot(
+            str(db_path),
+            season,
+            asof,
+            Path(base_cfg["snapshots_dir"]),
+            base_cfg["model_defaults"],
+            artifacts_root=Path(base_cfg["artifacts_dir"]),
+            field_path=Path(base_cfg["raw_dir"]) / f"{season}_field.csv",
+            backtests_dir=Path(base_cfg["backtests_dir"]),
+            seed=base_cfg["random_seed"],
+        )
+    print(f"Snapshot for season {season} as of {asof} created ({frozen['chunks_written']} new chunks)")
 
-    elif args.command == "train":
-        train_seasons = _parse_season_range(args.train_seasons)
-        models = [m.strip() for m in args.models.split(',') if m.strip()]
-        # Placeholder: training loop would load data and fit models
-        print(f"Training models {models} on seasons {train_seasons}")
-        # TODO: implement actual training using simulation modules
-
-    elif args.command == "predict":
-        season = args.season
-        asof = args.asof
-        export = Path(args.export)
-        uio.ensure_dir(export)
-        # Placeholder: run predictions
-        print(f"Predicting season {season} as of {asof} to {export}")
-        # TODO: implement actual prediction generation and export
-
-    elif args.command == "backtest":
-        seasons = _parse_season_range(args.seasons)
+
+# Train subcommand
+def _configure_train(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--train_seasons", required=True, help="Range of seasons for training")
+    p.add_argument("--models", required=True, help="Comma separated list of models to train")
+
+
+@register("train", "Train models on historical seasons", _configure_train)
+def _run_train(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..simulation import trainer
+
+    train_seasons = _parse_season_range(args.train_seasons)
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    with profiling.span("train", models=",".join(models)):
+        written = trainer.train_models(
+            base_cfg["db_path"],
+            train_seasons,
+            models,
+            base_cfg["model_defaults"],
+            base_cfg["calibration"]["method"],
+            Path(base_cfg["artifacts_dir"]),
+        )
+    for model, path in written.items():
+        print(f"Trained {model} on seasons {train_seasons[0]}-{train_seasons[-1]}: {path}")
+
+
+# Predict subcommand
+def _configure_predict(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--season", type=int, required=True, help="Season year to predict")
+    p.add_argument("--asof", required=True, help="As-of date YYYY-MM-DD")
+    p.add_argument("--export", required=True, help="Export directory for predictions")
+    p.add_argument("--models", default=None, help="Comma separated models (default: every model with an artifact)")
+
+
+@register("predict", "Generate predictions for a season", _configure_predict)
+def _run_predict(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    import numpy as np
+    import pandas as pd
+
+    from ..simulation import artifacts, trainer
+
+    season = args.season
+    asof = args.asof
+    export = Path(args.export)
+    uio.ensure_dir(export)
+    root = Path(base_cfg["artifacts_dir"])
+    if args.models:
         models = [m.strip() for m in args.models.split(',') if m.strip()]
-        protocol = args.protocol
-        systems = [s.strip() for s in args.scoring_systems.split(',') if s.strip()]
-        export_dir = args.export
-        backtest_runner.run_backtest(seasons, protocol, models, systems, export_dir, seed=base_cfg["random_seed"])
-        print("Backtest completed")
-
-    elif args.command == "writeups":
-        season = args.season
-        asof = args.asof
-        style = args.style
-        export = Path(args.export)
-        uio.ensure_dir(export)
-        template_dir = Path(__file__).resolve().parent.parent / "writeups" / "templates"
-        writeups_gen.generate_game_writeups(season, asof, style, base_cfg["db_path"], template_dir, export)
-        print("Writeups generated")
-
-    elif args.command == "dashboard":
-        db_path = base_cfg["db_path"]
-        snapshots_dir = base_cfg["snapshots_dir"]
-        if args.build_static:
-            print("Building static dashboard is not implemented yet")
-        else:
-            dashboard_streamlit.run_dashboard(db_path, snapshots_dir)
+    else:
+        models = [m for m in ("elo", "logit", "bayes", "ensemble") if artifacts.latest_version(root, m)]
+    with profiling.span("predict", season=season, models=",".join(models)):
+        teams, mats = trainer.predict_matrices(base_cfg["db_path"], season, asof, models, base_cfg["model_defaults"], root)
+    n = len(teams)
+    out = pd.DataFrame({"team_a": np.repeat(teams, n), "team_b": np.tile(teams, n)})
+    for model, P in mats.items():
+        out[model] = np.asarray(P).ravel().round(6)
+    out = out[out["team_a"] != out["team_b"]]
+    out.to_csv(export / f"matchup_probs_{season}_{asof}.csv", index=False)
+    print(f"Predicted {len(out)} matchups for season {season} as of {asof} to {export}")
+
+
+# Backtest subcommand
+def _configure_backtest(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--seasons", required=True, help="Season range for backtesting")
+    p.add_argument("--models", required=True, help="Comma separated model list")
+    p.add_argument("--protocol", required=True, choices=["loso", "expanding", "fixed"], help="Backtest protocol")
+    p.add_argument("--scoring_systems", required=True, help="Comma separated scoring systems")
+    p.add_argument("--export", required=True, help="Directory to export backtest results")
+    p.add_argument("--queue", default=None, help="SQLite task queue: run as a resumable worker sharing this file")
+    p.add_argument("--lease", type=float, default=600.0, help="Seconds a claimed cell stays leased (queue mode)")
+    p.add_argument("--max-tasks", type=int, default=None, help="Stop after this many cells (queue mode)")
 
+
+@register("backtest", "Run backtests across seasons", _configure_backtest)
+def _run_backtest(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..backtesting import runner as backtest_runner
+
+    seasons = _parse_season_range(args.seasons)
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    protocol = args.protocol
+    systems = [s.strip() for s in args.scoring_systems.split(',') if s.strip()]
+    export_dir = args.export
+    with profiling.span("backtest", protocol=protocol, seasons=len(seasons), models=len(models)):
+        if args.queue:
+            status = backtest_runner.run_backtest_queue(
+                args.queue, seasons, protocol, models, systems, export_dir, seed=base_cfg["random_seed"],
+                artifacts_root=base_cfg.get("artifacts_dir"), lease_s=args.lease, max_tasks=args.max_tasks,
+            )
+            print(f"Backtest worker computed {status['computed']} cells; {status['done']} done, "
+                  f"{status['pending'] + status['running']} remaining, {status['failed']} failed")
+            return
+        backtest_runner.run_backtest(
+            seasons, protocol, models, systems, export_dir, seed=base_cfg["random_seed"],
+            artifacts_root=base_cfg.get("artifacts_dir"),
+        )
+    print("Backtest completed")
+
+
+# Pool subcommand
+def _configure_pool(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--season", type=int, required=True)
+    p.add_argument("--asof", required=True)
+    p.add_argument("--public", required=True, help="JSON of public pick shares: {game_id: {team_id: share}}")
+    p.add_argument("--entrants", type=int, required=True, help="Pool size including our bracket")
+    p.add_argument("--system", default="espn", help="Scoring system from scoring.yaml")
+    p.add_argument("--field", default=None, help="Field CSV (default: <raw_dir>/<season>_field.csv)")
+    p.add_argument("--model", default="elo", help="Model for the outcome probabilities")
+    p.add_argument("--trials", type=int, default=10_000, help="Shared simulated tournaments")
+    p.add_argument("--workers", type=int, default=None, help="Evaluation processes (default: CPU count)")
+    p.add_argument("--export", required=True, help="Directory for the optimized bracket JSON")
+
+
+@register("pool", "Search for the bracket most likely to win a pool", _configure_pool)
+def _run_pool(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    import json
+
+    import numpy as np
+    import pandas as pd
+
+    from ..evaluation import pool_simulator
+    from ..simulation import trainer
+    from ..visualization import dashboard_data
+
+    field_path = Path(args.field) if args.field else Path(base_cfg["raw_dir"]) / f"{args.season}_field.csv"
+    field = pd.read_csv(field_path, dtype={"team_id": str})
+    with open(args.public, "r", encoding="utf-8") as f:
+        public = json.load(f)
+    teams, mats = trainer.predict_matrices(
+        base_cfg["db_path"], args.season, args.asof, [args.model], base_cfg["model_defaults"], Path(base_cfg["artifacts_dir"])
+    )
+    team_index = {t: i for i, t in enumerate(teams)}
+    P = np.asarray(mats[args.model])
+    bracket = dashboard_data.bracket_occupants(field, team_index, P)
+    idx = [team_index[t] for t in bracket]
+    with profiling.span("pool", entrants=args.entrants, trials=args.trials):
+        result = pool_simulator.optimize_bracket(
+            bracket, P[np.ix_(idx, idx)], public, args.system, uio.read_yaml(CONFIG_DIR / "scoring.yaml"),
+            args.entrants, n_trials=args.trials, seed=base_cfg["random_seed"], workers=args.workers,
+        )
+    export = Path(args.export)
+    uio.ensure_dir(export)
+    out = export / f"pool_bracket_{args.season}_{args.asof}_{args.system}_{args.entrants}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Pool bracket: win probability {result['win_prob']:.4f} (chalk {result['chalk_win_prob']:.4f}) -> {out}")
+
+
+# Writeups subcommand
+def _configure_writeups(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--season", type=int, required=True)
+    p.add_argument("--asof", required=True)
+    p.add_argument("--style", required=True, help="Writeup style (e.g. stats-heavy)")
+    p.add_argument("--export", required=True, help="Export directory for writeups")
+    p.add_argument("--matchups", choices=["bracket", "all"], default="bracket",
+                   help="Projected bracket games or every possible pairing")
+    p.add_argument("--field", default=None, help="Field CSV (default: <raw_dir>/<season>_field.csv)")
+    p.add_argument("--model", default="elo", help="Model driving the picks")
+    p.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+
+
+@register("writeups", "Generate game preview writeups", _configure_writeups)
+def _run_writeups(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..writeups import generator as writeups_gen
+
+    season = args.season
+    asof = args.asof
+    style = args.style
+    export = Path(args.export)
+    uio.ensure_dir(export)
+    template_dir = Path(__file__).resolve().parent.parent / "writeups" / "templates"
+    field = Path(args.field) if args.field else Path(base_cfg["raw_dir"]) / f"{season}_field.csv"
+    with profiling.span("writeups", season=season, matchups=args.matchups):
+        path = writeups_gen.generate_game_writeups(
+            season,
+            asof,
+            style,
+            base_cfg["db_path"],
+            template_dir,
+            export,
+            field_path=field,
+            matchups=args.matchups,
+            model=args.model,
+            model_cfg=base_cfg["model_defaults"],
+            artifacts_root=Path(base_cfg["artifacts_dir"]),
+            workers=args.workers,
+        )
+    print(f"Writeups generated: {path}")
+
+
+# Dashboard subcommand
+def _configure_dashboard(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--serve", action="store_true", help="Serve the dashboard (default)")
+    p.add_argument("--build-static", action="store_true", help="Build static assets instead of serving")
+    p.add_argument("--out", default="outputs/dashboard", help="Output directory for --build-static")
+    p.add_argument("--force", action="store_true", help="Rebuild every shard, not just changed snapshots")
+
+
+@register("dashboard", "Run or build the dashboard", _configure_dashboard)
+def _run_dashboard(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    db_path = base_cfg["db_path"]
+    snapshots_dir = base_cfg["snapshots_dir"]
+    if args.build_static:
+        from ..visualization import static_site
+
+        with profiling.span("dashboard_static"):
+            stats = static_site.build_static(Path(snapshots_dir), Path(args.out), force=args.force)
+        print(f"Static dashboard written to {args.out}: {stats['built']} built, "
+              f"{stats['skipped']} unchanged, {stats['pruned']} pruned")
+    else:
+        from ..visualization import dashboard_streamlit
+
+        dashboard_streamlit.run_dashboard(db_path, snapshots_dir)
+
+
+# Serve subcommand
+def _configure_serve(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--season", type=int, required=True, help="Season to serve")
+    p.add_argument("--asof", required=True, help="Snapshot date YYYY-MM-DD")
+    p.add_argument("--models", default="elo", help="Comma separated models to load")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--cache_size", type=int, default=100_000, help="Maximum cached query results")
+
+
+@register("serve", "Run the local HTTP/JSON prediction service", _configure_serve)
+def _run_serve(args: argparse.Namespace, base_cfg: dict, providers_cfg: dict) -> None:
+    from ..serving import service as service_mod
+
+    models = [m.strip() for m in args.models.split(',') if m.strip()]
+    scoring_cfg = uio.read_yaml(CONFIG_DIR / "scoring.yaml")
+    with profiling.span("load_models", models=",".join(models)):
+        svc = service_mod.PredictionService(
+            base_cfg["db_path"], args.season, args.asof, models, base_cfg["model_defaults"], scoring_cfg, args.cache_size,
+            artifacts_root=base_cfg["artifacts_dir"],
+        )
+    service_mod.serve(svc, args.host, args.port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser from the subcommand registry."""
+    parser = argparse.ArgumentParser(description="March Madness prediction CLI")
+    parser.add_argument("--profile", action="store_true", help="Record per-stage timing and memory spans")
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        help="Trace JSON path for --profile (default outputs/profile/<command>-<timestamp>.trace.json)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, spec in COMMANDS.items():
+        spec["configure"](subparsers.add_parser(name, help=spec["help"]))
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if not args.profile:
+        return _run_command(args)
+    profiler = profiling.Profiler().activate()
+    try:
+        with profiler.span(f"cli.{args.command}"):
+            return _run_command(args)
+    finally:
+        profiler.deactivate()
+        out = args.profile_out or f"outputs/profile/{args.command}-{time.strftime('%Y%m%d-%H%M%S')}.trace.json"
+        print(f"Profile trace written to {profiler.write_trace(Path(out))}", file=sys.stderr)
+
+
+def _run_command(args: argparse.Namespace) -> int:
+    """Execute the parsed subcommand."""
+    # Load base configuration
+    base_cfg = uio.read_yaml(CONFIG_DIR / "base.yaml")
+    providers_cfg = uio.read_yaml(CONFIG_DIR / "providers.yaml")
+    cache_cfg = base_cfg.get("cache", {})
+    # An MM_CACHE_DIR set by the caller (e.g. a test harness) wins over base.yaml.
+    caching.configure(
+        os.environ.get("MM_CACHE_DIR") or cache_cfg.get("dir"),
+        int(cache_cfg["memory_mb"] * 2**20) if "memory_mb" in cache_cfg else None,
+        int(cache_cfg["disk_mb"] * 2**20) if "disk_mb" in cache_cfg else None,
+    )
+    COMMANDS[args.command]["run"](args, base_cfg, providers_cfg)
     return 0
 
 
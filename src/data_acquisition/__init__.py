@@ -14,6 +14,9 @@ scraper_torvik, scraper_sportsref, scraper_ncaa, scraper_wikipedia
     Mock scraper implementations that generate synthetic datasets.  Replace
     these with real scrapers that fetch and parse data from the respective
     providers.
+synthetic
+    Seeded generator for D1-scale synthetic seasons used for load testing
+    and benchmarks.
 """
 
 from . import schema
@@ -22,6 +25,7 @@ from . import scraper_torvik
 from . import scraper_sportsref
 from . import scraper_ncaa
 from . import scraper_wikipedia
+from . import synthetic
 
 __all__ = [
     "schema",
@@ -30,4 +34,5 @@ __all__ = [
     "scraper_sportsref",
     "scraper_ncaa",
     "scraper_wikipedia",
+    "synthetic",
 ]
@@ -9,18 +9,123 @@ columns.
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List
 import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
 import pandas as pd
 
+from ..utils import dates as udates
+from ..utils.logging import get_logger
 from . import schema as schema_mod
 
+logger = get_logger("etl")
+
+# Optional per-season coordinate tables: table -> CSV columns (id first).
+COORDINATE_TABLES = {
+    "team_locations": ["team_id", "lat", "lon"],
+    "venues": ["venue_id", "name", "lat", "lon"],
+}
+
+
+# Raw CSV layouts: column -> dtype read from the file (everything else is skipped).
+GAMES_DTYPES = {
+    "date": str,
+    "home_team_id": str,
+    "away_team_id": str,
+    "home_score": "float64",
+    "away_score": "float64",
+    "neutral": "float64",
+}
+TEAMS_DTYPES = {"team_id": str, "name": str}
+GAMES_COLUMNS = [
+    "season", "date", "home_team_id", "away_team_id", "home_score", "away_score", "neutral", "day", "home_uid", "away_uid",
+]
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def read_csv_chunks(path: Path, dtypes: Dict[str, Any], required: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream ``path`` in chunks of ``chunksize`` rows with explicit dtypes.
+
+    Only the columns in ``dtypes`` are parsed; a missing ``required`` column
+    raises ValueError before any rows are read.  Chunks carry the 1-based
+    file line of each row in their index (for error messages).
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [c for c in required if c not in header]
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}")
+    usecols = [c for c in dtypes if c in header]
+    reader = pd.read_csv(path, usecols=usecols, dtype={c: dtypes[c] for c in usecols}, chunksize=chunksize)
+    offset = 2  # header is line 1
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _invalid(path: Path, chunk: pd.DataFrame, bad: Any, what: str) -> ValueError:
+    lines = chunk.index[np.asarray(bad)][:5].tolist()
+    return ValueError(f"{path}: {what} on line(s) {lines}")
+
+
+def _clean_games(chunk: pd.DataFrame, season: int, path: Path) -> pd.DataFrame:
+    """Validate and cast one chunk of a games CSV to the ``games`` columns (sans uids)."""
+    for col in ("date", "home_team_id", "away_team_id", "home_score", "away_score"):
+        if chunk[col].isna().any():
+            raise _invalid(path, chunk, chunk[col].isna(), f"empty {col}")
+    for col in ("home_score", "away_score"):
+        values = chunk[col].to_numpy()
+        if ((values % 1) != 0).any() or (values < 0).any():
+            raise _invalid(path, chunk, (values % 1 != 0) | (values < 0), f"invalid {col}")
+    if (chunk["home_team_id"] == chunk["away_team_id"]).any():
+        raise _invalid(path, chunk, chunk["home_team_id"] == chunk["away_team_id"], "team playing itself")
+    try:
+        day = udates.ymd_to_ordinal(chunk["date"].to_numpy())
+    except ValueError as exc:
+        raise ValueError(f"{path}: unparseable date in lines {chunk.index[0]}-{chunk.index[-1]} ({exc})") from None
+    neutral = chunk["neutral"].fillna(0) if "neutral" in chunk else pd.Series(0, index=chunk.index)
+    return pd.DataFrame(
+        {
+            "season": np.full(len(chunk), season, dtype=np.int32),
+            "date": chunk["date"].to_numpy(),
+            "home_team_id": chunk["home_team_id"].to_numpy(),
+            "away_team_id": chunk["away_team_id"].to_numpy(),
+            "home_score": chunk["home_score"].to_numpy(dtype=np.int32),
+            "away_score": chunk["away_score"].to_numpy(dtype=np.int32),
+            "neutral": neutral.to_numpy(dtype=np.int8),
+            "day": day,
+        }
+    )
+
 
-def ingest_to_sqlite(seasons: List[int], raw_dir: Path, processed_db: str) -> None:
+def _insert(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> None:
+    """Bulk insert with plain Python values (one executemany per chunk)."""
+    columns = list(df.columns)
+    placeholders = ",".join("?" for _ in columns)
+    rows = zip(*(df[c].tolist() for c in columns))
+    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+
+def ingest_to_sqlite(
+    seasons: List[int],
+    raw_dir: Path,
+    processed_db: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
     """
     Ingest raw CSV files for the given seasons into the SQLite database.
 
+    Files are streamed in chunks of ``chunksize`` rows with explicit dtypes;
+    each chunk is validated, cast and inserted before the next is read, so
+    peak memory depends on ``chunksize`` rather than on the file size.  Each
+    season is one transaction.
+
     Parameters
     ----------
     seasons : List[int]
@@ -28,63 +133,100 @@ def ingest_to_sqlite(seasons: List[int], raw_dir: Path, processed_db: str) -> No
     raw_dir : Path
         Directory where raw files for each season are stored.  The expected
         naming convention is `<season>_games.csv` for game results and
-        `<season>_teams.csv` for basic team metadata.  You can extend this
-        function to support other file formats or more granular file naming.
+        `<season>_teams.csv` for basic team metadata.  Optional
+        `<season>_locations.csv` (team_id, lat, lon) and
+        `<season>_venues.csv` (venue_id, name, lat, lon) fill the coordinate
+        tables used for travel distances.
     processed_db : str
         Path to the SQLite database where ingested tables will be stored.
+    chunksize : int
+        Rows per chunk.
+    progress : callable, optional
+        Called after every chunk with ``{file, rows, seconds, rows_per_s}``
+        (cumulative for the file).
+
+    Returns
+    -------
+    dict
+        Total ``games`` and ``teams`` rows, ``seconds`` and ``rows_per_s``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a season's games or teams CSV is missing.
+    ValueError
+        If a file lacks a required column or a row fails validation (the
+        season's rows are rolled back).
     """
     # Ensure the database schema exists
     schema_mod.init_db(processed_db)
+    raw_dir = Path(raw_dir)
+    totals = {"games": 0, "teams": 0}
+    started = time.perf_counter()
+
+    def report(path: Path, rows: int, t0: float) -> None:
+        elapsed = time.perf_counter() - t0
+        info = {"file": str(path), "rows": rows, "seconds": elapsed, "rows_per_s": rows / max(elapsed, 1e-9)}
+        if progress is not None:
+            progress(info)
+        logger.debug(f"{path.name}: {rows} rows, {info['rows_per_s']:.0f} rows/s")
+
     conn = sqlite3.connect(processed_db)
     try:
         for season in seasons:
             # Determine file paths for the current season
             games_path = raw_dir / f"{season}_games.csv"
             teams_path = raw_dir / f"{season}_teams.csv"
-            if games_path.exists():
-                # Load games CSV into a DataFrame.  Expect columns:
-                # date (YYYY‑MM‑DD), home_team_id, away_team_id, home_score,
-                # away_score and optional neutral flag (1/0).  Additional
-                # columns will be ignored.
-                games_df = pd.read_csv(games_path)
-                # Cast data types explicitly to avoid SQLite type confusion
-                games_df = games_df.assign(
-                    season=season,
-                    date=games_df["date"].astype(str),
-                    home_team_id=games_df["home_team_id"].astype(str),
-                    away_team_id=games_df["away_team_id"].astype(str),
-                    home_score=games_df["home_score"].astype(int),
-                    away_score=games_df["away_score"].astype(int),
-                    neutral=games_df.get("neutral", 0).fillna(0).astype(int),
-                )[
-                    [
-                        "season",
-                        "date",
-                        "home_team_id",
-                        "away_team_id",
-                        "home_score",
-                        "away_score",
-                        "neutral",
-                    ]
-                ]
-                games_df.to_sql("games", conn, if_exists="append", index=False)
-            else:
-                raise FileNotFoundError(f"Missing games CSV: {games_path}")
-
-            if teams_path.exists():
-                teams_df = pd.read_csv(teams_path)
-                # Expect columns team_id and name; ignore others
-                teams_df = teams_df.assign(
-                    season=season,
-                    team_id=teams_df["team_id"].astype(str),
-                    name=teams_df["name"].astype(str),
-                )[["team_id", "season", "name"]]
-                teams_df.to_sql("teams", conn, if_exists="append", index=False)
-            else:
-                raise FileNotFoundError(f"Missing teams CSV: {teams_path}")
-        conn.commit()
+            for path in (games_path, teams_path):
+                if not path.exists():
+                    kind = "games" if path is games_path else "teams"
+                    raise FileNotFoundError(f"Missing {kind} CSV: {path}")
+            try:
+                t0, rows = time.perf_counter(), 0
+                required = ["date", "home_team_id", "away_team_id", "home_score", "away_score"]
+                for chunk in read_csv_chunks(games_path, GAMES_DTYPES, required, chunksize):
+                    games = _clean_games(chunk, season, games_path)
+                    uids = schema_mod.register_teams(
+                        conn, season, pd.unique(np.concatenate([games["home_team_id"], games["away_team_id"]]))
+                    )
+                    games["home_uid"] = games["home_team_id"].map(uids)
+                    games["away_uid"] = games["away_team_id"].map(uids)
+                    _insert(conn, "games", games[GAMES_COLUMNS])
+                    rows += len(games)
+                    report(games_path, rows, t0)
+                totals["games"] += rows
+
+                t0, rows = time.perf_counter(), 0
+                for chunk in read_csv_chunks(teams_path, TEAMS_DTYPES, ["team_id", "name"], chunksize):
+                    if chunk["team_id"].isna().any():
+                        raise _invalid(teams_path, chunk, chunk["team_id"].isna(), "empty team_id")
+                    teams = pd.DataFrame(
+                        {"team_id": chunk["team_id"].to_numpy(), "season": season, "name": chunk["name"].fillna("").to_numpy()}
+                    )
+                    _insert(conn, "teams", teams)
+                    schema_mod.register_teams(conn, season, teams["team_id"])
+                    rows += len(teams)
+                    report(teams_path, rows, t0)
+                totals["teams"] += rows
+
+                schema_mod.register_seasons(conn, [season])
+                for table, columns in COORDINATE_TABLES.items():
+                    path = raw_dir / f"{season}_{table.split('_')[-1]}.csv"
+                    if path.exists():
+                        conn.execute(f"DELETE FROM {table} WHERE season = ?", (season,))
+                        dtypes = {c: (str if c in (columns[0], "name") else "float64") for c in columns}
+                        for chunk in read_csv_chunks(path, dtypes, columns, chunksize):
+                            _insert(conn, table, chunk[columns].assign(season=season))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
     finally:
         conn.close()
+    seconds = time.perf_counter() - started
+    rows = totals["games"] + totals["teams"]
+    logger.info(f"Ingested {totals['games']} games and {totals['teams']} teams in {seconds:.2f}s ({rows / max(seconds, 1e-9):.0f} rows/s)")
+    return {**totals, "seconds": seconds, "rows_per_s": rows / max(seconds, 1e-9)}
 
 
 def index_db(processed_db: str) -> None:
@@ -100,9 +242,63 @@ def index_db(processed_db: str) -> None:
         c = conn.cursor()
         # Recreate indices (no‑ops if already present)
         c.execute("CREATE INDEX IF NOT EXISTS idx_games_season_date ON games(season, date);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_games_season_day ON games(season, day);")
         c.execute("CREATE INDEX IF NOT EXISTS idx_games_home_team ON games(home_team_id);")
         c.execute("CREATE INDEX IF NOT EXISTS idx_games_away_team ON games(away_team_id);")
         c.execute("CREATE INDEX IF NOT EXISTS idx_teams_season ON teams(season);")
         conn.commit()
     finally:
         conn.close()
+
+
+def load_games(processed_db: str, seasons: List[int], asof: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load games for the given seasons in chronological order.
+
+    Parameters
+    ----------
+    processed_db : str
+        Path to the SQLite database.
+    seasons : List[int]
+        Seasons to load.
+    asof : str, optional
+        If given (YYYY-MM-DD), only games played on or before this date are
+        returned, so callers never see post-snapshot results.
+
+    The integer ``day`` ordinal column (see :mod:`utils.dates`) drives the
+    as-of filter and ordering, and is returned as int32 for date arithmetic,
+    along with the int32 ``home_uid``/``away_uid`` team keys (see
+    :mod:`utils.interning`).
+    """
+    placeholders = ",".join("?" for _ in seasons)
+    query = (
+        "SELECT season, date, home_team_id, away_team_id, home_score, away_score, neutral, day, home_uid, away_uid "
+        f"FROM games WHERE season IN ({placeholders})"
+    )
+    params: list = list(seasons)
+    if asof is not None:
+        query += " AND day <= ?"
+        params.append(udates.day_ordinal(udates.parse_ymd(asof)))
+    query += " ORDER BY season, day, id"
+    conn = sqlite3.connect(processed_db)
+    try:
+        if "home_uid" not in {row[1] for row in conn.execute("PRAGMA table_info(games)")}:
+            schema_mod.init_db(processed_db)  # database from an older schema
+        games = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    return games.astype({"day": np.int32, "home_uid": np.int32, "away_uid": np.int32})
+
+
+def load_coordinates(processed_db: str, table: str, season: int) -> pd.DataFrame:
+    """Coordinates of one season from ``team_locations`` or ``venues``, sorted by id."""
+    if table not in COORDINATE_TABLES:
+        raise ValueError(f"Unknown coordinate table '{table}'")
+    columns = COORDINATE_TABLES[table]
+    conn = sqlite3.connect(processed_db)
+    try:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE season = ? ORDER BY {columns[0]}", conn, params=[season]
+        )
+    finally:
+        conn.close()
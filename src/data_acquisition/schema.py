@@ -12,6 +12,9 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
+from typing import Dict, Iterable
+
+from ..utils import dates as udates
 
 
 def init_db(db_path: str) -> None:
@@ -39,7 +42,39 @@ def init_db(db_path: str) -> None:
                 away_team_id TEXT NOT NULL,
                 home_score INTEGER NOT NULL,
                 away_score INTEGER NOT NULL,
-                neutral INTEGER DEFAULT 0
+                neutral INTEGER DEFAULT 0,
+                day INTEGER,
+                home_uid INTEGER,
+                away_uid INTEGER
+            );
+            """
+        )
+        # Surrogate integer keys for team ids (see utils.interning); uids are
+        # dense from 0 and never reassigned.
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS team_uids (
+                team_uid INTEGER PRIMARY KEY,
+                team_id  TEXT NOT NULL UNIQUE
+            );
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS team_seasons (
+                season   INTEGER NOT NULL,
+                team_uid INTEGER NOT NULL,
+                PRIMARY KEY (season, team_uid)
+            );
+            """
+        )
+        # Per-season calendar anchors as day ordinals (see utils.dates).
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seasons (
+                season               INTEGER PRIMARY KEY,
+                selection_sunday     TEXT NOT NULL,
+                selection_sunday_day INTEGER NOT NULL
             );
             """
         )
@@ -54,6 +89,48 @@ def init_db(db_path: str) -> None:
             );
             """
         )
+        # Per-team features as of a snapshot date (see join_features).
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS team_features (
+                season    INTEGER NOT NULL,
+                asof_date TEXT NOT NULL,
+                team_id   TEXT NOT NULL,
+                games     INTEGER NOT NULL,
+                adj_o     REAL,
+                adj_d     REAL,
+                tempo     REAL,
+                win_pct   REAL,
+                sos       REAL,
+                luck      REAL,
+                PRIMARY KEY (season, asof_date, team_id)
+            );
+            """
+        )
+        # Team campus and tournament venue coordinates (for travel distances).
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS team_locations (
+                team_id TEXT NOT NULL,
+                season  INTEGER NOT NULL,
+                lat     REAL NOT NULL,
+                lon     REAL NOT NULL,
+                PRIMARY KEY (team_id, season)
+            );
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS venues (
+                venue_id TEXT NOT NULL,
+                season   INTEGER NOT NULL,
+                name     TEXT NOT NULL,
+                lat      REAL NOT NULL,
+                lon      REAL NOT NULL,
+                PRIMARY KEY (venue_id, season)
+            );
+            """
+        )
         # Create basic indices to speed common queries.
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_games_season_date ON games(season, date);"
@@ -67,6 +144,81 @@ def init_db(db_path: str) -> None:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_teams_season ON teams(season);"
         )
+        migrate(conn)
         conn.commit()
     finally:
         conn.close()
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """
+    Bring a database created by an older schema up to date (idempotent).
+
+    Adds the integer ``games.day`` ordinal (days since 1970-01-01), fills it
+    from the TEXT ``date`` column, indexes (season, day) and records the
+    selection-Sunday ordinal of every season present.  Also interns every
+    team id into ``team_uids``/``team_seasons`` and fills
+    ``games.home_uid``/``away_uid``.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+    for column in ("day", "home_uid", "away_uid"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE games ADD COLUMN {column} INTEGER")
+    conn.execute(
+        "UPDATE games SET day = CAST(julianday(date) - ? AS INTEGER) WHERE day IS NULL",
+        (udates.SQLITE_EPOCH_JULIANDAY,),
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_season_day ON games(season, day);")
+    seasons = [row[0] for row in conn.execute("SELECT DISTINCT season FROM games")]
+    register_seasons(conn, seasons)
+    pending = conn.execute(
+        "SELECT DISTINCT season, team_id FROM ("
+        " SELECT season, home_team_id AS team_id FROM games WHERE home_uid IS NULL"
+        " UNION SELECT season, away_team_id FROM games WHERE away_uid IS NULL"
+        " UNION SELECT season, team_id FROM teams"
+        ") ORDER BY season, team_id"
+    ).fetchall()
+    for season in sorted({s for s, _ in pending}):
+        register_teams(conn, season, [t for s, t in pending if s == season])
+    conn.execute(
+        "UPDATE games SET home_uid = (SELECT team_uid FROM team_uids WHERE team_id = games.home_team_id)"
+        " WHERE home_uid IS NULL"
+    )
+    conn.execute(
+        "UPDATE games SET away_uid = (SELECT team_uid FROM team_uids WHERE team_id = games.away_team_id)"
+        " WHERE away_uid IS NULL"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_home_uid ON games(home_uid);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_away_uid ON games(away_uid);")
+
+
+def register_teams(conn: sqlite3.Connection, season: int, team_ids: Iterable[str]) -> Dict[str, int]:
+    """
+    Intern ``team_ids`` (new ids get the next free uids) for ``season``.
+
+    Returns
+    -------
+    dict
+        team_id -> team_uid for ``team_ids``.
+    """
+    ids = list(dict.fromkeys(str(t) for t in team_ids))
+    known = dict(conn.execute("SELECT team_id, team_uid FROM team_uids"))
+    next_uid = max(known.values(), default=-1) + 1
+    new = [t for t in ids if t not in known]
+    conn.executemany(
+        "INSERT INTO team_uids (team_uid, team_id) VALUES (?, ?)", [(next_uid + k, t) for k, t in enumerate(new)]
+    )
+    known.update({t: next_uid + k for k, t in enumerate(new)})
+    conn.executemany(
+        "INSERT OR IGNORE INTO team_seasons (season, team_uid) VALUES (?, ?)", [(int(season), known[t]) for t in ids]
+    )
+    return {t: known[t] for t in ids}
+
+
+def register_seasons(conn: sqlite3.Connection, seasons: Iterable[int]) -> None:
+    """Insert or refresh the ``seasons`` rows for ``seasons``."""
+    rows = []
+    for season in seasons:
+        sunday = udates.selection_sunday(int(season))
+        rows.append((int(season), udates.ymd(sunday), udates.day_ordinal(sunday)))
+    conn.executemany("INSERT OR REPLACE INTO seasons VALUES (?, ?, ?)", rows)
@@ -9,6 +9,7 @@ that fetches data from Sports‑Reference and saves it in the expected format.
 from __future__ import annotations
 
 import csv
+import json
 import random
 from pathlib import Path
 from typing import List, Dict, Any
@@ -18,6 +19,8 @@ def scrape_sportsref(seasons: List[int], raw_dir: Path, config: Dict[str, Any])
     """Generate dummy data for Sports‑Reference."""
     raw_dir.mkdir(parents=True, exist_ok=True)
     for season in seasons:
+        # Seeded per provider and season so repeated runs write identical files
+        rng = random.Random(f"{config.get('seed', 0)}-sportsref-{season}")
         games_path = raw_dir / f"{season}_games.csv"
         teams_path = raw_dir / f"{season}_teams.csv"
         teams = [f"SR{idx}" for idx in range(1, 5)]
@@ -33,8 +36,17 @@ def scrape_sportsref(seasons: List[int], raw_dir: Path, config: Dict[str, Any])
                 for away in teams:
                     if home == away:
                         continue
-                    date = f"{season}-02-{random.randint(1, 28):02d}"
-                    home_score = random.randint(60, 90)
-                    away_score = random.randint(60, 90)
+                    date = f"{season}-02-{rng.randint(1, 28):02d}"
+                    home_score = rng.randint(60, 90)
+                    away_score = rng.randint(60, 90)
                     neutral = 0
                     writer.writerow([date, home, away, home_score, away_score, neutral])
+        meta_dir = raw_dir / str(season) / "sportsref"
+        meta_dir.mkdir(parents=True, exist_ok=True)
+        with (meta_dir / "metadata.json").open("w", encoding="utf-8") as mf:
+            json.dump(
+                {"provider": "sportsref", "season": season, "seed": config.get("seed", 0),
+                 "files": [games_path.name, teams_path.name]},
+                mf,
+                indent=2,
+            )
@@ -17,6 +17,7 @@ When implementing a real scraper, you would:
 from __future__ import annotations
 
 import csv
+import json
 import random
 from pathlib import Path
 from typing import List, Dict, Any
@@ -38,6 +39,8 @@ def scrape_torvik(seasons: List[int], raw_dir: Path, config: Dict[str, Any]) ->
     """
     raw_dir.mkdir(parents=True, exist_ok=True)
     for season in seasons:
+        # Seeded per provider and season so repeated runs write identical files
+        rng = random.Random(f"{config.get('seed', 0)}-torvik-{season}")
         games_path = raw_dir / f"{season}_games.csv"
         teams_path = raw_dir / f"{season}_teams.csv"
         # Generate a simple round‑robin schedule between four teams
@@ -57,8 +60,17 @@ def scrape_torvik(seasons: List[int], raw_dir: Path, config: Dict[str, Any]) ->
                     if home == away:
                         continue
                     # Assign a date in January
-                    date = f"{season}-01-{random.randint(1, 28):02d}"
-                    home_score = random.randint(60, 90)
-                    away_score = random.randint(60, 90)
+                    date = f"{season}-01-{rng.randint(1, 28):02d}"
+                    home_score = rng.randint(60, 90)
+                    away_score = rng.randint(60, 90)
                     neutral = 0
                     writer.writerow([date, home, away, home_score, away_score, neutral])
+        meta_dir = raw_dir / str(season) / "torvik"
+        meta_dir.mkdir(parents=True, exist_ok=True)
+        with (meta_dir / "metadata.json").open("w", encoding="utf-8") as mf:
+            json.dump(
+                {"provider": "torvik", "season": season, "seed": config.get("seed", 0),
+                 "files": [games_path.name, teams_path.name]},
+                mf,
+                indent=2,
+            )
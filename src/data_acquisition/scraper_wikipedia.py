@@ -8,6 +8,7 @@ you would query Wikipedia pages for tournament results and parse the tables.
 from __future__ import annotations
 
 import csv
+import json
 import random
 from pathlib import Path
 from typing import List, Dict, Any
@@ -17,6 +18,8 @@ def scrape_wikipedia(seasons: List[int], raw_dir: Path, config: Dict[str, Any])
     """Generate dummy data for Wikipedia."""
     raw_dir.mkdir(parents=True, exist_ok=True)
     for season in seasons:
+        # Seeded per provider and season so repeated runs write identical files
+        rng = random.Random(f"{config.get('seed', 0)}-wikipedia-{season}")
         games_path = raw_dir / f"{season}_games.csv"
         teams_path = raw_dir / f"{season}_teams.csv"
         teams = [f"WP{idx}" for idx in range(1, 5)]
@@ -32,8 +35,17 @@ def scrape_wikipedia(seasons: List[int], raw_dir: Path, config: Dict[str, Any])
                 for away in teams:
                     if home == away:
                         continue
-                    date = f"{season}-04-{random.randint(1, 28):02d}"
-                    home_score = random.randint(60, 90)
-                    away_score = random.randint(60, 90)
+                    date = f"{season}-04-{rng.randint(1, 28):02d}"
+                    home_score = rng.randint(60, 90)
+                    away_score = rng.randint(60, 90)
                     neutral = 0
                     writer.writerow([date, home, away, home_score, away_score, neutral])
+        meta_dir = raw_dir / str(season) / "wikipedia"
+        meta_dir.mkdir(parents=True, exist_ok=True)
+        with (meta_dir / "metadata.json").open("w", encoding="utf-8") as mf:
+            json.dump(
+                {"provider": "wikipedia", "season": season, "seed": config.get("seed", 0),
+                 "files": [games_path.name, teams_path.name]},
+                mf,
+                indent=2,
+            )
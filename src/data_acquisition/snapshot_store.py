@@ -0,0 +1,220 @@
+"""
+Content-addressed, chunked snapshot store.
+
+A snapshot freezes the games up to an as-of date and the feature rows of
+that date.  Instead of copying whole tables per snapshot, each table is cut
+into partitions -- games by season week (day ordinal // 7), feature rows by
+blocks of teams -- and every partition is stored once under the hash of its
+content::
+
+    <root>/objects/<hh>/<hash>.arrow       Arrow IPC chunk (zstd), immutable
+    <root>/manifests/<season>/<asof>.json  table -> columns and ordered chunk refs
+
+Consecutive daily snapshots share every partition except the ones the new
+games touched, so a new snapshot writes only those chunks plus a small
+manifest, and disk use grows with the daily change rather than with the
+season.  Feature chunks omit the as-of column (it lives in the manifest) so
+a block of teams whose features did not change is shared across dates.
+Objects no manifest references are removed by :func:`gc`.  A snapshot
+being written references its chunks only once its manifest lands, so gc
+spares objects modified within a grace period, and a write that reuses an
+existing chunk refreshes its modification time first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from ..utils.logging import get_logger
+from . import etl as etl_mod
+
+logger = get_logger("snapshot")
+
+FEATURE_BLOCK = 64  # teams per feature chunk
+GC_GRACE_S = 3600.0  # objects younger than this are never collected
+
+
+def _chunk_hash(df: pd.DataFrame) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:32]
+
+
+def _object_path(root: Path, digest: str) -> Path:
+    return root / "objects" / digest[:2] / f"{digest}.arrow"
+
+
+def _put(root: Path, df: pd.DataFrame) -> Tuple[str, bool]:
+    """Store ``df`` unless an identical chunk exists; returns (hash, written)."""
+    import pyarrow as pa
+
+    digest = _chunk_hash(df)
+    path = _object_path(root, digest)
+    try:
+        # Mark the chunk as in use so a concurrent gc leaves it alone.
+        os.utime(path)
+        return digest, False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    return digest, True
+
+
+def _get(root: Path, digest: str) -> pd.DataFrame:
+    import pyarrow as pa
+
+    with pa.memory_map(str(_object_path(root, digest)), "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _partitions(db_path: str, season: int, asof: str) -> Dict[str, Tuple[List[str], List[Tuple[str, pd.DataFrame]]]]:
+    games = etl_mod.load_games(db_path, [season], asof)
+    conn = sqlite3.connect(db_path)
+    try:
+        feats = pd.read_sql_query(
+            "SELECT * FROM team_features WHERE season = ? AND asof_date = ? ORDER BY team_id", conn, params=[season, asof]
+        ).drop(columns=["asof_date"])
+    finally:
+        conn.close()
+    week = games["day"] // 7
+    blocks = range(0, len(feats), FEATURE_BLOCK)
+    return {
+        "games": (list(games.columns), [(f"w{int(w)}", part) for w, part in games.groupby(week, sort=True)]),
+        "team_features": (
+            list(feats.columns), [(f"b{k // FEATURE_BLOCK}", feats.iloc[k : k + FEATURE_BLOCK]) for k in blocks]
+        ),
+    }
+
+
+def manifest_path(root: Path, season: int, asof: str) -> Path:
+    return Path(root) / "manifests" / str(season) / f"{asof}.json"
+
+
+def write_snapshot(db_path: str, season: int, asof: str, root: Path) -> Dict[str, Any]:
+    """
+    Freeze games up to ``asof`` and the (season, asof) feature rows.
+
+    Parameters
+    ----------
+    db_path : str
+        SQLite database.
+    season : int
+        Season to freeze.
+    asof : str
+        As-of date (YYYY-MM-DD).
+    root : Path
+        Store root (``<snapshots_dir>/store``).
+
+    Returns
+    -------
+    dict
+        The manifest, plus ``chunks_written`` and ``bytes_written`` for this
+        call (not stored).
+    """
+    root = Path(root)
+    tables: Dict[str, Dict[str, Any]] = {}
+    written = bytes_written = 0
+    for table, (columns, parts) in _partitions(db_path, season, asof).items():
+        refs = []
+        for key, part in parts:
+            digest, new = _put(root, part)
+            if new:
+                written += 1
+                bytes_written += _object_path(root, digest).stat().st_size
+            refs.append({"key": key, "hash": digest, "rows": len(part)})
+        tables[table] = {"columns": columns, "chunks": refs}
+    manifest = {
+        "season": season,
+        "asof": asof,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": tables,
+    }
+    path = manifest_path(root, season, asof)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, path)
+    logger.info(f"Snapshot {season}@{asof}: {written} new chunks ({bytes_written} bytes) in {root}")
+    return {**manifest, "chunks_written": written, "bytes_written": bytes_written}
+
+
+def load_manifest(root: Path, season: int, asof: str) -> Dict[str, Any]:
+    path = manifest_path(root, season, asof)
+    if not path.exists():
+        raise FileNotFoundError(f"No snapshot {season}@{asof} in {root}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_table(root: Path, season: int, asof: str, table: str) -> pd.DataFrame:
+    """Reassemble one table of a snapshot from its chunks."""
+    manifest = load_manifest(Path(root), season, asof)
+    entry = manifest["tables"].get(table)
+    if entry is None:
+        raise KeyError(f"Snapshot {season}@{asof} has no table '{table}'")
+    chunks = [_get(Path(root), ref["hash"]) for ref in entry["chunks"]]
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=entry["columns"])
+    if table == "team_features":
+        df.insert(1, "asof_date", asof)
+    return df
+
+
+def list_snapshots(root: Path) -> List[Tuple[int, str]]:
+    """(season, asof) of every stored snapshot, in order."""
+    paths = Path(root).glob("manifests/*/*.json")
+    return sorted((int(p.parent.name), p.stem) for p in paths)
+
+
+def gc(root: Path, grace_s: float = GC_GRACE_S) -> Dict[str, int]:
+    """
+    Delete objects no manifest references; returns counts removed/kept.
+
+    Objects modified in the last ``grace_s`` seconds are kept even when
+    unreferenced: they may belong to a snapshot whose manifest is not
+    written yet.
+    """
+    root = Path(root)
+    cutoff = time.time() - grace_s
+    live = set()
+    for season, asof in list_snapshots(root):
+        for entry in load_manifest(root, season, asof)["tables"].values():
+            live.update(ref["hash"] for ref in entry["chunks"])
+    removed = kept = 0
+    for path in root.glob("objects/*/*.arrow"):
+        try:
+            recent = path.stat().st_mtime > cutoff
+        except FileNotFoundError:
+            continue
+        if path.stem in live or recent:
+            kept += 1
+        else:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return {"removed": removed, "kept": kept}
+
+
+def store_stats(root: Path) -> Dict[str, int]:
+    """Objects, bytes on disk and manifests in the store."""
+    objects = list(Path(root).glob("objects/*/*.arrow"))
+    return {
+        "objects": len(objects),
+        "bytes": sum(p.stat().st_size for p in objects),
+        "snapshots": len(list_snapshots(root)),
+    }
@@ -0,0 +1,271 @@
+"""
+Deterministic synthetic league generator.
+
+Produces D1-scale seasons for load testing and benchmarking: roughly 360
+teams split into conferences, a non-conference slate followed by a double
+round-robin conference schedule (about 5,500 games), and a 68-team
+tournament field with its First Four and bracket games.  Every team has a
+latent strength that drives game margins, so models trained on the output
+have real signal to find.
+
+Rows are streamed straight to the raw CSV layout read by
+:func:`etl.ingest_to_sqlite` (``<season>_games.csv`` and
+``<season>_teams.csv``) plus ``<season>_field.csv`` describing the
+tournament field and ``<season>_locations.csv`` / ``<season>_venues.csv``
+with campus and tournament site coordinates.  Only per-team arrays are held in memory, never the game
+list, so memory stays constant in the number of games.  Output is fully
+determined by ``seed`` and the season.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from ..utils import dates as udates
+from ..utils import rng as urng
+
+DEFAULTS: Dict[str, Any] = {
+    "seed": 1337,
+    "n_teams": 360,
+    "n_conferences": 32,
+    "nonconf_games": 11,
+    "field_size": 68,
+    "home_adv": 3.5,        # points
+    "strength_sd": 8.0,     # points of margin between teams
+    "game_sd": 11.0,        # per-game margin noise
+}
+
+# Continental US bounding box for synthetic campus and venue coordinates.
+LAT_RANGE = (25.0, 48.5)
+LON_RANGE = (-124.0, -70.0)
+N_VENUES = 14  # First Four, eight first/second-round sites, four regionals, Final Four
+
+GAMES_HEADER = ["date", "home_team_id", "away_team_id", "home_score", "away_score", "neutral"]
+
+
+def seed_order(n: int) -> List[int]:
+    """Bracket order of seeds 1..n for a region of size ``n`` (a power of two).
+
+    Adjacent entries meet in the first round and each half of the list is a
+    valid sub-bracket, e.g. ``seed_order(4) == [1, 4, 2, 3]``.
+    """
+    order = [1]
+    while len(order) < n:
+        size = 2 * len(order)
+        order = [s for seed in order for s in (seed, size + 1 - seed)]
+    return order
+
+
+def _round_robin(n: int) -> Iterator[List[Tuple[int, int]]]:
+    """Yield the rounds of a single round robin via the circle method."""
+    idx = list(range(n)) + ([-1] if n % 2 else [])
+    m = len(idx)
+    for r in range(m - 1):
+        pairs = []
+        for i in range(m // 2):
+            a, b = idx[i], idx[m - 1 - i]
+            if a >= 0 and b >= 0:
+                pairs.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        yield pairs
+        idx = [idx[0], idx[-1]] + idx[1:-1]
+
+
+class _Season:
+    """Per-season generator state; O(n_teams) memory."""
+
+    def __init__(self, season: int, cfg: Dict[str, Any]) -> None:
+        self.season = season
+        self.cfg = cfg
+        self.rng = urng.get_rng(int(cfg["seed"]), season)
+        n = int(cfg["n_teams"])
+        self.team_ids = [f"D{idx:03d}" for idx in range(n)]
+        self.strength = self.rng.normal(0.0, float(cfg["strength_sd"]), n)
+        self.pace = self.rng.normal(70.0, 4.0, n)
+        n_conf = max(1, min(int(cfg["n_conferences"]), n // 2))
+        self.conference = self.rng.permutation(np.arange(n) % n_conf)
+        self.wins = np.zeros(n, dtype=np.int32)
+        self.games = np.zeros(n, dtype=np.int32)
+
+    def play(self, home: int, away: int, neutral: bool, day: date) -> List[Any]:
+        """Simulate one game and return its CSV row."""
+        adv = 0.0 if neutral else float(self.cfg["home_adv"])
+        margin = self.strength[home] - self.strength[away] + adv + self.rng.normal(0.0, float(self.cfg["game_sd"]))
+        margin = int(np.rint(margin)) or (1 if self.rng.random() < 0.5 else -1)
+        total = self.pace[home] + self.pace[away] + self.rng.normal(0.0, 8.0)
+        home_score = int(np.rint((total + margin) / 2))
+        away_score = home_score - margin
+        winner = home if margin > 0 else away
+        self.wins[winner] += 1
+        self.games[[home, away]] += 1
+        return [udates.ymd(day), self.team_ids[home], self.team_ids[away], home_score, away_score, int(neutral)]
+
+    def regular_season(self) -> Iterator[List[Any]]:
+        n = len(self.team_ids)
+        start = date(self.season - 1, 11, 6)
+        # Non-conference slate: random pairings across the league.
+        for r in range(int(self.cfg["nonconf_games"])):
+            day = start + timedelta(days=5 * r)
+            perm = self.rng.permutation(n)
+            for i in range(0, n - 1, 2):
+                a, b = int(perm[i]), int(perm[i + 1])
+                if self.conference[a] == self.conference[b]:
+                    continue
+                neutral = bool(self.rng.random() < 0.1)
+                yield self.play(a, b, neutral, day)
+        # Conference play: double round robin, home and away swapped in the second leg.
+        conf_start = date(self.season, 1, 2)
+        members = [np.flatnonzero(self.conference == c) for c in np.unique(self.conference)]
+        schedules = [list(_round_robin(len(m))) for m in members]
+        n_rounds = max(len(s) for s in schedules)
+        step = max(1, 60 // max(1, 2 * n_rounds))
+        for leg in range(2):
+            for r in range(n_rounds):
+                day = conf_start + timedelta(days=step * (leg * n_rounds + r))
+                for m, sched in zip(members, schedules):
+                    if r >= len(sched):
+                        continue
+                    for a, b in sched[r]:
+                        home, away = (m[a], m[b]) if leg == 0 else (m[b], m[a])
+                        yield self.play(int(home), int(away), False, day)
+
+    def select_field(self) -> List[Tuple[int, int, int, int, bool]]:
+        """Pick the tournament field: (team, region, seed, slot, play_in)."""
+        n = len(self.team_ids)
+        field_size = min(int(self.cfg["field_size"]), n)
+        bracket = 1 << int(np.log2(min(field_size, 64)))
+        n_play_in = min(field_size - bracket, bracket // 4)
+        win_pct = self.wins / np.maximum(self.games, 1)
+        score = self.strength + 10.0 * win_pct + self.rng.normal(0.0, 1.0, n)
+        # Automatic bids go to each conference's best record.
+        autos = set()
+        for c in np.unique(self.conference):
+            m = np.flatnonzero(self.conference == c)
+            autos.add(int(m[np.lexsort((-self.strength[m], -win_pct[m]))[0]]))
+        autos = set(sorted(autos, key=lambda t: -score[t])[: bracket + n_play_in])
+        at_large = [int(t) for t in np.argsort(-score) if int(t) not in autos]
+        field = sorted(list(autos) + at_large[: bracket + n_play_in - len(autos)], key=lambda t: -score[t])
+
+        n_regions = 4 if bracket >= 8 else 1
+        region_size = bracket // n_regions
+        order = seed_order(region_size)
+        rows = []
+        for rank, team in enumerate(field[:bracket]):
+            seed, region = rank // n_regions + 1, rank % n_regions
+            slot = region * region_size + order.index(seed)
+            rows.append((team, region, seed, slot, False))
+        # First Four: the last teams in share the bottom seed lines' slots.
+        for k, team in enumerate(field[bracket:]):
+            team_, region, seed, slot, _ = rows[bracket - n_play_in + k]
+            rows[bracket - n_play_in + k] = (team_, region, seed, slot, True)
+            rows.append((team, region, seed, slot, True))
+        return rows
+
+    def tournament(self, field: List[Tuple[int, int, int, int, bool]]) -> Iterator[List[Any]]:
+        sunday = udates.selection_sunday(self.season)
+        by_slot: Dict[int, List[int]] = {}
+        for team, _, _, slot, _ in field:
+            by_slot.setdefault(slot, []).append(team)
+        alive = []
+        for slot in sorted(by_slot):
+            teams = by_slot[slot]
+            if len(teams) == 2:
+                row = self.play(teams[0], teams[1], True, sunday + timedelta(days=2))
+                yield row
+                teams = [teams[0] if row[3] > row[4] else teams[1]]
+            alive.append(teams[0])
+        offsets = [4, 6, 11, 13, 20, 22]
+        rnd = 0
+        while len(alive) > 1:
+            day = sunday + timedelta(days=offsets[min(rnd, len(offsets) - 1)])
+            nxt = []
+            for i in range(0, len(alive), 2):
+                row = self.play(alive[i], alive[i + 1], True, day)
+                yield row
+                nxt.append(alive[i] if row[3] > row[4] else alive[i + 1])
+            alive = nxt
+            rnd += 1
+
+
+def generate_season(season: int, raw_dir: Path, config: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Write one synthetic season to ``raw_dir`` and return a small summary.
+
+    Parameters
+    ----------
+    season : int
+        Season year (the year the tournament is played).
+    raw_dir : Path
+        Directory receiving ``<season>_games.csv``, ``<season>_teams.csv``,
+        ``<season>_field.csv``, ``<season>_locations.csv`` and
+        ``<season>_venues.csv``.
+    config : dict, optional
+        Overrides for :data:`DEFAULTS` (seed, n_teams, n_conferences,
+        nonconf_games, field_size, home_adv, strength_sd, game_sd).
+
+    Returns
+    -------
+    dict
+        Counts of teams and games written.
+    """
+    cfg = {**DEFAULTS, **(config or {})}
+    raw_dir = Path(raw_dir)
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    state = _Season(season, cfg)
+
+    with (raw_dir / f"{season}_teams.csv").open("w", newline="", encoding="utf-8") as tf:
+        writer = csv.writer(tf)
+        writer.writerow(["team_id", "name", "conference"])
+        for idx, team in enumerate(state.team_ids):
+            writer.writerow([team, f"Synthetic {team}", f"C{state.conference[idx]:02d}"])
+
+    n_games = 0
+    with (raw_dir / f"{season}_games.csv").open("w", newline="", encoding="utf-8") as gf:
+        writer = csv.writer(gf)
+        writer.writerow(GAMES_HEADER)
+        for row in state.regular_season():
+            writer.writerow(row)
+            n_games += 1
+        field = state.select_field()
+        n_regular = n_games
+        for row in state.tournament(field):
+            writer.writerow(row)
+            n_games += 1
+
+    with (raw_dir / f"{season}_field.csv").open("w", newline="", encoding="utf-8") as ff:
+        writer = csv.writer(ff)
+        writer.writerow(["team_id", "region", "seed", "slot", "play_in"])
+        for team, region, seed, slot, play_in in sorted(field, key=lambda r: r[3]):
+            writer.writerow([state.team_ids[team], region, seed, slot, int(play_in)])
+
+    # Coordinates use their own stream so games and field do not depend on them.
+    geo_rng = urng.get_rng(int(cfg["seed"]), season, 1)
+    with (raw_dir / f"{season}_locations.csv").open("w", newline="", encoding="utf-8") as lf:
+        writer = csv.writer(lf)
+        writer.writerow(["team_id", "lat", "lon"])
+        for team in state.team_ids:
+            writer.writerow([team, round(geo_rng.uniform(*LAT_RANGE), 4), round(geo_rng.uniform(*LON_RANGE), 4)])
+    with (raw_dir / f"{season}_venues.csv").open("w", newline="", encoding="utf-8") as vf:
+        writer = csv.writer(vf)
+        writer.writerow(["venue_id", "name", "lat", "lon"])
+        for k in range(N_VENUES):
+            lat, lon = geo_rng.uniform(*LAT_RANGE), geo_rng.uniform(*LON_RANGE)
+            writer.writerow([f"V{k:02d}", f"Synthetic Arena {k:02d}", round(lat, 4), round(lon, 4)])
+
+    return {
+        "season": season,
+        "n_teams": len(state.team_ids),
+        "n_regular_games": n_regular,
+        "n_tournament_games": n_games - n_regular,
+        "field_size": len(field),
+    }
+
+
+def generate_league(seasons: List[int], raw_dir: Path, config: Dict[str, Any]) -> None:
+    """Generate synthetic seasons; mirrors the scraper signature used by the CLI."""
+    for season in seasons:
+        generate_season(season, raw_dir, config)
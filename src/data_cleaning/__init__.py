@@ -4,4 +4,5 @@ __all__ = [
     "standardize",
     "join_features",
     "leakage_guards",
+    "travel",
 ]
@@ -4,19 +4,39 @@ from __future__ import annotations
 from typing import List
 import sqlite3
 
+from ..data_acquisition import etl as etl_mod
+from ..data_acquisition import schema as schema_mod
+from ..simulation import features as feat_mod
+
+FEATURE_COLUMNS = ["games", "adj_o", "adj_d", "tempo", "win_pct", "sos", "luck"]
+
 
 def build_feature_table(processed_db: str, season: int, asof: str) -> None:
     """
     Create per-team/per-asof feature rows (adj_o, adj_d, tempo, sos, luck, exp,
     style_contrast, travel_km, rest_days).  Uses only records with date <= asof.
 
-    Placeholder implementation that ensures the team_metrics table exists.
+    Currently fills the game-derived columns of ``team_features`` (see
+    :func:`features.team_season_features`); roster, travel and rest features
+    are added by their own builders.  Existing rows for (season, asof) are
+    replaced.
     """
+    schema_mod.init_db(processed_db)
+    games = etl_mod.load_games(processed_db, [season], asof)
+    feats = feat_mod.team_season_features(games)
     conn = sqlite3.connect(processed_db)
     try:
         c = conn.cursor()
-        # For placeholder, we do nothing. In a full implementation this would
-        # aggregate game results and metrics to compute features.
-        pass
+        c.execute("DELETE FROM team_features WHERE season = ? AND asof_date = ?", (season, asof))
+        rows = [
+            (season, asof, team, *(float(v) for v in vals))
+            for team, vals in zip(feats.index, feats[FEATURE_COLUMNS].itertuples(index=False))
+        ]
+        placeholders = ",".join("?" for _ in range(3 + len(FEATURE_COLUMNS)))
+        c.executemany(
+            f"INSERT INTO team_features (season, asof_date, team_id, {', '.join(FEATURE_COLUMNS)}) VALUES ({placeholders})",
+            rows,
+        )
+        conn.commit()
     finally:
         conn.close()
@@ -0,0 +1,100 @@
+"""
+Travel-distance features.
+
+Distances from every team's campus to every tournament venue of a season
+are computed once with vectorized haversine (:func:`geo.distance_matrix`)
+and cached next to the season's snapshots as ``travel_km.npz``, keyed by a
+hash of the coordinate tables so edits to either table rebuild it.  Feature
+builders then look distances up for whole arrays of (team, venue)
+assignments with a single gather instead of one scalar call per pair.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..data_acquisition import etl as etl_mod
+from ..simulation import artifacts
+from ..utils import geo
+from ..utils.logging import get_logger
+
+logger = get_logger("features")
+
+TRAVEL_FILE = "travel_km.npz"
+
+
+def travel_matrix(db_path: str, season: int) -> Dict[str, np.ndarray]:
+    """
+    Teams x venues distance matrix of one season.
+
+    Returns
+    -------
+    dict
+        ``team_ids``, ``venue_ids`` (sorted), ``km`` (float32, teams x
+        venues) and ``inputs`` (hash of the coordinate tables).
+    """
+    teams = etl_mod.load_coordinates(db_path, "team_locations", season)
+    venues = etl_mod.load_coordinates(db_path, "venues", season)
+    return _travel_from_frames(teams, venues, _inputs_hash(teams, venues))
+
+
+def _inputs_hash(teams: pd.DataFrame, venues: pd.DataFrame) -> str:
+    return artifacts.frame_hash(teams) + artifacts.frame_hash(venues)
+
+
+def _travel_from_frames(teams: pd.DataFrame, venues: pd.DataFrame, inputs: str) -> Dict[str, np.ndarray]:
+    return {
+        "team_ids": teams["team_id"].to_numpy(dtype=str),
+        "venue_ids": venues["venue_id"].to_numpy(dtype=str),
+        "km": geo.distance_matrix(teams["lat"], teams["lon"], venues["lat"], venues["lon"]),
+        "inputs": np.array(inputs),
+    }
+
+
+def season_travel(db_path: str, season: int, snapshots_dir: Path) -> Dict[str, np.ndarray]:
+    """
+    :func:`travel_matrix`, cached in ``<snapshots_dir>/<season>/travel_km.npz``.
+
+    The cache is reused while the coordinate tables are unchanged.
+    """
+    path = Path(snapshots_dir) / str(season) / TRAVEL_FILE
+    teams = etl_mod.load_coordinates(db_path, "team_locations", season)
+    venues = etl_mod.load_coordinates(db_path, "venues", season)
+    inputs = _inputs_hash(teams, venues)
+    if path.exists():
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached["inputs"]) == inputs:
+                return {k: cached[k] for k in cached.files}
+    travel = _travel_from_frames(teams, venues, inputs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.npz")
+    np.savez(tmp, **travel)
+    os.replace(tmp, path)
+    logger.info(f"Travel matrix for {season}: {travel['km'].shape[0]} teams x {travel['km'].shape[1]} venues -> {path}")
+    return travel
+
+
+def travel_km(travel: Dict[str, np.ndarray], team_ids: Sequence[str], venue_ids: Sequence[str]) -> np.ndarray:
+    """
+    Distance of each team to its assigned venue (NaN when either is unknown).
+
+    ``team_ids`` and ``venue_ids`` are aligned arrays of assignments.
+    """
+    ti = pd.Index(travel["team_ids"]).get_indexer(np.asarray(team_ids, dtype=str))
+    vi = pd.Index(travel["venue_ids"]).get_indexer(np.asarray(venue_ids, dtype=str))
+    known = (ti >= 0) & (vi >= 0)
+    out = np.full(len(ti), np.nan)
+    out[known] = travel["km"][ti[known], vi[known]]
+    return out
+
+
+def matchup_travel(
+    travel: Dict[str, np.ndarray], team_a: Sequence[str], team_b: Sequence[str], venue_ids: Sequence[str]
+) -> np.ndarray:
+    """``travel_km`` feature of matchups at a venue: team A's distance minus team B's."""
+    return travel_km(travel, team_a, venue_ids) - travel_km(travel, team_b, venue_ids)
@@ -1,6 +1,19 @@
 """Functions for scoring tournament brackets."""
 
-from typing import Dict
+import re
+from typing import Dict, List
+
+import numpy as np
+
+_GAME_ID = re.compile(r"^R(\d+)G\d+$")
+
+
+def round_points(system: str, config: dict) -> List[int]:
+    """Points per correct pick in each round (R64..Final) for ``system``."""
+    try:
+        return list(config["systems"][system]["round_points"])
+    except KeyError:
+        raise ValueError(f"Unknown scoring system '{system}'") from None
 
 
 def score_bracket(picks: Dict[str, str], truth: Dict[str, str], system: str, config: dict) -> int:
@@ -21,11 +34,39 @@ def score_bracket(picks: Dict[str, str], truth: Dict[str, str], system: str, con
     Returns
     -------
     int
-        Total points scored.
+        Total points scored.  Games with ``R<round>G<k>`` ids earn the
+        system's points for that round; other ids earn 1 point.
     """
-    # Placeholder scoring: 1 point per correct pick
+    points = round_points(system, config)
     score = 0
     for game_id, winner in picks.items():
         if truth.get(game_id) == winner:
-            score += 1
+            match = _GAME_ID.match(game_id)
+            score += points[int(match.group(1))] if match else 1
     return score
+
+
+def score_matrix(picks: np.ndarray, outcomes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Scores of many brackets against many outcomes at once.
+
+    Parameters
+    ----------
+    picks : ndarray
+        (n_brackets, n_games) picked winner slot per game.
+    outcomes : ndarray
+        (n_trials, n_games) actual winner slot per game.
+    points : ndarray
+        (n_games,) points for a correct pick of each game.
+
+    Returns
+    -------
+    ndarray
+        (n_trials, n_brackets) int32 scores.
+    """
+    picks = np.atleast_2d(picks)
+    scores = np.zeros((len(outcomes), len(picks)), dtype=np.int32)
+    # One game at a time keeps the temporaries at n_trials x n_brackets.
+    for g, pts in enumerate(np.asarray(points)):
+        scores += (outcomes[:, g, None] == picks[None, :, g]) * np.int32(pts)
+    return scores
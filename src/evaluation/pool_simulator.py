@@ -1,12 +1,362 @@
-"""Simulate bracket pools against public pick distributions."""
+"""
+Simulate bracket pools against public pick distributions.
 
-from typing import Dict, List
+A pool is evaluated on common random numbers: one set of simulated
+tournament outcomes and one library of public brackets, sampled once and
+shared by every bracket scored against them.  Opponents are treated as
+independent draws from the library, so the expected share of first place
+against ``n`` opponents in a trial where a fraction ``a`` of the library
+scores below us and ``f`` ties us is ``((a + f)^(n+1) - a^(n+1)) / ((n+1) f)``
+(``a^n`` without ties) -- exact for any pool size, at the cost of one
+comparison per library bracket.
 
+:func:`optimize_bracket` hill-climbs from the chalk bracket over
+single-game pick changes.  Neighbours are first screened on a slice of the
+trials and dropped when their paired difference to the incumbent is
+clearly negative; survivors are scored on every trial, in parallel across
+processes when ``workers > 1``.
+"""
 
-def simulate_pool(model_picks: dict, public_pick_dist: dict, systems: List[str], n_competitors: int, n_trials: int) -> dict:
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..simulation import monte_carlo
+from ..utils import io as uio
+from ..utils import profiling
+from . import bracket_scoring
+
+SCORING_CONFIG = Path(__file__).resolve().parent.parent.parent / "config" / "scoring.yaml"
+
+# Share given to teams missing from the public pick distribution of a game.
+MIN_SHARE = 1e-3
+
+
+def picks_to_slots(picks: Mapping[str, str], teams: List[str]) -> np.ndarray:
+    """``{game_id: team}`` picks as an array of winner slots in game order."""
+    slot = {t: i for i, t in enumerate(teams)}
+    return np.array([slot[picks[g]] for g in monte_carlo.game_ids(len(teams))], dtype=np.int16)
+
+
+def slots_to_picks(slots: np.ndarray, teams: List[str]) -> Dict[str, str]:
+    return {g: teams[int(s)] for g, s in zip(monte_carlo.game_ids(len(teams)), slots)}
+
+
+def public_shares(public_pick_dist: Mapping[str, Mapping[str, float]], teams: List[str]) -> np.ndarray:
+    """
+    (n_games, n_teams) share of the public picking each team to win each game.
+
+    Entries that are not teams of the bracket (e.g. ``"other"``) are ignored.
+    """
+    slot = {t: i for i, t in enumerate(teams)}
+    shares = np.full((len(teams) - 1, len(teams)), MIN_SHARE)
+    for col, game in enumerate(monte_carlo.game_ids(len(teams))):
+        for team, share in public_pick_dist.get(game, {}).items():
+            if team in slot:
+                shares[col, slot[team]] = max(float(share), MIN_SHARE)
+    return shares
+
+
+def sample_public_brackets(shares: np.ndarray, n: int, seed: int) -> np.ndarray:
+    """
+    Draw ``n`` consistent brackets from per-game public pick shares.
+
+    Each game is decided between the two teams the bracket advanced to it,
+    in proportion to their public shares for that game.
+    """
+    n_teams = shares.shape[1]
+    rng = np.random.default_rng(seed)
+    rounds = monte_carlo.game_rounds(n_teams)
+    out = np.empty((n, len(rounds)), dtype=np.int16)
+    alive = np.broadcast_to(np.arange(n_teams, dtype=np.int16), (n, n_teams))
+    for r in range(int(rounds[-1]) + 1):
+        cols = np.flatnonzero(rounds == r)
+        a, b = alive[:, 0::2], alive[:, 1::2]
+        s_a = shares[cols, a]
+        s_b = shares[cols, b]
+        alive = np.where(rng.random(a.shape) * (s_a + s_b) < s_a, a, b).astype(np.int16)
+        out[:, cols] = alive
+    return out
+
+
+def game_points(n_teams: int, system: str, config: dict) -> np.ndarray:
+    """Points for a correct pick of each game column."""
+    return np.asarray(bracket_scoring.round_points(system, config))[monte_carlo.game_rounds(n_teams)]
+
+
+def pool_context(
+    teams: List[str],
+    P: Optional[np.ndarray],
+    public_pick_dist: Mapping[str, Mapping[str, float]],
+    system: str,
+    config: dict,
+    n_entrants: int,
+    n_trials: int,
+    n_public: int = 1000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Shared outcomes and opponent library for evaluating brackets in one pool.
+
+    Parameters
+    ----------
+    teams : list of str
+        Team ids in bracket slot order.
+    P : ndarray, optional
+        Slot-aligned win-probability matrix for the outcomes; without it,
+        outcomes are drawn from the public pick shares.
+    public_pick_dist : mapping
+        Game id -> {team: share of public brackets picking it}.
+    system : str
+        Scoring system in ``config``.
+    config : dict
+        Parsed scoring.yaml.
+    n_entrants : int
+        Pool size including our bracket.
+    n_trials : int
+        Simulated tournaments.
+    n_public : int
+        Size of the public bracket library opponents are drawn from.
+    seed : int
+        Seed of the outcomes (the library uses ``seed + 1``).
+    """
+    shares = public_shares(public_pick_dist, teams)
+    if P is not None:
+        outcomes = monte_carlo.simulate_bracket(teams, P, n_trials, seed)["winners"]
+    else:
+        outcomes = sample_public_brackets(shares, n_trials, seed)
+    points = game_points(len(teams), system, config)
+    library = sample_public_brackets(shares, n_public, seed + 1)
+    with profiling.span("score", system=system, brackets=n_public, trials=n_trials):
+        library_scores = bracket_scoring.score_matrix(library, outcomes, points)
+    return {
+        "teams": list(teams),
+        "outcomes": outcomes,
+        "points": points,
+        "library": library_scores,
+        "n_opponents": max(int(n_entrants) - 1, 0),
+    }
+
+
+def trial_shares(ctx: Dict[str, Any], picks: np.ndarray, trials: slice = slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-trial score and expected share of first place for one bracket.
+
+    Returns
+    -------
+    (ndarray, ndarray)
+        Scores and win shares over ``trials``.
+    """
+    scores = bracket_scoring.score_matrix(picks, ctx["outcomes"][trials], ctx["points"])[:, 0]
+    library = ctx["library"][trials]
+    below = (library < scores[:, None]).mean(axis=1)
+    tied = (library == scores[:, None]).mean(axis=1)
+    n = ctx["n_opponents"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        split = ((below + tied) ** (n + 1) - below ** (n + 1)) / ((n + 1) * tied)
+    return scores, np.where(tied > 0, split, below**n)
+
+
+def simulate_pool(
+    model_picks: dict,
+    public_pick_dist: dict,
+    systems: List[str],
+    n_competitors: int,
+    n_trials: int,
+    teams: List[str],
+    P: Optional[np.ndarray] = None,
+    config: Optional[dict] = None,
+    n_public: int = 1000,
+    seed: int = 0,
+) -> dict:
     """
     Simulate a bracket pool given model picks and public pick distribution.
-    Placeholder implementation that returns an empty result.
+
+    Parameters
+    ----------
+    model_picks : dict
+        Our bracket, game id -> team.
+    public_pick_dist : dict
+        Game id -> {team: public pick share}.
+    systems : list of str
+        Scoring systems to evaluate.
+    n_competitors : int
+        Pool size including our bracket.
+    n_trials : int
+        Simulated tournaments (shared by every system).
+    teams : list of str
+        Team ids in bracket slot order.
+    P : ndarray, optional
+        Outcome probabilities; see :func:`pool_context`.
+    config : dict, optional
+        Parsed scoring.yaml (default: ``config/scoring.yaml``).
+    n_public, seed
+        See :func:`pool_context`.
+
+    Returns
+    -------
+    dict
+        System -> ``win_prob`` (expected share of first place),
+        ``expected_score`` and ``percentile`` (mean fraction of the public
+        library scoring below us).
+    """
+    if config is None:
+        config = uio.read_yaml(SCORING_CONFIG)
+    picks = picks_to_slots(model_picks, teams)
+    out = {}
+    for system in systems:
+        ctx = pool_context(teams, P, public_pick_dist, system, config, n_competitors, n_trials, n_public, seed)
+        scores, shares = trial_shares(ctx, picks)
+        out[system] = {
+            "win_prob": float(shares.mean()),
+            "expected_score": float(scores.mean()),
+            "percentile": float((ctx["library"] < scores[:, None]).mean()),
+        }
+    return out
+
+
+def chalk_bracket(P: np.ndarray) -> np.ndarray:
+    """Winner slots of the bracket that always picks the favourite."""
+    n_teams = len(P)
+    rounds = monte_carlo.game_rounds(n_teams)
+    out = np.empty(len(rounds), dtype=np.int16)
+    alive = np.arange(n_teams)
+    for r in range(int(rounds[-1]) + 1):
+        a, b = alive[0::2], alive[1::2]
+        alive = np.where(P[a, b] >= 0.5, a, b)
+        out[rounds == r] = alive
+    return out
+
+
+def set_winner(picks: np.ndarray, col: int, slot: int) -> np.ndarray:
+    """
+    Copy of ``picks`` with ``slot`` winning game ``col``.
+
+    The team also wins every earlier game on its path, and replaces the
+    displaced winner in any later game that bracket had it winning.
+    """
+    rounds = monte_carlo.game_rounds(len(picks) + 1)
+    first = np.searchsorted(rounds, np.arange(int(rounds[-1]) + 1))
+    out = picks.copy()
+    old = out[col]
+    for r in range(int(rounds[-1]) + 1):
+        c = int(first[r]) + (slot >> (r + 1))
+        if r <= rounds[col]:
+            out[c] = slot
+        elif out[c] == old:
+            out[c] = slot
+        else:
+            break
+    return out
+
+
+def neighbours(picks: np.ndarray) -> List[np.ndarray]:
+    """Brackets differing from ``picks`` in the winner of one game (and its consequences)."""
+    n_teams = len(picks) + 1
+    a, b = monte_carlo.game_participants(picks[None, :], n_teams)
+    return [set_winner(picks, col, int(b[0, col] if picks[col] == a[0, col] else a[0, col])) for col in range(len(picks))]
+
+
+_WORKER_CTX: Dict[str, Any] = {}
+
+
+def _init_worker(ctx: Dict[str, Any]) -> None:
+    _WORKER_CTX.update(ctx)
+
+
+def _evaluate(job: Tuple[np.ndarray, np.ndarray, int, float]) -> Optional[Tuple[float, float]]:
+    """Screen then fully score one candidate; None when pruned."""
+    candidate, incumbent, n_screen, z = job
+    ctx = _WORKER_CTX
+    screen = slice(0, n_screen)
+    diff = trial_shares(ctx, candidate, screen)[1] - incumbent[screen]
+    if diff.mean() + z * diff.std(ddof=1) / np.sqrt(len(diff)) < 0:
+        return None
+    scores, shares = trial_shares(ctx, candidate)
+    return float(shares.mean()), float(scores.mean())
+
+
+def optimize_bracket(
+    teams: List[str],
+    P: np.ndarray,
+    public_pick_dist: Mapping[str, Mapping[str, float]],
+    system: str,
+    config: dict,
+    n_entrants: int,
+    n_trials: int = 10_000,
+    n_public: int = 1000,
+    seed: int = 0,
+    workers: Optional[int] = 1,
+    max_iter: int = 50,
+    screen_frac: float = 0.125,
+    z: float = 2.0,
+) -> Dict[str, Any]:
+    """
+    Search for the bracket with the highest chance of winning a pool.
+
+    Parameters
+    ----------
+    teams, P, public_pick_dist, system, config, n_entrants, n_trials, n_public, seed
+        See :func:`pool_context`; every candidate is scored on the same
+        outcomes and opponent library.
+    workers : int, optional
+        Evaluation processes (None: CPU count; 1: in-process).
+    max_iter : int
+        Maximum hill-climbing steps.
+    screen_frac : float
+        Fraction of the trials used to screen candidates.
+    z : float
+        A candidate is pruned when its screened paired difference to the
+        incumbent is more than ``z`` standard errors below zero.
+
+    Returns
+    -------
+    dict
+        ``picks`` (game id -> team), ``win_prob``, ``expected_score``,
+        ``chalk_win_prob``, ``iterations``, ``evaluated`` and ``pruned``.
     """
-    # TODO: implement pool simulation
-    return {}
+    ctx = pool_context(teams, P, public_pick_dist, system, config, n_entrants, n_trials, n_public, seed)
+    n_screen = max(int(n_trials * screen_frac), 2)
+    best = chalk_bracket(np.asarray(P))
+    scores, shares = trial_shares(ctx, best)
+    chalk_win = best_win = float(shares.mean())
+    best_score = float(scores.mean())
+    stats = {"iterations": 0, "evaluated": 0, "pruned": 0}
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(ctx,)) if workers > 1 else None
+    if pool is None:
+        _init_worker(ctx)
+    try:
+        seen = {best.tobytes()}
+        for _ in range(max_iter):
+            stats["iterations"] += 1
+            cands = [c for c in neighbours(best) if c.tobytes() not in seen]
+            seen.update(c.tobytes() for c in cands)
+            jobs = [(c, shares, n_screen, z) for c in cands]
+            if pool is not None:
+                results = list(pool.map(_evaluate, jobs, chunksize=max(len(jobs) // (4 * workers), 1)))
+            else:
+                results = [_evaluate(job) for job in jobs]
+            stats["evaluated"] += len(results)
+            stats["pruned"] += sum(r is None for r in results)
+            scored = [(r, c) for r, c in zip(results, cands) if r is not None and r[0] > best_win]
+            if not scored:
+                break
+            (best_win, best_score), best = max(scored, key=lambda rc: rc[0][0])
+            shares = trial_shares(ctx, best)[1]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _WORKER_CTX.clear()
+    return {
+        "picks": slots_to_picks(best, list(teams)),
+        "win_prob": best_win,
+        "expected_score": best_score,
+        "chalk_win_prob": chalk_win,
+        **stats,
+    }
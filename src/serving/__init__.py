@@ -0,0 +1,3 @@
+"""Long-lived prediction service answering matchup and bracket queries."""
+
+__all__ = ["service"]
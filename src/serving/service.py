@@ -0,0 +1,354 @@
+"""
+Local HTTP/JSON prediction service.
+
+The service loads the snapshot (games up to the as-of date) and builds the
+requested models once at start-up -- from the artifact store when trained
+artifacts exist, otherwise by fitting Elo on the snapshot -- then answers
+queries from memory:
+
+``GET  /health``       service status, snapshot id and loaded models
+``POST /matchup``      ``{"model", "team_a", "team_b"}`` -> ``{"prob"}``
+``POST /matchups``     ``{"model", "pairs": [[a, b], ...]}`` -> ``{"probs"}``
+``POST /advancement``  ``{"model", "bracket": [...], "n_sims", "seed"}`` ->
+                       per-team round-by-round advancement odds
+``POST /live``         ``{"model", "bracket", "results": {game_id: winner}, "n_sims",
+                       "seed"}`` -> advancement odds conditioned on completed
+                       games (see :mod:`simulation.live`)
+``POST /whatif``       ``{"model", "bracket", "results": {game_id: winner}}`` -> exact
+                       advancement odds given hypothetical results (see
+                       :mod:`simulation.whatif`)
+``POST /score``        ``{"picks", "truth", "system"}`` -> ``{"score"}``
+``POST /batch``        ``{"requests": [{"op": "matchup", ...}, ...]}`` ->
+                       ``{"results": [...]}``
+
+Matchup probabilities and advancement odds are held in an LRU cache keyed
+by (model, snapshot, query), so repeated queries during the tournament are
+dictionary lookups.  Live brackets and what-if engines are stateful and
+large, so they are kept apart in their own small LRUs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_acquisition import etl as etl_mod
+from ..evaluation import bracket_scoring
+from ..simulation import artifacts, bayes, elo, live, monte_carlo, trainer, whatif
+from ..utils.logging import get_logger
+
+logger = get_logger("serving")
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _snapshot_id(season: int, asof: str, games: pd.DataFrame) -> str:
+    digest = hashlib.sha256(pd.util.hash_pandas_object(games, index=False).values.tobytes()).hexdigest()
+    return f"{season}@{asof}:{digest[:12]}"
+
+
+class PredictionService:
+    """
+    In-memory models for one snapshot plus cached query handlers.
+
+    Parameters
+    ----------
+    db_path : str
+        SQLite database with ingested games.
+    season : int
+        Season to serve.
+    asof : str
+        Snapshot date (YYYY-MM-DD); later games are never loaded.
+    models : list of str
+        Models to load.  With ``artifacts_root`` any trained model ('elo',
+        'logit', 'bayes', 'ensemble') can be served; without it only 'elo'
+        and 'bayes', which are fit from the games table.
+    model_cfg : dict
+        ``model_defaults`` section of base.yaml.
+    scoring_cfg : dict
+        Parsed scoring.yaml.
+    cache_size : int
+        Maximum number of cached query results.
+    artifacts_root : str, optional
+        Artifact store written by ``train``.
+    state_size : int
+        Maximum number of live brackets, and of what-if engines, kept in
+        memory (least recently used ones are dropped and rebuilt on demand).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        season: int,
+        asof: str,
+        models: List[str],
+        model_cfg: Dict[str, Any],
+        scoring_cfg: Dict[str, Any],
+        cache_size: int = 100_000,
+        artifacts_root: Optional[str] = None,
+        state_size: int = 32,
+    ) -> None:
+        games = etl_mod.load_games(db_path, [season], asof)
+        self.season = season
+        self.asof = asof
+        self.snapshot = _snapshot_id(season, asof, games)
+        self.scoring_cfg = scoring_cfg
+        self.team_ids = sorted(set(games["home_team_id"]) | set(games["away_team_id"]))
+        self.team_index = {t: i for i, t in enumerate(self.team_ids)}
+        self.cache = LRUCache(cache_size)
+        # Live brackets are stateful (they accumulate results) and what-if
+        # engines hold their memoized subtrees, so both live outside the
+        # result cache, in LRUs of their own.
+        self.state_size = state_size
+        self.live_brackets: "OrderedDict[Tuple[Hashable, ...], live.LiveBracket]" = OrderedDict()
+        self._live_lock = threading.Lock()
+        self.whatif_engines = LRUCache(state_size)
+        # Each model is reduced to a teams x teams win-probability matrix.
+        self.matrices: Dict[str, np.ndarray] = {}
+        if artifacts_root and any(artifacts.latest_version(Path(artifacts_root), m) for m in models):
+            teams, mats = trainer.predict_matrices(db_path, season, asof, models, model_cfg, Path(artifacts_root))
+            missing = [m for m in models if m not in mats]
+            if missing:
+                raise ValueError(f"Models {missing} cannot be served from {artifacts_root}")
+            self.matrices = mats
+            models = []
+        for name in models:
+            if name == "elo":
+                ratings = elo.train_elo(games, model_cfg.get("elo", {}))
+                self.matrices[name] = elo.elo_prob_matrix(ratings, self.team_ids)
+            elif name == "bayes":
+                cfg = model_cfg.get("bayes", {})
+                post = bayes.posterior_asof(bayes.bayes_posteriors(games, cfg), self.team_ids, asof, cfg)
+                self.matrices[name] = bayes.bayes_prob_matrix(post["mean"].to_numpy())
+            else:
+                raise ValueError(f"Model '{name}' cannot be served yet")
+        logger.info(f"Loaded {len(self.team_ids)} teams, models {list(self.matrices)} for snapshot {self.snapshot}")
+
+    def _matrix(self, model: str) -> np.ndarray:
+        try:
+            return self.matrices[model]
+        except KeyError:
+            raise ValueError(f"Unknown model '{model}'") from None
+
+    def _idx(self, team: str) -> int:
+        try:
+            return self.team_index[team]
+        except KeyError:
+            raise ValueError(f"Unknown team '{team}'") from None
+
+    def matchup(self, model: str, team_a: str, team_b: str) -> float:
+        """Probability that ``team_a`` beats ``team_b`` on a neutral court."""
+        key = ("matchup", model, self.snapshot, team_a, team_b)
+        return self.cache.get_or_compute(
+            key, lambda: float(self._matrix(model)[self._idx(team_a), self._idx(team_b)])
+        )
+
+    def matchups(self, model: str, pairs: List[List[str]]) -> List[float]:
+        """Vectorized probabilities for many pairs (bypasses the cache)."""
+        P = self._matrix(model)
+        a = np.fromiter((self._idx(p[0]) for p in pairs), dtype=np.intp, count=len(pairs))
+        b = np.fromiter((self._idx(p[1]) for p in pairs), dtype=np.intp, count=len(pairs))
+        return P[a, b].tolist()
+
+    def advancement(self, model: str, bracket: List[str], n_sims: int = 10_000, seed: int = 1337) -> Dict[str, List[float]]:
+        """Round-by-round advancement odds for every team in ``bracket``."""
+        key = ("advancement", model, self.snapshot, tuple(bracket), n_sims, seed)
+
+        def compute() -> Dict[str, List[float]]:
+            idx = np.array([self._idx(t) for t in bracket])
+            P = self._matrix(model)[np.ix_(idx, idx)]
+            sims = monte_carlo.simulate_bracket(bracket, P, n_sims, seed)
+            return {t: sims["advancement"][i].round(6).tolist() for i, t in enumerate(bracket)}
+
+        return self.cache.get_or_compute(key, compute)
+
+    def live_advancement(
+        self, model: str, bracket: List[str], results: Dict[str, str], n_sims: int = 10_000, seed: int = 1337
+    ) -> Dict[str, Any]:
+        """
+        Advancement odds conditioned on completed games.
+
+        The first call for a (model, bracket, n_sims, seed) draws the
+        simulations; later calls only apply the newly reported results.
+        ``results`` should hold every completed game, so a bracket dropped
+        from the ``state_size`` LRU is rebuilt with the same conditioning.
+        """
+        key = (model, self.snapshot, tuple(bracket), n_sims, seed)
+        with self._live_lock:
+            state = self.live_brackets.get(key)
+            if state is None:
+                idx = np.array([self._idx(t) for t in bracket])
+                state = live.LiveBracket(bracket, self._matrix(model)[np.ix_(idx, idx)], n_sims, seed)
+                self.live_brackets[key] = state
+                while len(self.live_brackets) > self.state_size:
+                    self.live_brackets.popitem(last=False)
+            self.live_brackets.move_to_end(key)
+            info = state.update(results)
+            adv = state.advancement()
+        return {
+            "advancement": {t: adv[i].round(6).tolist() for i, t in enumerate(bracket)},
+            **{k: (round(v, 1) if isinstance(v, float) else v) for k, v in info.items()},
+        }
+
+    def whatif(self, model: str, bracket: List[str], results: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Exact advancement odds given hypothetical results.
+
+        One :class:`whatif.WhatIf` engine is kept per (model, bracket) so its
+        memoized subtrees are shared by every scenario on that bracket.
+        """
+        engine_key = (model, self.snapshot, tuple(bracket))
+
+        def engine() -> whatif.WhatIf:
+            idx = np.array([self._idx(t) for t in bracket])
+            return whatif.WhatIf(bracket, self._matrix(model)[np.ix_(idx, idx)])
+
+        def compute() -> Dict[str, Any]:
+            res = self.whatif_engines.get_or_compute(engine_key, engine).query(results)
+            adv = res["advancement"]
+            return {
+                "probability": res["probability"],
+                "advancement": {t: adv[i].round(6).tolist() for i, t in enumerate(bracket)},
+            }
+
+        key = ("whatif", model, self.snapshot, tuple(bracket), tuple(sorted(results.items())))
+        return self.cache.get_or_compute(key, compute)
+
+    def score(self, picks: Dict[str, str], truth: Dict[str, str], system: str) -> int:
+        """Score a bracket with :func:`bracket_scoring.score_bracket`."""
+        return bracket_scoring.score_bracket(picks, truth, system, self.scoring_cfg)
+
+    def handle(self, op: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one JSON query."""
+        if op == "health":
+            return {
+                "status": "ok",
+                "snapshot": self.snapshot,
+                "models": list(self.matrices),
+                "n_teams": len(self.team_ids),
+                "cache": {"size": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            }
+        if op == "matchup":
+            return {"prob": self.matchup(payload.get("model", "elo"), payload["team_a"], payload["team_b"])}
+        if op == "matchups":
+            return {"probs": self.matchups(payload.get("model", "elo"), payload["pairs"])}
+        if op == "advancement":
+            odds = self.advancement(
+                payload.get("model", "elo"),
+                payload["bracket"],
+                int(payload.get("n_sims", 10_000)),
+                int(payload.get("seed", 1337)),
+            )
+            return {"advancement": odds}
+        if op == "live":
+            return self.live_advancement(
+                payload.get("model", "elo"),
+                payload["bracket"],
+                payload.get("results", {}),
+                int(payload.get("n_sims", 10_000)),
+                int(payload.get("seed", 1337)),
+            )
+        if op == "whatif":
+            return self.whatif(payload.get("model", "elo"), payload["bracket"], payload.get("results", {}))
+        if op == "score":
+            return {"score": self.score(payload["picks"], payload["truth"], payload.get("system", "espn"))}
+        if op == "batch":
+            return {"results": [self.handle(req["op"], req) for req in payload["requests"]]}
+        raise LookupError(op)
+
+
+def make_server(service: PredictionService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create (but do not start) an HTTP server bound to ``service``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, payload: Dict[str, Any]) -> None:
+            op = self.path.strip("/").split("?", 1)[0] or "health"
+            try:
+                self._send(200, service.handle(op, payload))
+            except LookupError as exc:
+                if isinstance(exc, KeyError):
+                    self._send(400, {"error": f"Missing field {exc}"})
+                else:
+                    self._send(404, {"error": f"Unknown endpoint /{op}"})
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc)})
+            except Exception:
+                logger.exception(f"Request to /{op} failed")
+                self._send(500, {"error": "Internal server error"})
+
+        def do_GET(self) -> None:  # noqa: N802
+            self._dispatch({})
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as exc:
+                self._send(400, {"error": f"Invalid JSON: {exc}"})
+                return
+            if not isinstance(payload, dict):
+                self._send(400, {"error": "Request body must be a JSON object"})
+                return
+            self._dispatch(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:  # silence per-request logging
+            return
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def serve(service: PredictionService, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Run the service until interrupted."""
+    server = make_server(service, host, port)
+    logger.info(f"Serving snapshot {service.snapshot} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
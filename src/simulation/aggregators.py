@@ -0,0 +1,190 @@
+"""Online aggregators for :func:`monte_carlo.simulate_stream`.
+
+Each aggregator folds one chunk of simulated brackets (an ``n x n_games``
+array of winning slots) into a fixed-size state through ``update`` and
+reports it through ``result``.  The state never grows with the number of
+simulations, so a run of 10^9 brackets needs no more memory than one of
+10^5:
+
+* :class:`RoundReach` -- per-team counts of winning a game in each round;
+* :class:`ChampionFinalFour` -- title counts and Final Four combinations;
+* :class:`Meetings` -- how often each pair of teams meets, per round;
+* :class:`ScoreHistogram` -- score distribution of fixed brackets under
+  each scoring system;
+* :class:`TopBrackets` -- a mergeable frequent-items sketch of the most
+  common full brackets.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+import numpy as np
+
+from ..evaluation import bracket_scoring
+from . import monte_carlo
+
+
+class Aggregator:
+    """Base class: counts the simulations seen in ``n``."""
+
+    def __init__(self, n_teams: int) -> None:
+        self.n_teams = n_teams
+        self.rounds = monte_carlo.game_rounds(n_teams)
+        self.n = 0
+
+    def update(self, winners: np.ndarray) -> None:
+        self.n += len(winners)
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class RoundReach(Aggregator):
+    """Per-team counts of winning a game in each round."""
+
+    def __init__(self, n_teams: int) -> None:
+        super().__init__(n_teams)
+        self.counts = np.zeros((n_teams, int(self.rounds[-1]) + 1), dtype=np.int64)
+
+    def update(self, winners: np.ndarray) -> None:
+        super().update(winners)
+        for r in range(self.counts.shape[1]):
+            self.counts[:, r] += np.bincount(winners[:, self.rounds == r].ravel(), minlength=self.n_teams)
+
+    def result(self) -> Dict[str, Any]:
+        return {"counts": self.counts, "advancement": self.counts / max(self.n, 1)}
+
+
+class ChampionFinalFour(Aggregator):
+    """Title counts per team and counts of each Final Four combination."""
+
+    def __init__(self, n_teams: int) -> None:
+        super().__init__(n_teams)
+        if int(self.rounds[-1]) < 2:
+            raise ValueError("A Final Four needs at least 8 teams")
+        self.champion = np.zeros(n_teams, dtype=np.int64)
+        self.final_four: Dict[int, int] = {}
+        # Final Four teams are the winners of the round before the semi-finals.
+        self.f4_cols = np.flatnonzero(self.rounds == self.rounds[-1] - 2)
+
+    def update(self, winners: np.ndarray) -> None:
+        super().update(winners)
+        self.champion += np.bincount(winners[:, -1], minlength=self.n_teams)
+        # Encode each combination as one integer (base n_teams digits).
+        base = self.n_teams ** np.arange(len(self.f4_cols), dtype=np.int64)
+        codes = winners[:, self.f4_cols].astype(np.int64) @ base
+        values, counts = np.unique(codes, return_counts=True)
+        for code, count in zip(values.tolist(), counts.tolist()):
+            self.final_four[code] = self.final_four.get(code, 0) + count
+
+    def result(self) -> Dict[str, Any]:
+        n = max(self.n, 1)
+        ranked = sorted(self.final_four.items(), key=lambda kv: -kv[1])
+        digits = len(self.f4_cols)
+        combos = [tuple(code // self.n_teams**i % self.n_teams for i in range(digits)) for code, _ in ranked]
+        return {"champion": self.champion / n, "final_four": [(c, count / n) for c, (_, count) in zip(combos, ranked)]}
+
+
+class Meetings(Aggregator):
+    """Counts of each pair of slots meeting, per round (symmetric)."""
+
+    def __init__(self, n_teams: int) -> None:
+        super().__init__(n_teams)
+        self.counts = np.zeros((int(self.rounds[-1]) + 1, n_teams, n_teams), dtype=np.int64)
+
+    def update(self, winners: np.ndarray) -> None:
+        super().update(winners)
+        a, b = monte_carlo.game_participants(winners, self.n_teams)
+        n = self.n_teams
+        for r in range(len(self.counts)):
+            cols = self.rounds == r
+            pair = a[:, cols].astype(np.intp) * n + b[:, cols]
+            self.counts[r] += np.bincount(pair.ravel(), minlength=n * n).reshape(n, n)
+
+    def result(self) -> Dict[str, Any]:
+        by_round = (self.counts + self.counts.transpose(0, 2, 1)) / max(self.n, 1)
+        return {"by_round": by_round, "meetings": by_round.sum(axis=0)}
+
+
+class ScoreHistogram(Aggregator):
+    """
+    Score distributions of fixed brackets under several scoring systems.
+
+    Parameters
+    ----------
+    n_teams : int
+        Bracket size.
+    picks : ndarray
+        (n_brackets, n_games) picked winner slot per game.
+    points : mapping
+        System name -> (n_games,) points for a correct pick of each game.
+    """
+
+    def __init__(self, n_teams: int, picks: np.ndarray, points: Mapping[str, np.ndarray]) -> None:
+        super().__init__(n_teams)
+        self.picks = np.atleast_2d(picks)
+        self.points = {s: np.asarray(p) for s, p in points.items()}
+        self.counts = {
+            s: np.zeros((len(self.picks), int(p.sum()) + 1), dtype=np.int64) for s, p in self.points.items()
+        }
+
+    def update(self, winners: np.ndarray) -> None:
+        super().update(winners)
+        for system, pts in self.points.items():
+            scores = bracket_scoring.score_matrix(self.picks, winners, pts)
+            hist = self.counts[system]
+            width = hist.shape[1]
+            for j in range(len(self.picks)):
+                hist[j] += np.bincount(scores[:, j], minlength=width)
+
+    def result(self) -> Dict[str, Any]:
+        out = {}
+        for system, hist in self.counts.items():
+            values = np.arange(hist.shape[1])
+            mean = hist @ values / max(self.n, 1)
+            out[system] = {"histogram": hist, "mean": mean}
+        return out
+
+
+class TopBrackets(Aggregator):
+    """
+    Most frequent full brackets, with a Misra-Gries sketch of ``capacity``.
+
+    Each chunk's exact bracket counts are merged into the sketch and every
+    count is reduced by the ``capacity + 1``-th largest, which keeps at
+    most ``capacity`` brackets.  Estimates never exceed the true count and
+    undercount it by at most ``error`` (the total reduction, which is at
+    most ``n / (capacity + 1)``); any bracket more frequent than that is
+    guaranteed to be kept.
+    """
+
+    def __init__(self, n_teams: int, k: int = 10, capacity: int = 1000) -> None:
+        super().__init__(n_teams)
+        self.k = k
+        self.capacity = max(capacity, k)
+        self.dtype = np.dtype(np.int8 if n_teams <= 128 else np.int16)
+        # Brackets are keyed by their raw bytes (one opaque void item per row).
+        self.keys = np.empty(0, dtype=np.dtype((np.void, (n_teams - 1) * self.dtype.itemsize)))
+        self.counts = np.empty(0, dtype=np.int64)
+        self.error = 0
+
+    def update(self, winners: np.ndarray) -> None:
+        super().update(winners)
+        rows = np.ascontiguousarray(winners, dtype=self.dtype).view(self.keys.dtype).ravel()
+        keys, counts = np.unique(rows, return_counts=True)
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=np.concatenate([self.counts, counts])).astype(np.int64)
+        if len(counts) > self.capacity:
+            cut = int(np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1])
+            self.error += cut
+            counts -= cut
+            keep = counts > 0
+            keys, counts = keys[keep], counts[keep]
+        self.keys, self.counts = keys, counts
+
+    def result(self) -> Dict[str, Any]:
+        order = np.argsort(-self.counts, kind="stable")[: self.k]
+        brackets = self.keys[order].view(self.dtype).reshape(len(order), self.n_teams - 1)
+        n = max(self.n, 1)
+        return {"brackets": brackets, "frequency": self.counts[order] / n, "error": self.error / n}
@@ -0,0 +1,163 @@
+"""Versioned, memory-mappable model artifact store.
+
+Trained models are saved as plain ``.npy`` arrays plus a JSON manifest in
+``<root>/<model>/<config_hash>-<data_hash>/``, where ``config_hash`` covers
+the model's hyperparameters and ``data_hash`` the training data.  Loading
+memory-maps the arrays, so ``predict`` and ``backtest`` open a model in
+milliseconds without retraining or unpickling sklearn objects.  Each model
+directory also holds a ``LATEST`` file naming the most recently written
+version.
+
+Array conventions:
+
+elo
+    ``team_ids`` (sorted unicode array) and ``ratings`` aligned with it.
+bayes
+    ``team_ids``, ``alpha`` and ``beta`` (final posteriors); predictions
+    recompute in-season posteriors, so the artifact mainly carries the
+    calibrator.
+logit
+    ``coef`` and ``intercept``; the manifest lists the feature names.
+ensemble
+    ``weights``; the manifest lists the member models and blend method.
+
+Any model may also carry calibrator breakpoints ``cal_x``/``cal_y``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def config_hash(cfg: Dict[str, Any]) -> str:
+    """Short stable hash of a JSON-serializable configuration."""
+    data = json.dumps(cfg, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Short content hash of a DataFrame (values only, index ignored)."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()[:12]
+
+
+def save_model(
+    root: Path,
+    model: str,
+    cfg: Dict[str, Any],
+    data_hash: str,
+    arrays: Dict[str, np.ndarray],
+    meta: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Write a model artifact and mark it as the latest version.
+
+    The version directory is written under a temporary name and renamed into
+    place, so readers never see a partial artifact.  Saving the same
+    (config, data) pair twice is a no-op apart from updating ``LATEST``.
+
+    Returns
+    -------
+    Path
+        The version directory.
+    """
+    model_dir = Path(root) / model
+    model_dir.mkdir(parents=True, exist_ok=True)
+    version = f"{config_hash(cfg)}-{data_hash}"
+    target = model_dir / version
+    if not target.exists():
+        tmp = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=model_dir))
+        try:
+            for name, arr in arrays.items():
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr), allow_pickle=False)
+            manifest = {
+                "model": model,
+                "version": version,
+                "config": cfg,
+                "config_hash": config_hash(cfg),
+                "data_hash": data_hash,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "arrays": {name: {"dtype": str(arr.dtype), "shape": list(arr.shape)} for name, arr in arrays.items()},
+                **(meta or {}),
+            }
+            with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, default=str)
+            os.replace(tmp, target)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # Losing the rename race to another writer of the same version is fine.
+            if not target.exists():
+                raise
+    latest_tmp = model_dir / f".LATEST.{os.getpid()}"
+    latest_tmp.write_text(version, encoding="utf-8")
+    os.replace(latest_tmp, model_dir / "LATEST")
+    return target
+
+
+def latest_version(root: Path, model: str) -> Optional[str]:
+    """Name of the latest saved version of ``model``, or None."""
+    pointer = Path(root) / model / "LATEST"
+    if not pointer.exists():
+        return None
+    return pointer.read_text(encoding="utf-8").strip() or None
+
+
+def load_model(root: Path, model: str, version: Optional[str] = None, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Open a model artifact.
+
+    Parameters
+    ----------
+    root : Path
+        Artifact root directory.
+    model : str
+        Model name.
+    version : str, optional
+        Version directory name; defaults to ``LATEST``.
+    mmap : bool
+        Memory-map arrays read-only instead of reading them into memory.
+
+    Returns
+    -------
+    dict
+        ``manifest``, ``arrays`` (name -> array) and ``path``.
+    """
+    version = version or latest_version(root, model)
+    if version is None:
+        raise FileNotFoundError(f"No artifact for model '{model}' under {root}")
+    path = Path(root) / model / version
+    with open(path / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    arrays = {
+        name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+        for name in manifest["arrays"]
+    }
+    return {"manifest": manifest, "arrays": arrays, "path": path}
+
+
+def calibrator_from_artifact(art: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the calibrator stored alongside a model, if any."""
+    arrays = art["arrays"]
+    if "cal_x" in arrays:
+        return {"method": "isotonic", "x": arrays["cal_x"], "y": arrays["cal_y"]}
+    return {"method": "none"}
+
+
+def gather_ratings(art: Dict[str, Any], teams: np.ndarray, default: float = 1500.0) -> np.ndarray:
+    """Look up Elo ratings for ``teams`` in an elo artifact (unknown teams get ``default``)."""
+    team_ids = art["arrays"]["team_ids"]
+    ratings = np.asarray(art["arrays"]["ratings"])
+    teams = np.asarray(teams, dtype=str)
+    if len(team_ids) == 0:
+        return np.full(len(teams), default)
+    pos = np.clip(np.searchsorted(team_ids, teams), 0, len(team_ids) - 1)
+    return np.where(team_ids[pos] == teams, ratings[pos], default)
@@ -1,15 +1,31 @@
-"""Simple Bayesian update model."""
+"""Simple Bayesian update model.
 
-from typing import Dict
+Each team's underlying win rate has a conjugate Beta prior
+``Beta(prior_mean * prior_strength, (1 - prior_mean) * prior_strength)``
+that is updated by its results within a season.  Because the update is a
+running count of wins and games, a whole season is processed at once with
+per-team cumulative sums rather than one Python call per game; matchup
+probabilities combine two posterior means with the log5 formula.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils import caching
+
+EPS = 1e-6
 
 
 def bayes_prior(team_id: str, features_row: dict, config: dict) -> float:
     """
     Return an initial prior win probability for a team based on features.
 
-    Placeholder implementation returns 0.5 for all teams.
+    Placeholder implementation returns ``config["prior_mean"]`` (0.5 by
+    default) for all teams.
     """
-    return 0.5
+    return float(config.get("prior_mean", 0.5))
 
 
 def bayes_update(prior: float, game_result: int, strength: float) -> float:
@@ -18,5 +34,179 @@ def bayes_update(prior: float, game_result: int, strength: float) -> float:
     The strength controls how much influence the new data has.
 
     posterior = (prior * strength + game_result) / (strength + 1)
+
+    This is one step of the Beta update applied in bulk by
+    :func:`run_bayes`.
     """
     return (prior * strength + game_result) / (strength + 1)
+
+
+def _prior(config: dict) -> Tuple[float, float]:
+    strength = float(config.get("prior_strength", 20))
+    mean = float(config.get("prior_mean", 0.5))
+    return mean * strength, (1.0 - mean) * strength
+
+
+def team_priors(team_ids: Any, alpha: Any, beta: Any, config: dict) -> pd.DataFrame:
+    """
+    Per-team priors carried over from stored posteriors.
+
+    Each team starts from its stored posterior mean, re-weighted to
+    ``prior_strength`` pseudo-games so last season's evidence is shrunk
+    rather than counted in full.
+
+    Returns
+    -------
+    DataFrame
+        Indexed by team_id with alpha and beta.
+    """
+    strength = float(config.get("prior_strength", 20))
+    alpha = np.asarray(alpha, dtype=np.float64)
+    mean = alpha / (alpha + np.asarray(beta, dtype=np.float64))
+    index = pd.Index(np.asarray(team_ids, dtype=str), name="team_id")
+    return pd.DataFrame({"alpha": mean * strength, "beta": (1.0 - mean) * strength}, index=index)
+
+
+def _start_counts(team_ids: np.ndarray, config: dict, priors: Optional[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    """Prior alpha/beta for each entry of ``team_ids`` (per-team priors, else the global one)."""
+    alpha0, beta0 = _prior(config)
+    if priors is None:
+        return np.full(len(team_ids), alpha0), np.full(len(team_ids), beta0)
+    ids = pd.Index(team_ids)
+    alpha = priors["alpha"].reindex(ids).fillna(alpha0).to_numpy()
+    beta = priors["beta"].reindex(ids).fillna(beta0).to_numpy()
+    return alpha, beta
+
+
+def run_bayes(games_df: pd.DataFrame, config: dict, priors: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Beta posteriors of every team before and after each of its games.
+
+    Parameters
+    ----------
+    games_df : DataFrame
+        Columns season, date, home_team_id, away_team_id, home_score,
+        away_score, in chronological order.
+    config : dict
+        ``prior_strength`` (pseudo-games of prior) and optional
+        ``prior_mean``.
+    priors : DataFrame, optional
+        Per-team starting alpha/beta (see :func:`team_priors`); teams not
+        listed use the global prior.
+
+    Returns
+    -------
+    DataFrame
+        One row per team per game (two per game, home rows first), with
+        game (row position in ``games_df``), season, date, team_id, win,
+        pre_alpha, pre_beta (posterior before the game) and alpha, beta
+        (after it).  Counts reset at the start of each season.
+    """
+    n = len(games_df)
+    home_win = (games_df["home_score"].to_numpy() > games_df["away_score"].to_numpy()).astype(np.float64)
+    long = pd.DataFrame(
+        {
+            "game": np.tile(np.arange(n), 2),
+            "season": np.tile(games_df["season"].to_numpy(), 2),
+            "date": np.tile(games_df["date"].to_numpy(), 2),
+            "team_id": np.concatenate([games_df["home_team_id"].to_numpy(), games_df["away_team_id"].to_numpy()]),
+            "win": np.concatenate([home_win, 1.0 - home_win]),
+        }
+    )
+    # Stable sort keeps each team's games in chronological order for the cumulative sums.
+    long = long.sort_values("game", kind="stable")
+    grouped = long.groupby(["season", "team_id"], sort=False)
+    wins = grouped["win"].cumsum().to_numpy()
+    played = grouped.cumcount().to_numpy() + 1.0
+    win = long["win"].to_numpy()
+    alpha0, beta0 = _start_counts(long["team_id"].to_numpy(), config, priors)
+    long["alpha"] = alpha0 + wins
+    long["beta"] = beta0 + (played - wins)
+    long["pre_alpha"] = long["alpha"] - win
+    long["pre_beta"] = long["beta"] - (1.0 - win)
+    return long.sort_index().reset_index(drop=True)
+
+
+@caching.disk_cache
+def bayes_posteriors(games_df: pd.DataFrame, config: dict, priors: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Posterior of every team at the end of every date on which it played.
+
+    ``priors`` are optional per-team starting counts (see :func:`run_bayes`).
+
+    Returns
+    -------
+    DataFrame
+        season, date, team_id, alpha, beta and mean, sorted by date; the
+        posterior valid as of any date is the team's last row on or before
+        it (see :func:`posterior_asof`).
+    """
+    long = run_bayes(games_df, config, priors).sort_values("game", kind="stable")
+    last = long.groupby(["season", "team_id", "date"], sort=False).tail(1)
+    out = last[["season", "date", "team_id", "alpha", "beta"]].copy()
+    out["mean"] = out["alpha"] / (out["alpha"] + out["beta"])
+    return out.sort_values(["season", "date", "team_id"]).reset_index(drop=True)
+
+
+def posterior_asof(
+    posteriors: pd.DataFrame, teams: Any, asof: str, config: dict, priors: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Alpha/beta for ``teams`` as of ``asof`` (teams without games keep their prior).
+
+    Returns
+    -------
+    DataFrame
+        Indexed by team_id (in ``teams`` order) with alpha, beta and mean.
+    """
+    known = posteriors[posteriors["date"] <= asof].groupby("team_id")[["alpha", "beta"]].last()
+    out = known.reindex(pd.Index(list(teams), name="team_id"))
+    alpha0, beta0 = _start_counts(out.index.to_numpy(), config, priors)
+    out["alpha"] = out["alpha"].fillna(pd.Series(alpha0, index=out.index))
+    out["beta"] = out["beta"].fillna(pd.Series(beta0, index=out.index))
+    out["mean"] = out["alpha"] / (out["alpha"] + out["beta"])
+    return out
+
+
+def log5(p_a: np.ndarray, p_b: np.ndarray) -> np.ndarray:
+    """Probability that a team with win rate ``p_a`` beats one with ``p_b``."""
+    p_a = np.clip(p_a, EPS, 1 - EPS)
+    p_b = np.clip(p_b, EPS, 1 - EPS)
+    return p_a * (1 - p_b) / (p_a * (1 - p_b) + p_b * (1 - p_a))
+
+
+def pregame_probs(games_df: pd.DataFrame, config: dict) -> np.ndarray:
+    """Home win probability of each game from the posteriors before it."""
+    long = run_bayes(games_df, config)
+    n = len(games_df)
+    mean = (long["pre_alpha"] / (long["pre_alpha"] + long["pre_beta"])).to_numpy()
+    return log5(mean[:n], mean[n:])
+
+
+def bayes_prob_matrix(means: np.ndarray) -> np.ndarray:
+    """Pairwise log5 matrix: P[i, j] = probability team i beats team j."""
+    means = np.asarray(means, dtype=np.float64)
+    P = log5(means[:, None], means[None, :])
+    np.fill_diagonal(P, 0.5)
+    return P
+
+
+def train_bayes(games_df: pd.DataFrame, config: dict) -> Dict[str, np.ndarray]:
+    """
+    Final posteriors of every team after ``games_df`` (latest season per team).
+
+    Stored in the bayes artifact; prediction turns them into per-team
+    priors for the next season with :func:`team_priors`.
+
+    Returns
+    -------
+    dict
+        ``team_ids`` (sorted), ``alpha`` and ``beta`` arrays.
+    """
+    post = bayes_posteriors(games_df, config)
+    final = post.groupby("team_id")[["alpha", "beta"]].last().sort_index()
+    return {
+        "team_ids": final.index.to_numpy(dtype=str),
+        "alpha": final["alpha"].to_numpy(),
+        "beta": final["beta"].to_numpy(),
+    }
@@ -1,19 +1,35 @@
-"""Probability calibration utilities."""
+"""Probability calibration utilities.
+
+Calibrators are stored as compact breakpoint arrays rather than live sklearn
+objects.  A fitted isotonic calibrator is a monotone piecewise-linear map
+given by ``x`` (input probabilities) and ``y`` (calibrated probabilities), so
+applying it is a single ``np.interp`` over an array of any shape and saving it
+is a plain ``.npz`` file.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Hashable
 
 import numpy as np
 from sklearn.isotonic import IsotonicRegression
-from typing import Dict, Any
 
 
 def fit_calibrator(probs: np.ndarray, outcomes: np.ndarray, method: str) -> Dict[str, Any]:
     """
     Fit a calibrator using the specified method.
     Supported methods: 'isotonic' (default), 'none'.
+
+    Returns a dict with ``method`` and, for isotonic calibration, the
+    breakpoint arrays ``x`` and ``y`` (float64, ``x`` strictly increasing).
     """
     if method == "isotonic":
-        iso = IsotonicRegression(out_of_bounds="clip")
-        iso.fit(probs, outcomes)
-        return {"method": "isotonic", "model": iso}
+        iso = IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0)
+        iso.fit(np.asarray(probs, dtype=np.float64).ravel(), np.asarray(outcomes, dtype=np.float64).ravel())
+        x = np.asarray(iso.X_thresholds_, dtype=np.float64)
+        y = np.asarray(iso.y_thresholds_, dtype=np.float64)
+        return {"method": "isotonic", "x": x, "y": y}
     else:
         # No calibration
         return {"method": "none"}
@@ -22,9 +38,68 @@ def fit_calibrator(probs: np.ndarray, outcomes: np.ndarray, method: str) -> Dict
 def apply_calibrator(probs: np.ndarray, cal: Dict[str, Any]) -> np.ndarray:
     """
     Apply a fitted calibrator to an array of probabilities.
+
+    ``probs`` may have any shape (e.g. a teams x teams matrix or a
+    sims x games block); the result has the same shape.  Inputs outside the
+    fitted range are clipped to the end breakpoints, matching sklearn's
+    ``out_of_bounds="clip"``.  float32 inputs stay float32.
     """
     if cal.get("method") == "isotonic":
-        iso: IsotonicRegression = cal["model"]
-        return iso.transform(probs)
+        probs = np.asarray(probs)
+        out = np.interp(probs, cal["x"], cal["y"])
+        if probs.dtype == np.float32:
+            out = out.astype(np.float32)
+        return out
     else:
         return probs
+
+
+def fit_calibrators_by_fold(
+    probs: np.ndarray, outcomes: np.ndarray, folds: np.ndarray, method: str
+) -> Dict[Hashable, Dict[str, Any]]:
+    """
+    Fit one calibrator per backtest fold in a single call.
+
+    Parameters
+    ----------
+    probs, outcomes : np.ndarray
+        Out-of-fold predicted probabilities and binary outcomes, 1-D.
+    folds : np.ndarray
+        Fold label (e.g. held-out season) for each row.
+    method : str
+        Calibration method passed to :func:`fit_calibrator`.
+
+    Returns
+    -------
+    dict
+        Mapping of fold label to fitted calibrator.  Each calibrator is fit on
+        the rows *outside* its fold, so it can be applied to that fold's
+        predictions without leakage.
+    """
+    probs = np.asarray(probs, dtype=np.float64).ravel()
+    outcomes = np.asarray(outcomes, dtype=np.float64).ravel()
+    folds = np.asarray(folds).ravel()
+    cals: Dict[Hashable, Dict[str, Any]] = {}
+    for fold in np.unique(folds):
+        train = folds != fold
+        key = fold.item() if hasattr(fold, "item") else fold
+        cals[key] = fit_calibrator(probs[train], outcomes[train], method)
+    return cals
+
+
+def save_calibrator(path: Path, cal: Dict[str, Any]) -> None:
+    """Save a calibrator to an ``.npz`` file."""
+    arrays = {"method": np.array(cal.get("method", "none"))}
+    if cal.get("method") == "isotonic":
+        arrays["x"] = np.asarray(cal["x"], dtype=np.float64)
+        arrays["y"] = np.asarray(cal["y"], dtype=np.float64)
+    np.savez(path, **arrays)
+
+
+def load_calibrator(path: Path) -> Dict[str, Any]:
+    """Load a calibrator previously written by :func:`save_calibrator`."""
+    with np.load(path, allow_pickle=False) as data:
+        method = str(data["method"])
+        if method == "isotonic":
+            return {"method": method, "x": data["x"].copy(), "y": data["y"].copy()}
+    return {"method": "none"}
@@ -1,10 +1,47 @@
 """Simple Elo rating model implementation."""
 
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional, Sequence, Tuple
 
+from ..utils import interning
 
-def train_elo(games_df: pd.DataFrame, config: dict) -> dict:
+
+def run_elo(
+    games_df: pd.DataFrame, config: dict, initial: Optional[Dict[str, float]] = None
+) -> Tuple[Dict[str, float], np.ndarray]:
+    """
+    Process games in order; return final ratings and the pre-game home win
+    probability of every game (see :func:`pregame_probs`).
+    """
+    k_base = config.get("k_base", 30)
+    home_adv = config.get("home_adv", 40)
+    # The sequential loop runs on interned int codes and plain float lists;
+    # team ids come back only when building the returned dict.
+    home, away, team_ids = interning.factorize_teams(games_df)
+    start = initial or {}
+    ratings = [float(start.get(t, 1500.0)) for t in team_ids]
+    home_won = (games_df["home_score"].to_numpy() > games_df["away_score"].to_numpy()).tolist()
+    if "neutral" in games_df:
+        adv = np.where(games_df["neutral"].fillna(0).to_numpy() != 0, 0.0, float(home_adv)).tolist()
+    else:
+        adv = [float(home_adv)] * len(games_df)
+    pregame = np.empty(len(games_df), dtype=np.float64)
+    # Process games chronologically
+    for i, (h, a) in enumerate(zip(home.tolist(), away.tolist())):
+        elo_home = ratings[h]
+        elo_away = ratings[a]
+        expected_home = 1 / (1 + 10 ** (-(elo_home - elo_away + adv[i]) / 400))
+        pregame[i] = expected_home
+        # Actual outcome: 1 if home wins, 0 otherwise
+        delta = k_base * ((1.0 if home_won[i] else 0.0) - expected_home)
+        ratings[h] = elo_home + delta
+        ratings[a] = elo_away - delta
+    ratings = {**start, **dict(zip(team_ids.tolist(), ratings))}
+    return ratings, pregame
+
+
+def train_elo(games_df: pd.DataFrame, config: dict, initial: Optional[Dict[str, float]] = None) -> dict:
     """
     Train Elo ratings based on historical games.
 
@@ -14,36 +51,26 @@ def train_elo(games_df: pd.DataFrame, config: dict) -> dict:
         Columns must include home_team_id, away_team_id, home_score, away_score, neutral.
     config : dict
         Configuration with keys k_base, home_adv, preseason_regress.
+    initial : dict, optional
+        Starting ratings (e.g. loaded from a saved artifact) to continue
+        from; teams not present start at 1500.
 
     Returns
     -------
     dict
         Mapping of team_id to final Elo rating.
     """
-    k_base = config.get("k_base", 30)
-    home_adv = config.get("home_adv", 40)
-    ratings: Dict[str, float] = {}
-    # Initialize teams with 1500
-    for team in pd.concat([games_df["home_team_id"], games_df["away_team_id"]]).unique():
-        ratings[team] = 1500.0
-    # Process games chronologically
-    for _, row in games_df.iterrows():
-        home = row["home_team_id"]
-        away = row["away_team_id"]
-        home_score = row["home_score"]
-        away_score = row["away_score"]
-        neutral = row.get("neutral", 0)
-        # Compute expected outcome
-        elo_home = ratings.get(home, 1500.0)
-        elo_away = ratings.get(away, 1500.0)
-        diff = elo_home - elo_away + (0 if neutral else home_adv)
-        expected_home = 1 / (1 + 10 ** (-diff / 400))
-        # Actual outcome: 1 if home wins, 0 otherwise
-        actual_home = 1.0 if home_score > away_score else 0.0
-        delta = k_base * (actual_home - expected_home)
-        ratings[home] = elo_home + delta
-        ratings[away] = elo_away - delta
-    return ratings
+    return run_elo(games_df, config, initial)[0]
+
+
+def pregame_probs(games_df: pd.DataFrame, config: dict) -> np.ndarray:
+    """
+    Home win probability of each game computed *before* its result is applied.
+
+    These are genuine out-of-sample predictions, suitable for fitting a
+    calibrator on the training seasons.
+    """
+    return run_elo(games_df, config)[1]
 
 
 def predict_elo_prob(model: dict, team_a: str, team_b: str, neutral: bool) -> float:
@@ -72,3 +99,20 @@ def predict_elo_prob(model: dict, team_a: str, team_b: str, neutral: bool) -> fl
     # Home advantage is not applied here because the caller should set neutral accordingly.
     prob_a = 1 / (1 + 10 ** (-diff / 400))
     return float(prob_a)
+
+
+def elo_prob_matrix(model: dict, teams: Sequence[str]) -> np.ndarray:
+    """
+    Neutral-court win probabilities for every ordered pair of ``teams``.
+
+    Entry ``[i, j]`` is the probability that ``teams[i]`` beats ``teams[j]``;
+    unknown teams get the default 1500 rating.
+    """
+    ratings = np.array([model.get(t, 1500.0) for t in teams], dtype=np.float64)
+    return prob_matrix_from_ratings(ratings)
+
+
+def prob_matrix_from_ratings(ratings: np.ndarray) -> np.ndarray:
+    """Pairwise neutral-court win probabilities from an array of ratings."""
+    ratings = np.asarray(ratings, dtype=np.float64)
+    return 1.0 / (1.0 + 10 ** (-(ratings[:, None] - ratings[None, :]) / 400.0))
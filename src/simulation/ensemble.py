@@ -1,6 +1,12 @@
 """Functions for blending probabilities from multiple models."""
 
-from typing import Dict, List
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+_EPS = 1e-6
 
 
 def blend_probs(probs: Dict[str, float], method: str = "weighted", weights: List[float] | None = None) -> float:
@@ -12,7 +18,8 @@ def blend_probs(probs: Dict[str, float], method: str = "weighted", weights: List
     probs : dict
         Mapping from model name to predicted probability.
     method : str
-        Method to combine probabilities.  Only 'weighted' is currently supported.
+        Method to combine probabilities: 'weighted' (linear pool) or 'logit'
+        (weighted average in log-odds space).
     weights : list, optional
         Weights corresponding to the models.  If None, equal weights are used.
 
@@ -22,13 +29,110 @@ def blend_probs(probs: Dict[str, float], method: str = "weighted", weights: List
         Blended probability.
     """
     names = list(probs.keys())
-    values = [probs[name] for name in names]
-    if method != "weighted":
-        raise ValueError(f"Unknown ensemble method {method}")
+    values = np.array([[probs[name]] for name in names], dtype=np.float64)
+    return float(blend_prob_matrix(values, weights, method)[0])
+
+
+def blend_prob_matrix(probs: np.ndarray, weights: Sequence[float] | None = None, method: str = "weighted") -> np.ndarray:
+    """
+    Blend stacked model probabilities.
+
+    Parameters
+    ----------
+    probs : np.ndarray
+        Array of shape (n_models, ...) where the leading axis indexes ensemble
+        members and the remaining axes are games (or a teams x teams matrix).
+    weights : sequence of float, optional
+        One weight per model; normalized to sum to one.  Equal weights if None.
+    method : str
+        'weighted' for a linear pool, 'logit' for a log-odds blend.
+
+    Returns
+    -------
+    np.ndarray
+        Blended probabilities with shape ``probs.shape[1:]``.
+    """
+    probs = np.asarray(probs)
+    n_models = probs.shape[0]
     if weights is None:
-        weights = [1.0 / len(values)] * len(values)
+        w = np.full(n_models, 1.0 / n_models)
+    else:
+        w = np.asarray(weights, dtype=np.float64)
+        if w.shape != (n_models,):
+            raise ValueError(f"Expected {n_models} weights, got {w.shape[0]}")
+        w = w / w.sum()
+    w = w.astype(probs.dtype if probs.dtype == np.float32 else np.float64)
+    if method == "weighted":
+        return np.tensordot(w, probs, axes=1)
+    if method == "logit":
+        p = np.clip(probs, _EPS, 1 - _EPS)
+        z = np.tensordot(w, np.log(p) - np.log1p(-p), axes=1)
+        return 1.0 / (1.0 + np.exp(-z))
+    raise ValueError(f"Unknown ensemble method {method}")
+
+
+def optimize_weights(
+    probs: np.ndarray | Sequence[np.ndarray],
+    outcomes: np.ndarray | Sequence[np.ndarray],
+    method: str = "weighted",
+) -> np.ndarray:
+    """
+    Find ensemble weights minimizing out-of-fold log-loss.
+
+    The weights are constrained to the probability simplex (non-negative,
+    summing to one).  For both the linear pool and the log-odds blend the
+    log-loss is convex in the weights, so a single SLSQP solve with analytic
+    gradients finds the global optimum.
+
+    Parameters
+    ----------
+    probs : np.ndarray or sequence of np.ndarray
+        Out-of-fold predictions of shape (n_models, n_games), or one such
+        matrix per backtest fold (concatenated along the games axis).
+    outcomes : np.ndarray or sequence of np.ndarray
+        Binary outcomes aligned with ``probs``.
+    method : str
+        'weighted' or 'logit', as in :func:`blend_prob_matrix`.
+
+    Returns
+    -------
+    np.ndarray
+        Optimal weights, one per model.
+    """
+    from scipy.optimize import minimize
+
+    if not isinstance(probs, np.ndarray):
+        probs = np.concatenate([np.asarray(p, dtype=np.float64) for p in probs], axis=1)
+        outcomes = np.concatenate([np.asarray(y, dtype=np.float64).ravel() for y in outcomes])
+    P = np.clip(np.asarray(probs, dtype=np.float64), _EPS, 1 - _EPS)
+    y = np.asarray(outcomes, dtype=np.float64).ravel()
+    n_models, n_games = P.shape
+    if method == "weighted":
+        def loss(w: np.ndarray) -> tuple[float, np.ndarray]:
+            q = np.clip(w @ P, _EPS, 1 - _EPS)
+            value = -np.mean(y * np.log(q) + (1 - y) * np.log1p(-q))
+            grad = -(P @ (y / q - (1 - y) / (1 - q))) / n_games
+            return value, grad
+    elif method == "logit":
+        L = np.log(P) - np.log1p(-P)
+
+        def loss(w: np.ndarray) -> tuple[float, np.ndarray]:
+            z = w @ L
+            # log(1 + exp(-z)) for y=1 and log(1 + exp(z)) for y=0
+            value = np.mean(np.logaddexp(0.0, -z) * y + np.logaddexp(0.0, z) * (1 - y))
+            q = 1.0 / (1.0 + np.exp(-z))
+            grad = (L @ (q - y)) / n_games
+            return value, grad
     else:
-        # Normalize weights
-        total = sum(weights)
-        weights = [w / total for w in weights]
-    return float(sum(w * p for w, p in zip(weights, values)))
+        raise ValueError(f"Unknown ensemble method {method}")
+
+    res = minimize(
+        loss,
+        np.full(n_models, 1.0 / n_models),
+        jac=True,
+        method="SLSQP",
+        bounds=[(0.0, 1.0)] * n_models,
+        constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones_like(w)}],
+    )
+    w = np.clip(res.x, 0.0, None)
+    return w / w.sum()
@@ -7,8 +7,16 @@ models.
 
 from __future__ import annotations
 
+from typing import Sequence
+
+import numpy as np
 import pandas as pd
 
+from ..utils import caching
+
+# Exponent for the basketball Pythagorean expectation used by ``luck``.
+PYTHAG_EXP = 11.5
+
 def head_to_head_features(features_df: pd.DataFrame, team_a: str, team_b: str) -> pd.Series:
     """Construct a feature vector for a match‑up between two teams.
 
@@ -56,3 +64,87 @@ def style_contrast(features_df: pd.DataFrame, team_a: str, team_b: str) -> float
     # TODO: implement real style contrast metric
     diff = features_df.loc[team_a] - features_df.loc[team_b]
     return diff.abs().sum()
+
+
+@caching.disk_cache
+def team_season_features(games_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate per-team features from game results.
+
+    Args:
+        games_df: Games with home_team_id, away_team_id, home_score and
+            away_score, already filtered to the as-of date.
+    Returns:
+        DataFrame indexed by team_id with columns games, adj_o (points
+        scored per game), adj_d (points allowed per game), tempo (average
+        points per side), win_pct, sos (mean opponent win_pct) and luck
+        (win_pct minus Pythagorean expectation).
+    """
+    home = games_df["home_team_id"].to_numpy()
+    away = games_df["away_team_id"].to_numpy()
+    hs = games_df["home_score"].to_numpy(dtype=np.float64)
+    as_ = games_df["away_score"].to_numpy(dtype=np.float64)
+    long = pd.DataFrame(
+        {
+            "team_id": np.concatenate([home, away]),
+            "opp_id": np.concatenate([away, home]),
+            "pf": np.concatenate([hs, as_]),
+            "pa": np.concatenate([as_, hs]),
+        }
+    )
+    long["win"] = (long["pf"] > long["pa"]).astype(np.float64)
+    agg = long.groupby("team_id").agg(games=("win", "size"), pf=("pf", "sum"), pa=("pa", "sum"), wins=("win", "sum"))
+    out = pd.DataFrame(index=agg.index)
+    out["games"] = agg["games"]
+    out["adj_o"] = agg["pf"] / agg["games"]
+    out["adj_d"] = agg["pa"] / agg["games"]
+    out["tempo"] = (agg["pf"] + agg["pa"]) / (2 * agg["games"])
+    out["win_pct"] = agg["wins"] / agg["games"]
+    long["opp_win_pct"] = long["opp_id"].map(out["win_pct"])
+    out["sos"] = long.groupby("team_id")["opp_win_pct"].mean()
+    pf_e, pa_e = agg["pf"] ** PYTHAG_EXP, agg["pa"] ** PYTHAG_EXP
+    out["luck"] = out["win_pct"] - pf_e / (pf_e + pa_e)
+    out.index.name = "team_id"
+    return out
+
+
+def rest_days(games_df: pd.DataFrame) -> pd.DataFrame:
+    """Days of rest before each game for both teams.
+
+    Args:
+        games_df: Games with season, home_team_id, away_team_id and the int
+            ``day`` ordinal from :func:`etl.load_games`, in chronological order.
+    Returns:
+        DataFrame aligned with ``games_df`` with home_rest and away_rest
+        (NaN for a team's first game of the season).
+    """
+    n = len(games_df)
+    day = games_df["day"].to_numpy(dtype=np.int32)
+    long = pd.DataFrame(
+        {
+            "season": np.tile(games_df["season"].to_numpy(), 2),
+            "team_id": np.concatenate([games_df["home_team_id"].to_numpy(), games_df["away_team_id"].to_numpy()]),
+            "day": np.concatenate([day, day]),
+            "order": np.concatenate([np.arange(n), np.arange(n)]),
+        }
+    )
+    # Stable sort by game order keeps each team's games chronological before the diff.
+    long = long.sort_values("order", kind="stable")
+    rest = long.groupby(["season", "team_id"], sort=False)["day"].diff().sort_index().to_numpy()
+    return pd.DataFrame({"home_rest": rest[:n], "away_rest": rest[n:]}, index=games_df.index)
+
+
+def team_matrix(team_feats: pd.DataFrame, teams: Sequence[str], feature_names: Sequence[str]) -> np.ndarray:
+    """Dense float32 (len(teams) x len(feature_names)) feature matrix.
+
+    Teams or features missing from ``team_feats`` contribute zeros.
+    """
+    values = team_feats.reindex(index=list(teams), columns=list(feature_names)).fillna(0.0)
+    return values.to_numpy(dtype=np.float32)
+
+
+def matchup_matrix(team_feats: pd.DataFrame, team_a: Sequence[str], team_b: Sequence[str], feature_names: Sequence[str]) -> np.ndarray:
+    """Dense float32 design matrix of feature differences (team A minus team B).
+
+    Teams missing from ``team_feats`` contribute zeros.
+    """
+    return team_matrix(team_feats, team_a, feature_names) - team_matrix(team_feats, team_b, feature_names)
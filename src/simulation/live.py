@@ -0,0 +1,217 @@
+"""Live tournament mode: condition stored simulations on completed games.
+
+Instead of re-running :func:`monte_carlo.simulate_bracket` after every
+final score, :class:`LiveBracket` keeps the simulated brackets with a
+weight per simulation:
+
+* a completed game zeroes the weight of every simulation in which the
+  other team won (exact conditioning by rejection);
+* a refreshed probability matrix multiplies each weight by the likelihood
+  ratio of that simulation's remaining games under the new and old
+  matrices (importance reweighting);
+* when the effective sample size ``(sum w)^2 / sum w^2`` drops below
+  ``min_ess``, zero-weight simulations are dropped and fresh ones are drawn
+  for the remaining games only, with completed games forced.
+
+Advancement odds are weighted counts over the stored winners, so a refresh
+costs a few array passes rather than a full rerun.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from . import monte_carlo
+
+
+class LiveBracket:
+    """
+    Weighted simulated brackets for one bracket and probability matrix.
+
+    Parameters
+    ----------
+    teams : list of str
+        Team ids in bracket slot order.
+    P : ndarray
+        Slot-aligned win-probability matrix.
+    n_sims : int
+        Target number of simulations (also the top-up target).
+    seed : int
+        Seed of the initial draw; top-ups use derived streams.
+    min_ess : float, optional
+        Effective sample size below which to top up (default ``n_sims / 4``).
+    winners : ndarray, optional
+        Previously stored simulations to start from instead of drawing.
+    """
+
+    def __init__(
+        self,
+        teams: List[str],
+        P: np.ndarray,
+        n_sims: int,
+        seed: int,
+        min_ess: Optional[float] = None,
+        winners: Optional[np.ndarray] = None,
+    ) -> None:
+        self.teams = list(teams)
+        self.n_teams = len(self.teams)
+        self.slot = {t: i for i, t in enumerate(self.teams)}
+        self.game_ids = monte_carlo.game_ids(self.n_teams)
+        self.column = {g: i for i, g in enumerate(self.game_ids)}
+        self.rounds = monte_carlo.game_rounds(self.n_teams)
+        self.P = np.asarray(P, dtype=np.float64)
+        self.n_sims = n_sims
+        self.seed = seed
+        self.min_ess = n_sims / 4 if min_ess is None else min_ess
+        if winners is None:
+            winners = monte_carlo.simulate_bracket(self.teams, self.P, n_sims, seed)["winners"]
+        self.winners = winners
+        self.weights = np.ones(len(winners))
+        self.results: Dict[int, int] = {}
+        self.top_ups = 0
+
+    # -- state ------------------------------------------------------------
+    def ess(self) -> float:
+        """Effective sample size of the current weights."""
+        total = self.weights.sum()
+        return float(total * total / np.square(self.weights).sum()) if total > 0 else 0.0
+
+    def _resolve(self, results: Mapping[str, str]) -> Dict[int, int]:
+        """Validate results and convert them to ``{column: slot}``."""
+        forced: Dict[int, int] = {}
+        for game, team in results.items():
+            if game not in self.column:
+                raise ValueError(f"Unknown game '{game}'")
+            if team not in self.slot:
+                raise ValueError(f"Unknown team '{team}'")
+            col, slot = self.column[game], self.slot[team]
+            lo, hi = monte_carlo.game_slots(self.n_teams, col)
+            if not lo <= slot < hi:
+                raise ValueError(f"Team '{team}' cannot play in game '{game}'")
+            if self.results.get(col, slot) != slot:
+                raise ValueError(f"Game '{game}' already recorded with a different winner")
+            forced[col] = slot
+        # A winner must also have won every recorded earlier game on its path.
+        known = {**self.results, **forced}
+        for col, slot in forced.items():
+            for r in range(int(self.rounds[col])):
+                feeder = int(np.searchsorted(self.rounds, r)) + slot // (2 << r)
+                if known.get(feeder, slot) != slot:
+                    raise ValueError(f"Team '{self.teams[slot]}' lost game '{self.game_ids[feeder]}'")
+        # Unrecorded feeder games on a winner's path are implied results.
+        return monte_carlo.complete_forced(self.n_teams, forced)
+
+    @staticmethod
+    def _log_likelihood(P: np.ndarray, a: np.ndarray, b: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """Log-probability of each simulation's outcomes ``w`` of games ``a`` vs ``b``."""
+        p = P[a, b]
+        return np.log(np.where(w == a, p, 1.0 - p).clip(1e-300)).sum(axis=1)
+
+    def _top_up(self) -> None:
+        keep = self.weights > 0
+        self.winners, self.weights = self.winners[keep], self.weights[keep]
+        # Fresh draws are exact conditional samples (weight 1 each); rescale the
+        # survivors so their total weight equals their effective sample size.
+        ess = self.ess()
+        if len(self.weights):
+            self.weights = self.weights * (ess / self.weights.sum())
+        n_new = max(self.n_sims - int(ess), 1)
+        self.top_ups += 1
+        fresh = monte_carlo.simulate_bracket(
+            self.teams, self.P, n_new, self.seed + 7919 * self.top_ups, forced=self.results
+        )["winners"].astype(self.winners.dtype)
+        self.winners = np.concatenate([self.winners, fresh])
+        self.weights = np.concatenate([self.weights, np.ones(n_new)])
+
+    # -- updates ----------------------------------------------------------
+    def update(self, results: Optional[Mapping[str, str]] = None, P: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Condition on newly completed games and/or a refreshed matrix.
+
+        Parameters
+        ----------
+        results : mapping, optional
+            Game id -> winning team id (games already recorded are ignored).
+        P : ndarray, optional
+            New slot-aligned probability matrix for the remaining games.
+
+        Returns
+        -------
+        dict
+            ``ess``, ``n_sims`` (stored), ``topped_up`` and ``completed``.
+        """
+        forced = self._resolve(results or {})
+        new = {c: s for c, s in forced.items() if c not in self.results}
+        if new:
+            cols = np.fromiter(new, dtype=np.intp)
+            slots = np.fromiter(new.values(), dtype=self.winners.dtype)
+            self.weights = self.weights * np.all(self.winners[:, cols] == slots, axis=1)
+            self.results.update(new)
+        if P is not None:
+            P = np.asarray(P, dtype=np.float64)
+            free = np.array([c for c in range(len(self.game_ids)) if c not in self.results], dtype=np.intp)
+            if len(free):
+                a, b = monte_carlo.game_participants(self.winners, self.n_teams)
+                a, b, w = a[:, free], b[:, free], self.winners[:, free]
+                log_ratio = self._log_likelihood(P, a, b, w) - self._log_likelihood(self.P, a, b, w)
+                alive = self.weights > 0
+                if alive.any():
+                    log_ratio -= log_ratio[alive].max()
+                self.weights = self.weights * np.exp(log_ratio)
+            self.P = P
+        topped_up = False
+        if self.ess() < self.min_ess:
+            self._top_up()
+            topped_up = True
+        return {"ess": self.ess(), "n_sims": len(self.weights), "topped_up": topped_up, "completed": len(self.results)}
+
+    # -- summaries --------------------------------------------------------
+    def expectation(self, values: np.ndarray) -> np.ndarray:
+        """Weighted mean over simulations of a per-simulation array (axis 0)."""
+        w = self.weights / self.weights.sum()
+        return np.tensordot(w, np.asarray(values), axes=(0, 0))
+
+    def advancement(self) -> np.ndarray:
+        """Weighted (n_teams x n_rounds) probability of winning a game in each round."""
+        w = self.weights / self.weights.sum()
+        out = np.empty((self.n_teams, int(self.rounds[-1]) + 1))
+        for r in range(out.shape[1]):
+            cols = self.winners[:, self.rounds == r]
+            out[:, r] = np.bincount(cols.ravel(), weights=np.repeat(w, cols.shape[1]), minlength=self.n_teams)
+        return out
+
+    def champion(self) -> Dict[str, float]:
+        adv = self.advancement()
+        return {t: float(adv[i, -1]) for i, t in enumerate(self.teams)}
+
+    # -- persistence ------------------------------------------------------
+    def save(self, path: Path) -> Path:
+        """Store simulations, weights and results in one ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp.npz")
+        np.savez(
+            tmp,
+            teams=np.array(self.teams, dtype=str),
+            P=self.P,
+            winners=self.winners,
+            weights=self.weights,
+            result_cols=np.fromiter(self.results, dtype=np.intp, count=len(self.results)),
+            result_slots=np.fromiter(self.results.values(), dtype=np.intp, count=len(self.results)),
+            meta=np.array([self.n_sims, self.seed, self.min_ess, self.top_ups], dtype=np.float64),
+        )
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "LiveBracket":
+        with np.load(path, allow_pickle=False) as data:
+            n_sims, seed, min_ess, top_ups = data["meta"].tolist()
+            live = cls(data["teams"].tolist(), data["P"], int(n_sims), int(seed), min_ess, winners=data["winners"])
+            live.weights = data["weights"]
+            live.results = dict(zip(data["result_cols"].tolist(), data["result_slots"].tolist()))
+            live.top_ups = int(top_ups)
+        return live
@@ -1,23 +1,57 @@
-"""Logistic regression model for predicting win probabilities."""
+"""Logistic regression model for predicting win probabilities.
 
+The model is linear in feature differences, so a matchup's log-odds are
+``s[a] - s[b] + intercept`` with per-team scores ``s = F @ coef``.  Batch
+inference therefore needs one matrix-vector product over the team feature
+matrix ``F`` and a gather, with no sklearn call.
+"""
+
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 
 
-def train_logit(train_df: pd.DataFrame, config: dict) -> Dict[str, Any]:
+def train_logit(
+    train_df: Union[pd.DataFrame, np.ndarray],
+    config: dict,
+    y: Optional[np.ndarray] = None,
+    warm_start: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, Any]:
     """
-    Train a logistic regression model on the provided DataFrame.
+    Train a logistic regression model.
 
-    The DataFrame must contain a column ``outcome`` (1 if team A won, 0 if lost)
-    and feature columns specified by config["features"].
+    Parameters
+    ----------
+    train_df : DataFrame or ndarray
+        Either a DataFrame with an ``outcome`` column (1 if team A won, 0 if
+        lost) and the feature columns listed in ``config["features"]``, or a
+        dense design matrix (float32 is kept as is) whose columns are those
+        features.
+    config : dict
+        ``features``, ``C`` and ``regularization`` ("l2" or "l1").
+    y : ndarray, optional
+        Outcomes when ``train_df`` is a design matrix.
+    warm_start : dict, optional
+        ``coef``/``intercept`` from a previous fit (e.g. a stored artifact)
+        to start the solver from.
     """
     features = config.get("features", [])
-    X = train_df[features]
-    y = train_df["outcome"]
+    if isinstance(train_df, pd.DataFrame):
+        X = train_df[features].to_numpy(dtype=np.float32)
+        y = train_df["outcome"].to_numpy()
+    else:
+        X = train_df
     C = config.get("C", 1.0)
     penalty = config.get("regularization", "l2")
-    model = LogisticRegression(C=C, penalty=penalty, solver="liblinear")
+    # lbfgs (l2) and saga (l1) both honour warm starts and keep float32 inputs.
+    if penalty == "l1":
+        model = LogisticRegression(C=C, penalty="l1", solver="saga", max_iter=5000, warm_start=warm_start is not None)
+    else:
+        model = LogisticRegression(C=C, solver="lbfgs", max_iter=1000, warm_start=warm_start is not None)
+    if warm_start is not None and len(warm_start["coef"]) == X.shape[1]:
+        model.coef_ = np.asarray(warm_start["coef"], dtype=np.float64).reshape(1, -1).copy()
+        model.intercept_ = np.asarray(warm_start["intercept"], dtype=np.float64).reshape(1).copy()
     model.fit(X, y)
     return {"model": model, "features": features}
 
@@ -31,3 +65,57 @@ def predict_logit_prob(model: dict, feats: pd.Series) -> float:
     X = feats[features].values.reshape(1, -1)
     prob = m.predict_proba(X)[0, 1]
     return float(prob)
+
+
+def logit_coefficients(model: dict) -> Dict[str, Any]:
+    """Extract plain coefficient arrays from a trained model for storage."""
+    m = model["model"]
+    return {
+        "coef": np.asarray(m.coef_[0], dtype=np.float64),
+        "intercept": np.asarray(m.intercept_, dtype=np.float64),
+    }
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def predict_logit_from_coef(coef: np.ndarray, intercept: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """
+    Predict probabilities for a design matrix directly from coefficients.
+
+    Equivalent to ``LogisticRegression.predict_proba(X)[:, 1]`` without any
+    sklearn call, so it works on memory-mapped artifact arrays.
+    """
+    z = np.asarray(X) @ np.asarray(coef, dtype=X.dtype) + np.asarray(intercept, dtype=X.dtype)[0]
+    return _sigmoid(z)
+
+
+def team_scores(coef: np.ndarray, F: np.ndarray) -> np.ndarray:
+    """Per-team linear scores ``F @ coef`` for a team feature matrix."""
+    return np.asarray(F) @ np.asarray(coef, dtype=np.asarray(F).dtype)
+
+
+def predict_logit_pairs(
+    coef: np.ndarray, intercept: np.ndarray, F: np.ndarray, team_a: np.ndarray, team_b: np.ndarray
+) -> np.ndarray:
+    """
+    Win probabilities for arbitrary matchups given as row indices into ``F``.
+
+    Parameters
+    ----------
+    coef, intercept : ndarray
+        Stored coefficients (see :func:`logit_coefficients`).
+    F : ndarray
+        Team feature matrix (teams x features, see ``features.team_matrix``).
+    team_a, team_b : ndarray
+        Integer index arrays of any (matching) shape.
+    """
+    s = team_scores(coef, F)
+    return _sigmoid(s[team_a] - s[team_b] + np.asarray(intercept, dtype=s.dtype)[0])
+
+
+def logit_prob_matrix(coef: np.ndarray, intercept: np.ndarray, F: np.ndarray) -> np.ndarray:
+    """Full pairwise matrix P[i, j] = probability team i beats team j."""
+    s = team_scores(coef, F)
+    return _sigmoid(s[:, None] - s[None, :] + np.asarray(intercept, dtype=s.dtype)[0])
@@ -0,0 +1,289 @@
+"""Train models into the artifact store and predict from stored artifacts."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_acquisition import etl as etl_mod
+from ..utils import dates as udates
+from ..utils.logging import get_logger
+from . import artifacts, bayes, calibration, elo, ensemble, features as feat_mod, logit
+
+logger = get_logger("trainer")
+
+
+def _training_games(db_path: str, seasons: List[int]) -> pd.DataFrame:
+    """Regular-season games (up to each Selection Sunday) for the training seasons."""
+    frames = [
+        etl_mod.load_games(db_path, [season], udates.ymd(udates.selection_sunday(season))) for season in seasons
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else etl_mod.load_games(db_path, [])
+
+
+def _season_design(season_games: pd.DataFrame, feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Home-minus-away feature rows and home wins for one season's games, in their order."""
+    feats = feat_mod.team_season_features(season_games)
+    used = [f for f in feature_names if f in feats.columns]
+    F = feat_mod.team_matrix(feats, feats.index, used)
+    index = {t: i for i, t in enumerate(feats.index)}
+    home = season_games["home_team_id"].map(index).to_numpy()
+    away = season_games["away_team_id"].map(index).to_numpy()
+    home_won = (season_games["home_score"] > season_games["away_score"]).to_numpy(dtype=np.int8)
+    return F[home] - F[away], home_won, used
+
+
+def _pregame_design(season_games: pd.DataFrame, feature_names: List[str]) -> np.ndarray:
+    """
+    Home-minus-away feature rows for one season's games, each from the team
+    features as of the day before that game (zeros before a team's first game).
+    """
+    day = season_games["day"].to_numpy()
+    home = season_games["home_team_id"].to_numpy()
+    away = season_games["away_team_id"].to_numpy()
+    D = np.zeros((len(season_games), len(feature_names)), dtype=np.float32)
+    for d in np.unique(day):
+        before = day < d
+        if not before.any():
+            continue
+        # Undecorated: these intermediate frames are not worth a disk-cache entry each.
+        feats = feat_mod.team_season_features.__wrapped__(season_games[before])
+        today = day == d
+        D[today] = feat_mod.matchup_matrix(feats, home[today], away[today], feature_names)
+    return D
+
+
+def _logit_design(games: pd.DataFrame, feature_names: List[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Float32 design matrix for all training games, built in one pass.
+
+    Every game appears in both orientations so the fit is symmetric.  Team
+    features are computed per season from that season's games.
+    """
+    blocks, outcomes = [], []
+    used: List[str] = []
+    for _, season_games in games.groupby("season"):
+        D, home_won, used = _season_design(season_games, feature_names)
+        blocks += [D, -D]
+        outcomes += [home_won, 1 - home_won]
+    if not blocks:
+        return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.int8), used
+    return np.concatenate(blocks), np.concatenate(outcomes), used
+
+
+def _member_oof_probs(games: pd.DataFrame, member: str, cfg: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    Out-of-fold home win probabilities of one ensemble member on ``games``.
+
+    Elo and bayes are online, so their pre-game probabilities are already
+    out of sample.  Logit is refit leaving each season out (None with fewer
+    than two seasons) and predicts each held-out game from the features as
+    of the day before it, as :func:`predict_matrices` does, since
+    end-of-season features would include the game's own result.  Other
+    members have no out-of-fold predictions.
+    """
+    if member == "elo":
+        return elo.pregame_probs(games, cfg)
+    if member == "bayes":
+        return bayes.pregame_probs(games, cfg)
+    if member == "logit":
+        seasons = games["season"].to_numpy()
+        if len(np.unique(seasons)) < 2:
+            return None
+        out = np.empty(len(games))
+        for season in np.unique(seasons):
+            held = seasons == season
+            X, y, used = _logit_design(games[~held], list(cfg.get("features", [])))
+            model = logit.train_logit(X, {**cfg, "features": used}, y=y)
+            coef = logit.logit_coefficients(model)
+            D = _pregame_design(games[held], used)
+            out[held] = logit.predict_logit_from_coef(coef["coef"], coef["intercept"], D)
+        return out
+    return None
+
+
+def _ensemble_weights(games: pd.DataFrame, model_cfg: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Ensemble weights fitted with :func:`ensemble.optimize_weights` on the
+    members' out-of-fold predictions for the training games.
+
+    Members without out-of-fold predictions get weight 0; with fewer than
+    two usable members the configured weights are kept.
+    """
+    cfg = model_cfg.get("ensemble", {})
+    members = list(cfg.get("members", []))
+    configured = np.asarray(cfg.get("weights", []), dtype=np.float64)
+    preds = {m: _member_oof_probs(games, m, model_cfg.get(m, {})) for m in members} if len(games) else {}
+    usable = [m for m in members if preds.get(m) is not None]
+    if len(usable) < 2:
+        return configured, {"weights_source": "config"}
+    y = (games["home_score"] > games["away_score"]).to_numpy(dtype=float)
+    fitted = ensemble.optimize_weights(np.vstack([preds[m] for m in usable]), y, cfg.get("method", "weighted"))
+    weights = np.array([fitted[usable.index(m)] if m in usable else 0.0 for m in members])
+    return weights, {"weights_source": "optimized", "oof_members": usable}
+
+
+def _calibrate_pairwise(P: np.ndarray, cal: Dict[str, Any]) -> np.ndarray:
+    """Calibrate a pairwise matrix while keeping P[i, j] + P[j, i] == 1."""
+    if cal.get("method") == "none":
+        return P
+    C = calibration.apply_calibrator(P, cal)
+    return 0.5 * (C + 1.0 - C.T)
+
+
+def train_models(
+    db_path: str,
+    seasons: List[int],
+    models: List[str],
+    model_cfg: Dict[str, Any],
+    calibration_method: str,
+    artifacts_root: Path,
+) -> Dict[str, Path]:
+    """
+    Train ``models`` on the given seasons and write them to the artifact store.
+
+    Ensemble weights are fitted to the members' out-of-fold predictions on
+    the training games (see :func:`_ensemble_weights`); the configured
+    weights are only a fallback.
+
+    Returns a mapping of model name to the artifact version directory.
+    """
+    games = _training_games(db_path, seasons)
+    data_hash = artifacts.frame_hash(games)
+    written: Dict[str, Path] = {}
+    for name in models:
+        cfg = dict(model_cfg.get(name, {}))
+        if name == "elo":
+            ratings, pregame = elo.run_elo(games, cfg)
+            team_ids = np.array(sorted(ratings), dtype=str)
+            arrays = {"team_ids": team_ids, "ratings": np.array([ratings[t] for t in team_ids])}
+            home_won = (games["home_score"] > games["away_score"]).to_numpy(dtype=float)
+            cal = calibration.fit_calibrator(pregame, home_won, calibration_method) if len(games) else {"method": "none"}
+            if cal["method"] == "isotonic":
+                arrays.update(cal_x=cal["x"], cal_y=cal["y"])
+            written[name] = artifacts.save_model(
+                artifacts_root, name, {**cfg, "calibration": calibration_method}, data_hash, arrays, {"seasons": seasons}
+            )
+        elif name == "bayes":
+            arrays = bayes.train_bayes(games, cfg)
+            home_won = (games["home_score"] > games["away_score"]).to_numpy(dtype=float)
+            pregame = bayes.pregame_probs(games, cfg)
+            cal = calibration.fit_calibrator(pregame, home_won, calibration_method) if len(games) else {"method": "none"}
+            if cal["method"] == "isotonic":
+                arrays.update(cal_x=cal["x"], cal_y=cal["y"])
+            written[name] = artifacts.save_model(
+                artifacts_root, name, {**cfg, "calibration": calibration_method}, data_hash, arrays, {"seasons": seasons}
+            )
+        elif name == "logit":
+            X, y, used = _logit_design(games, list(cfg.get("features", [])))
+            warm = None
+            if artifacts.latest_version(artifacts_root, "logit"):
+                prev = artifacts.load_model(artifacts_root, "logit")
+                if prev["manifest"].get("features") == used:
+                    warm = {k: np.asarray(prev["arrays"][k]) for k in ("coef", "intercept")}
+            model = logit.train_logit(X, {**cfg, "features": used}, y=y, warm_start=warm)
+            arrays = logit.logit_coefficients(model)
+            written[name] = artifacts.save_model(
+                artifacts_root, name, cfg, data_hash, arrays, {"features": used, "seasons": seasons}
+            )
+        elif name == "ensemble":
+            weights, info = _ensemble_weights(games, model_cfg)
+            written[name] = artifacts.save_model(
+                artifacts_root,
+                name,
+                cfg,
+                data_hash,
+                {"weights": weights},
+                {"members": cfg.get("members", []), "method": cfg.get("method", "weighted"), **info},
+            )
+        else:
+            logger.warning(f"Model '{name}' has no trainable artifact yet; skipping")
+            continue
+        logger.info(f"Saved {name} artifact {written[name]}")
+    return written
+
+
+def predict_matrices(
+    db_path: str,
+    season: int,
+    asof: str,
+    models: List[str],
+    model_cfg: Dict[str, Any],
+    artifacts_root: Optional[Path],
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Pairwise win-probability matrices for every team in ``season`` as of ``asof``.
+
+    Elo continues from the stored ratings through the season's games up to
+    ``asof`` (or starts fresh if no artifact exists, including when
+    ``artifacts_root`` is None); bayes uses the in-season posteriors as of
+    ``asof``, starting from priors carried over from the stored posteriors
+    (unless ``season`` was itself a training season); logit applies stored
+    coefficients to as-of team features (and is omitted without an
+    artifact); the ensemble blends whichever of its members were computed,
+    with its stored weights or, without an artifact, the configured ones.
+    Stored calibrators are applied per model.
+    """
+    games = etl_mod.load_games(db_path, [season], asof)
+    teams = sorted(set(games["home_team_id"]) | set(games["away_team_id"]))
+    mats: Dict[str, np.ndarray] = {}
+    wanted = list(models)
+
+    def stored(model: str) -> bool:
+        return artifacts_root is not None and bool(artifacts.latest_version(artifacts_root, model))
+
+    if "ensemble" in wanted:
+        if stored("ensemble"):
+            art = artifacts.load_model(artifacts_root, "ensemble")
+            spec = {**art["manifest"], "weights": np.asarray(art["arrays"]["weights"])}
+        else:
+            cfg = model_cfg.get("ensemble", {})
+            spec = {
+                "members": list(cfg.get("members", [])),
+                "weights": np.asarray(cfg.get("weights", []), dtype=np.float64),
+                "method": cfg.get("method", "weighted"),
+            }
+        # Members are computed first; ones without an artifact are left out of the blend.
+        extra = [m for m in spec["members"] if m not in wanted and (m in ("elo", "bayes") or stored(m))]
+        wanted = extra + wanted
+    for name in wanted:
+        if name == "elo":
+            initial: Dict[str, float] = {}
+            cal: Dict[str, Any] = {"method": "none"}
+            if artifacts_root is not None and artifacts.latest_version(artifacts_root, "elo"):
+                art = artifacts.load_model(artifacts_root, "elo")
+                initial = dict(zip(art["arrays"]["team_ids"].tolist(), art["arrays"]["ratings"].tolist()))
+                cal = artifacts.calibrator_from_artifact(art)
+            ratings = elo.train_elo(games, model_cfg.get("elo", {}), initial)
+            P = elo.prob_matrix_from_ratings(np.array([ratings.get(t, 1500.0) for t in teams]))
+            mats[name] = _calibrate_pairwise(P, cal)
+        elif name == "bayes":
+            cfg = model_cfg.get("bayes", {})
+            cal, priors = {"method": "none"}, None
+            if stored("bayes"):
+                art = artifacts.load_model(artifacts_root, "bayes")
+                cal = artifacts.calibrator_from_artifact(art)
+                # The stored end-of-training posteriors seed this season's priors.
+                prev = art["arrays"]
+                if season not in art["manifest"].get("seasons", []):
+                    priors = bayes.team_priors(prev["team_ids"], prev["alpha"], prev["beta"], cfg)
+            post = bayes.posterior_asof(bayes.bayes_posteriors(games, cfg, priors), teams, asof, cfg, priors)
+            mats[name] = _calibrate_pairwise(bayes.bayes_prob_matrix(post["mean"].to_numpy()), cal)
+        elif name == "logit":
+            if not stored("logit"):
+                continue  # no coefficients to apply
+            art = artifacts.load_model(artifacts_root, "logit")
+            F = feat_mod.team_matrix(feat_mod.team_season_features(games), teams, art["manifest"]["features"])
+            P = logit.logit_prob_matrix(art["arrays"]["coef"], art["arrays"]["intercept"], F)
+            mats[name] = _calibrate_pairwise(P, artifacts.calibrator_from_artifact(art))
+        elif name == "ensemble":
+            members, weights = spec["members"], spec["weights"]
+            keep = [i for i, m in enumerate(members) if m in mats and weights[i] > 0]
+            if not keep:
+                raise ValueError("None of the ensemble members could be predicted")
+            stacked = np.stack([mats[members[i]] for i in keep])
+            mats[name] = ensemble.blend_prob_matrix(stacked, weights[keep], spec.get("method", "weighted"))
+    return teams, {m: mats[m] for m in models if m in mats}
@@ -8,4 +8,6 @@ __all__ = [
     "logging",
     "caching",
     "naming",
+    "profiling",
+    "interning",
 ]
@@ -1,40 +1,418 @@
-"""Simple disk caching decorator."""
+"""Tiered memory + disk caching.
+
+:class:`TieredCache` keeps recent results in an in-process LRU tier and all
+results (up to a byte cap) in a disk tier shared between processes.  Values
+are stored by type: NumPy arrays as ``.npy``, DataFrames as Arrow IPC
+(``.arrow``), JSON-able values as ``.json`` and anything else pickled.
+
+Disk writes go to a temporary file that is renamed into place, so parallel
+workers never read a partial entry.  Hits refresh an entry's mtime and disk
+eviction removes the oldest mtimes first under an advisory lock; an entry
+deleted by another process between lookup and read is simply a miss.
+
+The cache directory and tier sizes come from :func:`configure` (the CLI
+passes the ``cache`` section of base.yaml), falling back to the
+``MM_CACHE_DIR`` environment variable and ``data/cache``.
+
+Pipeline stages that recompute the same pure result from the same games --
+:func:`features.team_season_features` and :func:`bayes.bayes_posteriors`,
+called by training, prediction, serving, writeups and every backtest
+worker -- are decorated with :func:`disk_cache`.
+"""
 
 from __future__ import annotations
-from typing import Callable, Any, Dict
+
 import functools
 import hashlib
 import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:  # POSIX advisory locks; eviction is best-effort elsewhere.
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_DIR = "data/cache"
+DEFAULT_MEMORY_BYTES = 256 * 2**20
+DEFAULT_DISK_BYTES = 2 * 2**30
+
+_SETTINGS: Dict[str, Any] = {"directory": None, "memory_bytes": DEFAULT_MEMORY_BYTES, "disk_bytes": DEFAULT_DISK_BYTES}
+_CACHES: Dict[str, "TieredCache"] = {}
+_MISSING = object()
 
 
-def disk_cache(func: Callable[..., Any]) -> Callable[..., Any]:
+def configure(directory: Optional[str] = None, memory_bytes: Optional[int] = None, disk_bytes: Optional[int] = None) -> None:
     """
-    Decorator that caches function return values on disk.  The cache key is
-    computed from the function name and arguments.  Results are stored
-    under a `.cache` directory next to the module file.
+    Set the cache location and tier sizes for caches created from now on.
+
+    ``directory`` is also exported as ``MM_CACHE_DIR`` so worker processes
+    started afterwards share the same disk tier.
     """
+    if directory is not None:
+        _SETTINGS["directory"] = str(directory)
+        os.environ["MM_CACHE_DIR"] = str(directory)
+    if memory_bytes is not None:
+        _SETTINGS["memory_bytes"] = int(memory_bytes)
+    if disk_bytes is not None:
+        _SETTINGS["disk_bytes"] = int(disk_bytes)
+    _CACHES.clear()
+
+
+def cache_dir() -> Path:
+    """Root directory of the disk tier."""
+    return Path(_SETTINGS["directory"] or os.environ.get("MM_CACHE_DIR") or DEFAULT_DIR)
+
+
+def _fingerprint(obj: Any, h: "hashlib._Hash") -> None:
+    """Feed a stable, content-based representation of ``obj`` into ``h``."""
+    mod = type(obj).__module__
+    if mod == "numpy" and hasattr(obj, "dtype") and hasattr(obj, "shape"):
+        import numpy as np
+
+        arr = np.ascontiguousarray(obj)
+        h.update(f"nd:{arr.dtype.str}:{arr.shape}:".encode())
+        h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+    elif mod.startswith("pandas") and hasattr(obj, "columns"):
+        import pandas as pd
+
+        h.update(f"df:{list(map(str, obj.columns))}:{list(map(str, obj.dtypes))}:".encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif mod.startswith("pandas") and hasattr(obj, "dtype"):
+        import pandas as pd
+
+        # Series and Index; their repr is truncated, so hash every value.
+        h.update(f"{type(obj).__name__}:{obj.name!r}:{obj.dtype}:{len(obj)}:".encode())
+        h.update(pd.util.hash_pandas_object(obj, index=isinstance(obj, pd.Series)).values.tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            _fingerprint(k, h)
+            _fingerprint(obj[k], h)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[" if isinstance(obj, list) else b"(")
+        for item in obj:
+            _fingerprint(item, h)
+        h.update(b"]")
+    elif obj is None or isinstance(obj, (str, bytes, bool, int, float, complex, Path)):
+        h.update(f"{type(obj).__qualname__}:{obj!r};".encode())
+    else:
+        # A repr can be truncated or omit state, which would alias different inputs.
+        raise TypeError(f"Cannot build a cache key from {type(obj).__qualname__}")
+
+
+def make_key(*parts: Any) -> str:
+    """Hex digest identifying ``parts`` by content."""
+    h = hashlib.sha256()
+    for part in parts:
+        _fingerprint(part, h)
+    return h.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    """Approximate in-memory size of a cached value."""
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):
+        return int(value.nbytes)
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def _serialize(value: Any, stem: Path) -> Path:
+    """Write ``value`` next to ``stem`` with a type-appropriate format."""
+    mod = type(value).__module__
+    if mod == "numpy" and hasattr(value, "dtype") and value.dtype != object:
+        import numpy as np
+
+        path = stem.with_suffix(".npy")
+        with open(path, "wb") as f:
+            np.save(f, value, allow_pickle=False)
+        return path
+    if mod.startswith("pandas") and hasattr(value, "columns"):
+        import pyarrow as pa
+
+        path = stem.with_suffix(".arrow")
+        table = pa.Table.from_pandas(value, preserve_index=True)
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return path
+    try:
+        data = json.dumps(value, allow_nan=True)
+        # Only use JSON when it round-trips exactly (no tuples, non-str keys, ...).
+        if json.loads(data) == value:
+            path = stem.with_suffix(".json")
+            path.write_text(data, encoding="utf-8")
+            return path
+    except (TypeError, ValueError):
+        pass
+    path = stem.with_suffix(".pkl")
+    with open(path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _deserialize(path: Path) -> Any:
+    suffix = path.suffix
+    if suffix == ".npy":
+        import numpy as np
+
+        return np.load(path, allow_pickle=False)
+    if suffix == ".arrow":
+        import pyarrow as pa
+
+        with pa.memory_map(str(path), "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    if suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
 
-    cache_dir = Path(__file__).resolve().parent.parent / ".cache"
-    cache_dir.mkdir(parents=True, exist_ok=True)
+def _private(value: Any) -> Any:
+    """Copy DataFrames handed out from the memory tier so callers may modify them."""
+    if type(value).__module__.startswith("pandas") and hasattr(value, "columns"):
+        return value.copy()
+    return value
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        key_data = json.dumps({"args": args, "kwargs": kwargs}, default=str, sort_keys=True)
-        key_hash = hashlib.sha256(key_data.encode()).hexdigest()
-        cache_file = cache_dir / f"{func.__name__}_{key_hash}.json"
-        if cache_file.exists():
+
+class TieredCache:
+    """
+    Memory LRU tier in front of a size-capped disk tier.
+
+    Parameters
+    ----------
+    namespace : str
+        Subdirectory of the cache root (usually the cached function's name).
+    directory : path, optional
+        Cache root; defaults to :func:`cache_dir`.
+    memory_bytes, disk_bytes : int, optional
+        Byte caps for each tier; 0 disables a tier.
+    """
+
+    SUFFIXES = (".npy", ".arrow", ".json", ".pkl")
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: Optional[Path] = None,
+        memory_bytes: Optional[int] = None,
+        disk_bytes: Optional[int] = None,
+    ) -> None:
+        self.namespace = namespace
+        self.root = Path(directory) if directory is not None else cache_dir()
+        self.path = self.root / namespace
+        self.memory_bytes = _SETTINGS["memory_bytes"] if memory_bytes is None else memory_bytes
+        self.disk_bytes = _SETTINGS["disk_bytes"] if disk_bytes is None else disk_bytes
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "memory_bytes": 0,
+            "disk_bytes": 0,
+        }
+        self._memory: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage: Optional[int] = None
+
+    # -- memory tier ------------------------------------------------------
+    def _remember(self, key: str, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.memory_bytes:
+            return
+        if hasattr(value, "setflags") and hasattr(value, "dtype"):
+            value.setflags(write=False)  # shared between callers
+        with self._lock:
+            if key in self._memory:
+                self.stats["memory_bytes"] -= self._memory.pop(key)[1]
+            self._memory[key] = (value, size)
+            self.stats["memory_bytes"] += size
+            while self.stats["memory_bytes"] > self.memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self.stats["memory_bytes"] -= evicted
+                self.stats["memory_evictions"] += 1
+
+    # -- disk tier --------------------------------------------------------
+    def _find(self, key: str) -> Optional[Path]:
+        stem = self.path / key[:2] / key
+        for suffix in self.SUFFIXES:
+            candidate = stem.with_suffix(suffix)
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        if not self.path.exists():
+            return
+        for shard in os.scandir(self.path):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        yield entry
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Advisory lock serializing eviction across processes."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / ".lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
             try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        result = func(*args, **kwargs)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _evict_disk(self) -> None:
+        with self._exclusive():
+            entries = []
+            for e in self._entries():
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                with self._lock:
+                    self.stats["disk_evictions"] += 1
+            with self._lock:
+                self._disk_usage = total
+                self.stats["disk_bytes"] = total
+
+    def _store(self, key: str, value: Any) -> None:
+        shard = self.path / key[:2]
+        shard.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{key}-", dir=shard)
+        os.close(fd)
+        tmp = Path(tmp_name)
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(result, f, default=str)
-        except Exception:
-            pass
-        return result
+            written = _serialize(value, tmp)
+            final = (shard / key).with_suffix(written.suffix)
+            os.replace(written, final)
+            for suffix in self.SUFFIXES:
+                if suffix != final.suffix and final.with_suffix(suffix).exists():
+                    final.with_suffix(suffix).unlink()  # value changed type
+        finally:
+            for leftover in (tmp, *(tmp.with_suffix(s) for s in self.SUFFIXES)):
+                if leftover.exists():
+                    leftover.unlink()
+        size = final.stat().st_size
+        scanned = sum(e.stat().st_size for e in self._entries()) if self._disk_usage is None else None
+        with self._lock:
+            self._disk_usage = scanned if scanned is not None else (self._disk_usage or 0) + size
+            self.stats["disk_bytes"] = self._disk_usage
+            over = self._disk_usage > self.disk_bytes
+        if over:
+            self._evict_disk()
+
+    # -- public API -------------------------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for ``key`` (memory first, then disk) or ``default``."""
+        with self._lock:
+            hit = key in self._memory
+            if hit:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                value = self._memory[key][0]
+        if hit:
+            return _private(value)
+        if self.disk_bytes > 0:
+            path = self._find(key)
+            if path is not None:
+                try:
+                    value = _deserialize(path)
+                    os.utime(path)
+                except (FileNotFoundError, EOFError, ValueError, OSError):
+                    value = _MISSING  # evicted or replaced by another process
+                if value is not _MISSING:
+                    with self._lock:
+                        self.stats["disk_hits"] += 1
+                    self._remember(key, value)
+                    return _private(value)
+        with self._lock:
+            self.stats["misses"] += 1
+        return default
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` in both tiers."""
+        if self.disk_bytes > 0:
+            self._store(key, value)
+        self._remember(key, _private(value))
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return _private(value)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self.stats["memory_bytes"] = 0
+        with self._exclusive():
+            for e in list(self._entries()):
+                try:
+                    os.remove(e.path)
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._disk_usage = 0
+            self.stats["disk_bytes"] = 0
+
+
+def get_cache(namespace: str) -> TieredCache:
+    """Shared :class:`TieredCache` for ``namespace`` under the configured root."""
+    if namespace not in _CACHES:
+        _CACHES[namespace] = TieredCache(namespace)
+    return _CACHES[namespace]
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Statistics of every cache used in this process."""
+    return {name: dict(cache.stats) for name, cache in _CACHES.items()}
+
+
+def disk_cache(func: Optional[Callable[..., Any]] = None, *, namespace: Optional[str] = None) -> Any:
+    """
+    Decorator that caches function return values in a :class:`TieredCache`.
+
+    The key is a content hash of the function's qualified name and its
+    arguments (arrays and DataFrames are hashed by value).  Usable as
+    ``@disk_cache`` or ``@disk_cache(namespace="...")``; the wrapper exposes
+    ``cache()`` (the underlying :class:`TieredCache`) and ``cache_clear()``.
+    Cached arrays are returned read-only and DataFrames as copies.  The
+    undecorated function is available as ``__wrapped__``.
+    """
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        name = namespace or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(name, args, kwargs)
+            return get_cache(name).get_or_compute(key, lambda: fn(*args, **kwargs))
+
+        wrapper.cache = lambda: get_cache(name)  # type: ignore[attr-defined]
+        wrapper.cache_clear = lambda: get_cache(name).clear()  # type: ignore[attr-defined]
+        return wrapper
 
-    return wrapper
+    return decorate(func) if func is not None else decorate
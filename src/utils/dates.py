@@ -4,7 +4,14 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta
 import calendar
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Day ordinals count days since 1970-01-01, the same origin as
+# ``numpy.datetime64[D]`` and ``julianday(date) - 2440587.5`` in SQLite.
+EPOCH = date(1970, 1, 1)
+SQLITE_EPOCH_JULIANDAY = 2440587.5
 
 
 def selection_sunday(season: int) -> date:
@@ -32,3 +39,27 @@ def parse_ymd(s: str) -> date:
 def ymd(d: date) -> str:
     """Format a date object as YYYY-MM-DD."""
     return d.strftime("%Y-%m-%d")
+
+
+def day_ordinal(d: date) -> int:
+    """Days since 1970-01-01."""
+    return (d - EPOCH).days
+
+
+def from_ordinal(day: int) -> date:
+    return EPOCH + timedelta(days=int(day))
+
+
+def ymd_to_ordinal(values: Sequence[str]) -> np.ndarray:
+    """Vectorized YYYY-MM-DD -> int32 day ordinals (no per-value strptime)."""
+    return np.asarray(values, dtype="datetime64[D]").astype(np.int32)
+
+
+def ordinal_to_ymd(days: Sequence[int]) -> np.ndarray:
+    """Vectorized int day ordinals -> YYYY-MM-DD strings."""
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype("datetime64[D]"), unit="D")
+
+
+def selection_sunday_ordinal(season: int) -> int:
+    """Day ordinal of :func:`selection_sunday`."""
+    return day_ordinal(selection_sunday(season))
@@ -2,10 +2,14 @@
 
 import math
 
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Compute the great-circle distance between two points on the Earth in kilometres."""
-    R = 6371.0  # Earth radius in kilometres
+    R = EARTH_RADIUS_KM
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
     d_phi = math.radians(lat2 - lat1)
@@ -13,3 +17,19 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     a = math.sin(d_phi / 2.0) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2.0) ** 2
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
+
+
+def haversine_km_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized :func:`haversine_km`; arguments broadcast like NumPy arrays."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(d_phi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+
+
+def distance_matrix(lat_a, lon_a, lat_b, lon_b) -> np.ndarray:
+    """(len(a) x len(b)) float32 great-circle distances in kilometres."""
+    lat_a, lon_a = np.asarray(lat_a, dtype=np.float64), np.asarray(lon_a, dtype=np.float64)
+    lat_b, lon_b = np.asarray(lat_b, dtype=np.float64), np.asarray(lon_b, dtype=np.float64)
+    return haversine_km_array(lat_a[:, None], lon_a[:, None], lat_b[None, :], lon_b[None, :]).astype(np.float32)
@@ -0,0 +1,44 @@
+"""
+Integer interning of team ids.
+
+The database assigns every team id a permanent integer ``team_uid``
+(``team_uids`` table, append-only, numbered from 0) and records which
+uids play in each season (``team_seasons``).  :func:`factorize_teams` turns
+the uids of a games frame into dense int32 codes so hot loops (e.g. Elo)
+work on index arrays and convert back to string ids only for their results.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def factorize_teams(games_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Dense int32 codes for the home and away teams of ``games_df``.
+
+    Uses the ``home_uid``/``away_uid`` columns from :func:`etl.load_games`
+    when present (integer factorization), otherwise the string ids.
+
+    Returns
+    -------
+    (ndarray, ndarray, ndarray)
+        Home codes, away codes and the team id of each code.
+    """
+    n = len(games_df)
+    names = np.concatenate([games_df["home_team_id"].to_numpy(), games_df["away_team_id"].to_numpy()])
+    if "home_uid" in games_df and "away_uid" in games_df:
+        keys = np.concatenate([games_df["home_uid"].to_numpy(), games_df["away_uid"].to_numpy()])
+        codes, uniques = pd.factorize(keys)
+        # Every row of a uid carries the same id, so any occurrence names it.
+        rows = np.empty(len(uniques), dtype=np.intp)
+        rows[codes] = np.arange(len(codes))
+        team_ids = names[rows].astype(str)
+    else:
+        codes, uniques = pd.factorize(names)
+        team_ids = np.asarray(uniques, dtype=str)
+    codes = codes.astype(np.int32)
+    return codes[:n], codes[n:], team_ids
@@ -0,0 +1,152 @@
+"""Lightweight stage profiling with timing and memory spans.
+
+A :class:`Profiler` records named spans (wall time, tracemalloc peak and the
+process's peak RSS), reports each one through :func:`utils.logging.get_logger`
+and can write them as a Chrome trace-event JSON file, viewable in
+``chrome://tracing`` or https://ui.perfetto.dev.
+
+Library code marks stages with the module-level :func:`span`, which is a
+no-op unless a profiler has been activated (e.g. by ``--profile`` on the CLI)::
+
+    with profiling.span("simulate", n_sims=n_sims):
+        ...
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from .logging import get_logger
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+_ACTIVE: "Profiler | None" = None
+
+
+def _max_rss_bytes() -> int | None:
+    """Peak resident set size of this process so far, in bytes."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+class Profiler:
+    """Collect timing and memory spans for pipeline stages.
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Track Python/NumPy allocations with tracemalloc.  Adds overhead to
+        allocation-heavy code, so it can be disabled for timing-only runs.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.events: List[Dict[str, Any]] = []
+        self._peaks: List[int] = []
+        self._t0 = time.perf_counter()
+        self._logger = get_logger("profile")
+        self._started_tracemalloc = False
+
+    def activate(self) -> "Profiler":
+        """Make this the profiler used by the module-level :func:`span`."""
+        global _ACTIVE
+        _ACTIVE = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def deactivate(self) -> None:
+        """Stop routing module-level spans to this profiler."""
+        global _ACTIVE
+        if _ACTIVE is self:
+            _ACTIVE = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time a block and record its memory usage."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the peak so far into the enclosing span before resetting.
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            start_mem = current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - start
+            record: Dict[str, Any] = {"seconds": round(dur, 6)}
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                record["traced_peak_bytes"] = peak
+                record["traced_delta_bytes"] = current - start_mem
+            rss = _max_rss_bytes()
+            if rss is not None:
+                record["max_rss_bytes"] = rss
+            record.update(args)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": round((start - self._t0) * 1e6, 1),
+                    "dur": round(dur * 1e6, 1),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": record,
+                }
+            )
+            mem = ""
+            if "traced_peak_bytes" in record:
+                mem += f" traced_peak={record['traced_peak_bytes'] / 1e6:.1f}MB"
+            if rss is not None:
+                mem += f" max_rss={rss / 1e6:.1f}MB"
+            self._logger.info(f"{name}: {dur:.3f}s{mem}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return one row per recorded span in completion order."""
+        return [{"name": e["name"], **e["args"]} for e in self.events]
+
+    def write_trace(self, path: Path) -> Path:
+        """Write recorded spans as Chrome trace-event JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f, indent=1)
+        return path
+
+
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager:
+    """Record a span on the active profiler, or do nothing if none is active."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE.span(name, **args)
+
+
+def active() -> "Profiler | None":
+    """Return the currently active profiler, if any."""
+    return _ACTIVE
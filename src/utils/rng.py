@@ -11,6 +11,12 @@ def seed_everything(seed: int) -> None:
     np.random.seed(seed)
 
 
-def get_rng(seed: int) -> np.random.Generator:
-    """Get a NumPy random Generator seeded deterministically."""
+def get_rng(seed: int, *streams: int) -> np.random.Generator:
+    """Get a NumPy random Generator seeded deterministically.
+
+    Extra ``streams`` (e.g. a season) derive independent, reproducible
+    sub-streams from the same base seed.
+    """
+    if streams:
+        return np.random.default_rng([seed, *streams])
     return np.random.default_rng(seed)
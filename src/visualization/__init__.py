@@ -1,3 +1,3 @@
 """Visualization modules, including charts and Streamlit dashboard."""
 
-__all__ = ["dashboard_streamlit"]
+__all__ = ["dashboard_data", "dashboard_streamlit", "static_site"]
@@ -0,0 +1,330 @@
+"""
+Precomputed dashboard tables.
+
+Taking a snapshot materializes everything the dashboard shows into a small
+directory ``<snapshots_dir>/<season>/<asof>/``:
+
+``manifest.json``            season, as-of date, snapshot hash, models, tables
+``teams.csv``                team ids and names in matrix order
+``matchups_<model>.npy``     float32 pairwise win-probability matrix
+``advancement_<model>.csv``  per-team odds of reaching each round (needs a field)
+``field.csv``                the tournament field (slots) for what-if queries
+``backtests.csv``            mean backtest metrics per model
+
+The snapshot hash covers the games up to the as-of date, the model
+artifact versions and the backtest summary, so page caches keyed on it are
+invalidated exactly when anything shown changes.
+Loaded snapshots answer every page query with a dictionary or array lookup.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_acquisition import etl as etl_mod
+from ..simulation import artifacts, monte_carlo, trainer, whatif
+from ..utils.logging import get_logger
+
+logger = get_logger("dashboard")
+
+# Above this many First Four games, play-ins are resolved by the favourite
+# instead of enumerating every combination of their outcomes.
+MAX_EXACT_PLAY_INS = 6
+
+METRICS = ["brier", "log_loss", "auc_roc"]
+
+
+def snapshot_dir(snapshots_dir: Path, season: int, asof: str) -> Path:
+    return Path(snapshots_dir) / str(season) / asof
+
+
+def round_columns(n_slots: int) -> List[str]:
+    """Advancement column names for a bracket with ``n_slots`` slots."""
+    rounds = monte_carlo.n_rounds(n_slots)
+    return ["in_bracket"] + [f"reach_{n_slots >> (r + 1)}" for r in range(rounds - 1)] + ["champion"]
+
+
+def field_advancement(field: pd.DataFrame, team_index: Dict[str, int], P: np.ndarray, n_sims: int, seed: int) -> pd.DataFrame:
+    """
+    Round-by-round advancement odds for a tournament field.
+
+    Each combination of First Four outcomes is simulated with the same seed
+    and weighted by its probability, so play-in teams get exact
+    ``in_bracket`` odds and consistent later-round odds.
+
+    Parameters
+    ----------
+    field : DataFrame
+        ``team_id``, ``slot`` (two teams share a slot for a play-in game) and
+        optionally ``region``/``seed``.
+    team_index : dict
+        Team id -> row of ``P``.
+    P : ndarray
+        Pairwise win-probability matrix.
+    n_sims : int
+        Brackets simulated per play-in combination.
+    seed : int
+        Simulation seed.
+
+    Returns
+    -------
+    DataFrame
+        Indexed by team_id with the field columns and :func:`round_columns`.
+    """
+    field = field.sort_values("slot")
+    slots = [[team_index[t] for t in grp] for _, grp in field.groupby("slot", sort=True)["team_id"]]
+    play = [k for k, s in enumerate(slots) if len(s) == 2]
+    rows = [r for s in slots for r in s]
+    pos = {r: i for i, r in enumerate(rows)}
+    adv = np.zeros((len(rows), len(round_columns(len(slots)))))
+    if len(play) > MAX_EXACT_PLAY_INS:
+        combos = [tuple(0 if P[slots[k][0], slots[k][1]] >= 0.5 else 1 for k in play)]
+    else:
+        combos = list(itertools.product((0, 1), repeat=len(play)))
+    for combo in combos:
+        occupants = [s[0] for s in slots]
+        weight = 1.0
+        for k, c in zip(play, combo):
+            occupants[k] = slots[k][c]
+            if len(combos) > 1:
+                weight *= P[slots[k][c], slots[k][1 - c]]
+        sims = monte_carlo.simulate_bracket(occupants, P[np.ix_(occupants, occupants)], n_sims, seed)
+        for k, row in enumerate(occupants):
+            adv[pos[row], 0] += weight
+            adv[pos[row], 1:] += weight * sims["advancement"][k]
+    inv = {v: k for k, v in team_index.items()}
+    out = pd.DataFrame(adv, columns=round_columns(len(slots)), index=pd.Index([inv[r] for r in rows], name="team_id"))
+    extra = [c for c in ("region", "seed") if c in field.columns]
+    return field.set_index("team_id")[extra].join(out).round(6)
+
+
+def backtest_summary(backtests_dir: Optional[Path]) -> Optional[pd.DataFrame]:
+    """Mean backtest metrics per model from ``backtest_summary.csv``, if present."""
+    if backtests_dir is None or not (Path(backtests_dir) / "backtest_summary.csv").exists():
+        return None
+    df = pd.read_csv(Path(backtests_dir) / "backtest_summary.csv")
+    metrics = [m for m in METRICS if m in df.columns]
+    out = df.groupby("model")[metrics].mean().round(4)
+    out["n_seasons"] = df.groupby("model")["season"].nunique()
+    return out.reset_index()
+
+
+def materialize_snapshot(
+    db_path: str,
+    season: int,
+    asof: str,
+    snapshots_dir: Path,
+    model_cfg: Dict[str, Any],
+    artifacts_root: Optional[Path] = None,
+    field_path: Optional[Path] = None,
+    backtests_dir: Optional[Path] = None,
+    n_sims: int = 10_000,
+    seed: int = 1337,
+) -> Path:
+    """
+    Write the precomputed dashboard tables for one snapshot.
+
+    Elo and bayes are always included; logit and the ensemble are added when they have
+    an artifact under ``artifacts_root``.  The directory is written to a
+    temporary location and swapped into place, so a running dashboard never
+    reads a half-written snapshot.
+
+    Returns
+    -------
+    Path
+        The snapshot directory.
+    """
+    games = etl_mod.load_games(db_path, [season], asof)
+    root = Path(artifacts_root) if artifacts_root is not None else None
+    models = ["elo", "bayes"]
+    if root is not None:
+        models += [m for m in ("logit", "ensemble") if artifacts.latest_version(root, m)]
+    teams, mats = trainer.predict_matrices(db_path, season, asof, models, model_cfg, root)
+    team_index = {t: i for i, t in enumerate(teams)}
+    conn = sqlite3.connect(db_path)
+    try:
+        names = dict(conn.execute("SELECT team_id, name FROM teams WHERE season = ?", (season,)).fetchall())
+    finally:
+        conn.close()
+
+    target = snapshot_dir(snapshots_dir, season, asof)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{asof}-", dir=target.parent))
+    os.chmod(tmp, 0o755)
+    try:
+        tables = ["teams"]
+        team_names = [names.get(t, t) for t in teams]
+        pd.DataFrame({"team_id": teams, "name": team_names}).to_csv(tmp / "teams.csv", index=False)
+        field = None
+        if field_path is not None and Path(field_path).exists():
+            field = pd.read_csv(field_path, dtype={"team_id": str})
+            field.to_csv(tmp / "field.csv", index=False)
+            tables.append("field")
+        for model, P in mats.items():
+            np.save(tmp / f"matchups_{model}.npy", np.asarray(P, dtype=np.float32))
+            tables.append(f"matchups_{model}")
+            if field is not None:
+                field_advancement(field, team_index, P, n_sims, seed).to_csv(tmp / f"advancement_{model}.csv")
+                tables.append(f"advancement_{model}")
+        summary = backtest_summary(backtests_dir)
+        if summary is not None:
+            summary.to_csv(tmp / "backtests.csv", index=False)
+            tables.append("backtests")
+        versions = {m: artifacts.latest_version(root, m) if root is not None else None for m in mats}
+        inputs = {
+            "games": artifacts.frame_hash(games),
+            "models": versions,
+            "backtests": artifacts.frame_hash(summary) if summary is not None else None,
+            "field": artifacts.frame_hash(field) if field is not None else None,
+            "sims": [n_sims, seed],
+        }
+        manifest = {
+            "season": season,
+            "asof": asof,
+            "snapshot": artifacts.config_hash(inputs),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "models": list(mats),
+            "tables": tables,
+        }
+        with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    except BaseException:
+        # Leave no half-written snapshot behind in the snapshots directory.
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # Directories cannot be renamed over non-empty ones: move the old copy aside first.
+    old = None
+    if target.exists():
+        old = target.with_name(f".{asof}.old-{os.getpid()}")
+        os.replace(target, old)
+    try:
+        os.replace(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if old is not None:
+            os.replace(old, target)
+        raise
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+    logger.info(f"Materialized dashboard tables for {season}@{asof} ({manifest['snapshot']}) in {target}")
+    return target
+
+
+def list_snapshots(snapshots_dir: Path) -> List[Dict[str, Any]]:
+    """Manifests of every materialized snapshot, newest season/date first."""
+    manifests = []
+    for path in Path(snapshots_dir).glob("*/*/manifest.json"):
+        with open(path, "r", encoding="utf-8") as f:
+            manifests.append({**json.load(f), "path": str(path.parent)})
+    return sorted(manifests, key=lambda m: (m["season"], m["asof"]), reverse=True)
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+    """
+    Load a materialized snapshot for lookups.
+
+    Returns
+    -------
+    dict
+        ``manifest``, ``teams`` (DataFrame indexed by team_id), ``team_index``,
+        ``matchups`` (model -> memory-mapped matrix), ``advancement``
+        (model -> DataFrame indexed by team_id), ``field`` and ``backtests``.
+    """
+    path = Path(path)
+    with open(path / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    teams = pd.read_csv(path / "teams.csv", dtype={"team_id": str}).set_index("team_id")
+    data: Dict[str, Any] = {
+        "manifest": manifest,
+        "teams": teams,
+        "team_index": {t: i for i, t in enumerate(teams.index)},
+        "matchups": {},
+        "advancement": {},
+        "field": None,
+        "backtests": None,
+    }
+    for model in manifest["models"]:
+        data["matchups"][model] = np.load(path / f"matchups_{model}.npy", mmap_mode="r")
+        if f"advancement_{model}" in manifest["tables"]:
+            data["advancement"][model] = pd.read_csv(path / f"advancement_{model}.csv", dtype={"team_id": str}).set_index("team_id")
+    if "field" in manifest["tables"]:
+        data["field"] = pd.read_csv(path / "field.csv", dtype={"team_id": str})
+    if "backtests" in manifest["tables"]:
+        data["backtests"] = pd.read_csv(path / "backtests.csv")
+    return data
+
+
+def matchup_prob(data: Dict[str, Any], model: str, team_a: str, team_b: str) -> float:
+    """Probability that ``team_a`` beats ``team_b`` from a loaded snapshot."""
+    idx = data["team_index"]
+    return float(data["matchups"][model][idx[team_a], idx[team_b]])
+
+
+def bracket_occupants(field: pd.DataFrame, team_index: Dict[str, int], P: np.ndarray, winners: Any = ()) -> List[str]:
+    """
+    One team per bracket slot, in slot order.
+
+    First Four slots hold the team listed in ``winners`` if there is one,
+    otherwise the favourite of the play-in game.
+    """
+    chosen = set(winners)
+    occupants = []
+    for _, grp in field.sort_values("slot").groupby("slot", sort=True)["team_id"]:
+        pair = list(grp)
+        picked = [t for t in pair if t in chosen]
+        if picked:
+            occupants.append(picked[0])
+        elif len(pair) == 2 and P[team_index[pair[1]], team_index[pair[0]]] > 0.5:
+            occupants.append(pair[1])
+        else:
+            occupants.append(pair[0])
+    return occupants
+
+
+def whatif_engine(data: Dict[str, Any], model: str, occupants: List[str]) -> whatif.WhatIf:
+    """Exact what-if engine over a loaded snapshot's matrix for one bracket."""
+    idx = [data["team_index"][t] for t in occupants]
+    P = np.asarray(data["matchups"][model], dtype=np.float64)[np.ix_(idx, idx)]
+    return whatif.WhatIf(occupants, P)
+
+
+def whatif_table(engine: whatif.WhatIf, forced: Dict[int, List[str]]) -> Tuple[float, pd.DataFrame]:
+    """
+    Conditional advancement given teams forced to win games by round.
+
+    Parameters
+    ----------
+    engine : WhatIf
+        Engine from :func:`whatif_engine`.
+    forced : dict
+        Round (0 = first round) -> teams forced to win their game that round.
+
+    Returns
+    -------
+    (float, DataFrame)
+        Probability of the scenario and the odds of winning each round,
+        indexed by team_id with :func:`round_columns` (minus ``in_bracket``).
+    """
+    first = np.searchsorted(engine.rounds, np.arange(int(engine.rounds[-1]) + 1))
+    results = {}
+    for r, teams in forced.items():
+        for t in teams:
+            game = engine.game_ids[int(first[r]) + (engine.slot[t] >> (r + 1))]
+            if results.get(game, t) != t:
+                raise ValueError(f"{results[game]} and {t} cannot both win {game}")
+            results[game] = t
+    res = engine.query(results)
+    cols = round_columns(engine.n_teams)[1:]
+    table = pd.DataFrame(res["advancement"], columns=cols, index=pd.Index(engine.teams, name="team_id"))
+    return res["probability"], table.round(6)
@@ -1,19 +1,103 @@
-"""Streamlit dashboard implementation (minimal placeholder)."""
+"""Streamlit dashboard over the precomputed snapshot tables.
+
+Nothing here touches ``mm.db``: pages read the tables written by
+:func:`dashboard_data.materialize_snapshot`.  The snapshot list is cached
+with ``st.cache_data`` (refreshed when the snapshots directory changes) and
+each loaded snapshot with ``st.cache_resource`` keyed on its snapshot hash,
+so all viewers share one copy and every interaction is a lookup.
+"""
 
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
 import streamlit as st
 
+from . import dashboard_data
+
+
+def _dir_stamp(snapshots_dir: str) -> float:
+    """Latest modification time of any manifest (cheap cache key)."""
+    paths = list(Path(snapshots_dir).glob("*/*/manifest.json"))
+    return max((p.stat().st_mtime for p in paths), default=0.0)
+
+
+@st.cache_data(show_spinner=False)
+def _snapshots(snapshots_dir: str, stamp: float) -> List[Dict[str, Any]]:
+    return dashboard_data.list_snapshots(Path(snapshots_dir))
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _snapshot(path: str, snapshot_hash: str) -> Dict[str, Any]:
+    return dashboard_data.load_snapshot(Path(path))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _whatif_engine(path: str, snapshot_hash: str, model: str, occupants: Tuple[str, ...]) -> Any:
+    # Engines memoize subtrees, so sharing one per bracket keeps queries at ~1 ms.
+    return dashboard_data.whatif_engine(_snapshot(path, snapshot_hash), model, list(occupants))
+
 
 def run_dashboard(db_path: str, snapshots_dir: str) -> None:
     """
     Launch a Streamlit dashboard for exploring backtests, brackets and matchups.
-    Placeholder implementation shows basic information.
+
+    Snapshots are materialized by the ``snapshot`` subcommand; ``db_path`` is
+    only shown for reference.
     """
     st.title("March Madness Dashboard")
-    st.write("Database path:", db_path)
-    st.write("Snapshots directory:", snapshots_dir)
-    st.write(
-        "This dashboard is under construction. Backtest results and bracket visualisations "
-        "will appear here once implemented."
-    )
+    manifests = _snapshots(snapshots_dir, _dir_stamp(snapshots_dir))
+    if not manifests:
+        st.write("No snapshots found in", snapshots_dir, "- run the `snapshot` subcommand first.")
+        return
+    labels = [f"{m['season']} as of {m['asof']}" for m in manifests]
+    choice = st.sidebar.selectbox("Snapshot", range(len(manifests)), format_func=labels.__getitem__)
+    manifest = manifests[choice]
+    data = _snapshot(manifest["path"], manifest["snapshot"])
+    model = st.sidebar.selectbox("Model", manifest["models"])
+    st.sidebar.caption(f"Snapshot {manifest['snapshot']} · database {db_path}")
+
+    tab_match, tab_adv, tab_what, tab_bt = st.tabs(["Matchups", "Advancement", "What-if", "Backtests"])
+    teams = data["teams"]
+    with tab_match:
+        label = lambda t: f"{teams.at[t, 'name']} ({t})"  # noqa: E731
+        col_a, col_b = st.columns(2)
+        team_a = col_a.selectbox("Team A", teams.index, format_func=label)
+        team_b = col_b.selectbox("Team B", teams.index, index=min(1, len(teams) - 1), format_func=label)
+        if team_a != team_b:
+            prob = dashboard_data.matchup_prob(data, model, team_a, team_b)
+            st.metric(f"{teams.at[team_a, 'name']} win probability", f"{prob:.1%}")
+    with tab_adv:
+        adv = data["advancement"].get(model)
+        if adv is None:
+            st.write("No tournament field was available for this snapshot.")
+        else:
+            st.dataframe(adv.join(teams["name"]).sort_values("champion", ascending=False))
+    with tab_what:
+        field = data["field"]
+        if field is None:
+            st.write("No tournament field was available for this snapshot.")
+        else:
+            name = lambda t: teams.at[t, "name"] if t in teams.index else t  # noqa: E731
+            rounds = dashboard_data.round_columns(field["slot"].nunique())[1:]
+            forced = {
+                r: st.multiselect(f"Force to win: {col}", sorted(field["team_id"]), format_func=name, key=f"whatif_{r}")
+                for r, col in enumerate(rounds)
+            }
+            chosen = [t for picks in forced.values() for t in picks]
+            P = data["matchups"][model]
+            occupants = dashboard_data.bracket_occupants(field, data["team_index"], P, chosen)
+            engine = _whatif_engine(manifest["path"], manifest["snapshot"], model, tuple(occupants))
+            try:
+                prob, table = dashboard_data.whatif_table(engine, forced)
+            except (KeyError, ValueError) as exc:
+                st.error(f"Impossible scenario: {exc}")
+            else:
+                st.metric("Scenario probability", f"{prob:.2%}")
+                st.dataframe(table.join(teams["name"]).sort_values("champion", ascending=False))
+    with tab_bt:
+        if data["backtests"] is None:
+            st.write("No backtest results were available for this snapshot.")
+        else:
+            st.dataframe(data["backtests"])
@@ -0,0 +1,138 @@
+"""
+Static dashboard build.
+
+Exports the materialized snapshots (see :mod:`dashboard_data`) as a static
+site that any file server or CDN can host::
+
+    index.html                                   single page, plain JS
+    data/index.json                              snapshot list and shard names
+    data/<season>/<asof>/<snapshot>/<shard>.json.gz
+
+Each shard is gzip-compressed JSON fetched lazily by the page (teams,
+``matchups_<model>``, ``advancement_<model>``, ``backtests``).  Shard
+directories are named by snapshot hash, so they never change once written
+and can be cached forever; rebuilding only writes snapshots whose hash has
+no shard directory yet and prunes superseded ones.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logging import get_logger
+from . import dashboard_data
+
+logger = get_logger("dashboard")
+
+PAGE = Path(__file__).resolve().parent / "static" / "index.html"
+
+
+def _write_json_gz(path: Path, obj: Any) -> None:
+    data = json.dumps(obj, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    # mtime=0 keeps the bytes (and CDN ETags) identical across rebuilds.
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(data)
+
+
+def _records(df: pd.DataFrame) -> Dict[str, Any]:
+    df = df.astype(object).where(df.notna(), None)
+    return {"columns": [str(c) for c in df.columns], "rows": df.to_dict(orient="records")}
+
+
+def _write_shards(data: Dict[str, Any], shard_dir: Path) -> Dict[str, str]:
+    """Write every shard of one loaded snapshot; returns shard -> file name."""
+    shards: Dict[str, str] = {}
+
+    def put(name: str, obj: Any) -> None:
+        _write_json_gz(shard_dir / f"{name}.json.gz", obj)
+        shards[name] = f"{name}.json.gz"
+
+    teams = data["teams"]
+    put("teams", {"team_id": teams.index.tolist(), "name": teams["name"].tolist()})
+    for model, P in data["matchups"].items():
+        put(f"matchups_{model}", np.round(np.asarray(P, dtype=np.float64), 4).tolist())
+    for model, adv in data["advancement"].items():
+        table = adv.join(teams["name"]).reset_index()
+        table = table[["team_id", "name"] + [c for c in adv.columns]]
+        put(f"advancement_{model}", _records(table))
+    if data["backtests"] is not None:
+        put("backtests", _records(data["backtests"]))
+    return shards
+
+
+def build_static(snapshots_dir: Path, out_dir: Path, force: bool = False) -> Dict[str, int]:
+    """
+    Build or update the static dashboard in ``out_dir``.
+
+    Parameters
+    ----------
+    snapshots_dir : Path
+        Directory of materialized snapshots.
+    out_dir : Path
+        Site root.
+    force : bool
+        Rewrite every shard even if its snapshot hash is unchanged.
+
+    Returns
+    -------
+    dict
+        Counts of ``built``, ``skipped`` and ``pruned`` snapshot shard sets.
+    """
+    out_dir = Path(out_dir)
+    data_dir = out_dir / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    stats = {"built": 0, "skipped": 0, "pruned": 0}
+    entries: List[Dict[str, Any]] = []
+    live = set()
+    for manifest in dashboard_data.list_snapshots(Path(snapshots_dir)):
+        rel = Path(str(manifest["season"])) / manifest["asof"] / manifest["snapshot"]
+        shard_dir = data_dir / rel
+        shard_index = shard_dir / "shards.json"
+        live.add(rel)
+        if shard_index.exists() and not force:
+            with open(shard_index, "r", encoding="utf-8") as f:
+                shards = json.load(f)
+            stats["skipped"] += 1
+        else:
+            shard_dir.parent.mkdir(parents=True, exist_ok=True)
+            tmp = Path(tempfile.mkdtemp(prefix=f".{manifest['snapshot']}-", dir=shard_dir.parent))
+            os.chmod(tmp, 0o755)
+            shards = _write_shards(dashboard_data.load_snapshot(Path(manifest["path"])), tmp)
+            with open(tmp / "shards.json", "w", encoding="utf-8") as f:
+                json.dump(shards, f)
+            if shard_dir.exists():
+                shutil.rmtree(shard_dir)
+            os.replace(tmp, shard_dir)
+            stats["built"] += 1
+        entries.append(
+            {
+                "season": manifest["season"],
+                "asof": manifest["asof"],
+                "snapshot": manifest["snapshot"],
+                "created": manifest["created"],
+                "models": manifest["models"],
+                "base": f"data/{rel.as_posix()}/",
+                "shards": shards,
+            }
+        )
+    # Drop shard sets of superseded or deleted snapshots.
+    for shard_index in data_dir.glob("*/*/*/shards.json"):
+        if shard_index.parent.relative_to(data_dir) not in live:
+            shutil.rmtree(shard_index.parent)
+            stats["pruned"] += 1
+    tmp_index = data_dir / f".index.json.{os.getpid()}"
+    with open(tmp_index, "w", encoding="utf-8") as f:
+        json.dump({"snapshots": entries}, f, indent=1)
+    os.replace(tmp_index, data_dir / "index.json")
+    shutil.copyfile(PAGE, out_dir / "index.html")
+    logger.info(f"Static dashboard in {out_dir}: {stats}")
+    return stats
@@ -1,38 +1,304 @@
-"""Generate game writeups using Jinja2 templates."""
+"""Generate game writeups using Jinja2 templates.
+
+Writeups are produced in bulk: the pairwise win-probability matrix and the
+as-of team features are computed once, every matchup's template context is
+built from them with array operations, and rendering is spread over a
+process pool.  The compiled template is cached once per process and the
+rendered previews are streamed to the export file chunk by chunk, so
+regenerating every preview after each tournament game takes seconds.
+"""
 
 from __future__ import annotations
 
+import functools
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
-import json
-import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import numpy as np
+import pandas as pd
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
+from ..data_acquisition import etl as etl_mod
+from ..simulation import artifacts, elo, features as feat_mod, trainer
+from ..utils.logging import get_logger
 
-def generate_game_writeups(season: int, asof: str, style: str, db_path: str, template_dir: Path, export_dir: Path) -> None:
-    """
-    Generate game preview writeups for a given season and date.
-    This placeholder implementation renders a static template without real data.
-    """
+logger = get_logger("writeups")
+
+ROUND_NAMES = {2: "Championship", 4: "Final Four", 8: "Elite Eight", 16: "Sweet 16"}
+
+# (feature, sign, phrase): sign +1 when higher is better for the team.
+KEY_FACTORS = [
+    ("adj_o", 1.0, "scores more points per game"),
+    ("adj_d", -1.0, "allows fewer points per game"),
+    ("sos", 1.0, "has faced the tougher schedule"),
+    ("win_pct", 1.0, "has the better record"),
+]
+
+
+def _round_name(n_left: int) -> str:
+    return ROUND_NAMES.get(n_left, f"Round of {n_left}")
+
+
+@functools.lru_cache(maxsize=None)
+def _template(template_dir: str, name: str) -> Template:
+    """Compiled template, loaded once per process."""
     env = Environment(
-        loader=FileSystemLoader(str(template_dir)),
+        loader=FileSystemLoader(template_dir),
         autoescape=select_autoescape(["html", "xml", "j2"]),
     )
-    template = env.get_template("game_preview.j2")
-    # In a full implementation, iterate over matchups and fill in template context
-    context = {
-        "round_name": "Round of 64",
-        "team_a_name": "Team A",
-        "team_b_name": "Team B",
-        "pick": "Team A",
-        "prob_pick": 0.6,
-        "confidence_label": "medium",
-        "key_factors_sentence": "Higher offensive efficiency and experience.",
-        "x_factors_sentence": "Injuries could sway the outcome.",
-        "historical_note": "These teams have never met in the tournament."
-    }
-    rendered = template.render(**context)
-    export_file = export_dir / f"game_previews_{season}_{asof}.txt"
-    with open(export_file, "w", encoding="utf-8") as f:
-        f.write(rendered)
+    return env.get_template(name)
+
+
+def _render_chunk(job: Tuple[str, str, List[Dict[str, Any]]]) -> str:
+    template_dir, name, contexts = job
+    template = _template(template_dir, name)
+    return "".join(template.render(**ctx) + "\n\n" for ctx in contexts)
+
+
+def _team_names(db_path: str, season: int) -> Dict[str, str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT team_id, name FROM teams WHERE season = ?", (season,)).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def _prob_matrix(
+    games: pd.DataFrame,
+    teams: List[str],
+    db_path: str,
+    season: int,
+    asof: str,
+    model: str,
+    model_cfg: Dict[str, Any],
+    artifacts_root: Optional[Path],
+) -> np.ndarray:
+    """Pairwise matrix from the artifact store, or Elo fit on the snapshot."""
+    if artifacts_root is not None and artifacts.latest_version(artifacts_root, model):
+        _, mats = trainer.predict_matrices(db_path, season, asof, [model], model_cfg, artifacts_root)
+        return mats[model]
+    if model != "elo":
+        logger.warning(f"No '{model}' artifact under {artifacts_root}; using Elo fit on the snapshot")
+    return elo.elo_prob_matrix(elo.train_elo(games, model_cfg.get("elo", {})), teams)
+
+
+def bracket_matchups(field: pd.DataFrame, team_index: Dict[str, int], P: np.ndarray) -> pd.DataFrame:
+    """
+    Every game of a bracket, advancing the model's pick from each game.
+
+    Parameters
+    ----------
+    field : DataFrame
+        Field with ``team_id``, ``slot`` and ``play_in`` columns (two teams
+        share a slot for each First Four game).
+    team_index : dict
+        Team id -> row of ``P``.
+    P : ndarray
+        Pairwise win-probability matrix.
+
+    Returns
+    -------
+    DataFrame
+        ``game_id``, ``round_name``, ``a`` and ``b`` (rows of ``P``), in
+        bracket order: First Four, then round by round.
+    """
+    rows = []
+    slots: Dict[int, int] = {}
+    for slot, group in field.sort_values("slot").groupby("slot", sort=True):
+        idx = [team_index[t] for t in group["team_id"].astype(str)]
+        if len(idx) == 2:
+            a, b = idx
+            rows.append((f"FF{len(rows)}", "First Four", a, b))
+            slots[int(slot)] = a if P[a, b] >= 0.5 else b
+        else:
+            slots[int(slot)] = idx[0]
+    current = [slots[s] for s in sorted(slots)]
+    r = 0
+    while len(current) > 1:
+        name = _round_name(len(current))
+        a, b = np.array(current[0::2]), np.array(current[1::2])
+        rows.extend((f"R{r}G{g}", name, int(x), int(y)) for g, (x, y) in enumerate(zip(a, b)))
+        current = np.where(P[a, b] >= 0.5, a, b).tolist()
+        r += 1
+    return pd.DataFrame(rows, columns=["game_id", "round_name", "a", "b"])
+
+
+def all_matchups(team_rows: np.ndarray) -> pd.DataFrame:
+    """Every pairing of the given matrix rows (for "what if" pages)."""
+    i, j = np.triu_indices(len(team_rows), k=1)
+    a, b = team_rows[i], team_rows[j]
+    return pd.DataFrame({"game_id": [f"W{x}-{y}" for x, y in zip(a, b)], "round_name": "What if", "a": a, "b": b})
+
+
+def build_contexts(
+    matchups: pd.DataFrame,
+    teams: List[str],
+    names: Dict[str, str],
+    team_feats: pd.DataFrame,
+    P: np.ndarray,
+    games: pd.DataFrame,
+) -> List[Dict[str, Any]]:
+    """Template contexts for every matchup, computed column-wise."""
+    a = matchups["a"].to_numpy(dtype=np.intp)
+    b = matchups["b"].to_numpy(dtype=np.intp)
+    p = P[a, b]
+    pick = np.where(p >= 0.5, a, b)
+    other = np.where(p >= 0.5, b, a)
+    prob_pick = np.maximum(p, 1.0 - p)
+    confidence = np.select([prob_pick >= 0.75, prob_pick >= 0.6], ["high", "medium"], "low")
+
+    feats = team_feats.reindex(teams)
+    # Standardized advantage of the pick on each key factor.
+    adv = np.stack(
+        [
+            sign * (feats[f].to_numpy()[pick] - feats[f].to_numpy()[other]) / (feats[f].std() or 1.0)
+            for f, sign, _ in KEY_FACTORS
+        ],
+        axis=1,
+    )
+    best = np.argmax(np.nan_to_num(adv, nan=-np.inf), axis=1)
+    tempo = feats["tempo"].to_numpy()
+    luck = feats["luck"].to_numpy()
+    tempo_gap = np.abs(tempo[a] - tempo[b]) > feats["tempo"].std()
+
+    # Meetings earlier this season, keyed by unordered pair of matrix rows.
+    index = {t: i for i, t in enumerate(teams)}
+    h = games["home_team_id"].map(index).to_numpy()
+    w = games["away_team_id"].map(index).to_numpy()
+    home_won = (games["home_score"] > games["away_score"]).to_numpy()
+    winner = np.where(home_won, h, w)
+    met = pd.DataFrame({"lo": np.minimum(h, w), "hi": np.maximum(h, w), "winner": winner})
+    meetings = {(lo, hi): grp["winner"].tolist() for (lo, hi), grp in met.groupby(["lo", "hi"])}
+
+    name = [names.get(t, t) for t in teams]
+    contexts = []
+    for k in range(len(matchups)):
+        ai, bi, pi, oi = a[k], b[k], pick[k], other[k]
+        if tempo_gap[k]:
+            x_factor = f"A clash of tempos ({tempo[ai]:.1f} vs {tempo[bi]:.1f} points per side) could swing it"
+        else:
+            dog = oi
+            x_factor = f"{name[dog]} has been {'lucky' if luck[dog] > 0 else 'unlucky'} in close games ({luck[dog]:+.2f})"
+        prior = meetings.get((min(ai, bi), max(ai, bi)), [])
+        if prior:
+            wins = sum(1 for t in prior if t == pi)
+            history = f"They met {len(prior)} time(s) this season; {name[pi]} won {wins}"
+        else:
+            history = "These teams have not met this season"
+        contexts.append(
+            {
+                "game_id": matchups["game_id"].iat[k],
+                "round_name": matchups["round_name"].iat[k],
+                "team_a_name": name[ai],
+                "team_b_name": name[bi],
+                "pick": name[pi],
+                "prob_pick": float(prob_pick[k]),
+                "confidence_label": str(confidence[k]),
+                "key_factors_sentence": f"{name[pi]} {KEY_FACTORS[best[k]][2]}",
+                "x_factors_sentence": x_factor,
+                "historical_note": history,
+            }
+        )
+    return contexts
+
+
+def render_writeups(
+    contexts: List[Dict[str, Any]],
+    template_dir: Path,
+    template_name: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[str]:
+    """
+    Render contexts in chunks, yielding each chunk's text in order.
+
+    Chunks are rendered in a process pool when there is more than one
+    chunk and more than one worker; each worker compiles the template once.
+    """
+    jobs = [(str(template_dir), template_name, contexts[i : i + chunk_size]) for i in range(0, len(contexts), chunk_size)]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(_render_chunk, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        yield from pool.map(_render_chunk, jobs)
+
+
+def generate_game_writeups(
+    season: int,
+    asof: str,
+    style: str,
+    db_path: str,
+    template_dir: Path,
+    export_dir: Path,
+    field_path: Optional[Path] = None,
+    matchups: str = "bracket",
+    model: str = "elo",
+    model_cfg: Optional[Dict[str, Any]] = None,
+    artifacts_root: Optional[Path] = None,
+    workers: Optional[int] = None,
+) -> Path:
+    """
+    Generate game preview writeups for a given season and date.
+
+    Parameters
+    ----------
+    season, asof : int, str
+        Snapshot to describe; games after ``asof`` are never read.
+    style : str
+        Writeup style; ``game_preview_<style>.j2`` is used when present,
+        otherwise ``game_preview.j2``.
+    db_path : str
+        SQLite database with ingested games and teams.
+    template_dir, export_dir : Path
+        Template directory and output directory.
+    field_path : Path, optional
+        Tournament field CSV (``team_id``, ``slot``, ``play_in``).  Required
+        for ``matchups="bracket"``; limits ``"all"`` to the field.
+    matchups : str
+        ``"bracket"`` for every game of the model's projected bracket or
+        ``"all"`` for every possible pairing.
+    model : str
+        Model whose probabilities drive the picks.
+    model_cfg : dict, optional
+        ``model_defaults`` section of base.yaml.
+    artifacts_root : Path, optional
+        Artifact store; without a stored ``model`` Elo is fit on the snapshot.
+    workers : int, optional
+        Render processes (default: CPU count).
+
+    Returns
+    -------
+    Path
+        The written previews file.
+    """
+    model_cfg = model_cfg or {}
+    games = etl_mod.load_games(db_path, [season], asof)
+    teams = sorted(set(games["home_team_id"]) | set(games["away_team_id"]))
+    team_index = {t: i for i, t in enumerate(teams)}
+    P = _prob_matrix(games, teams, db_path, season, asof, model, model_cfg, artifacts_root)
+    field = pd.read_csv(field_path, dtype={"team_id": str}) if field_path is not None and Path(field_path).exists() else None
+    if matchups == "bracket":
+        if field is None:
+            raise FileNotFoundError(f"Bracket writeups need a field file, got {field_path}")
+        games_df = bracket_matchups(field, team_index, P)
+    elif matchups == "all":
+        rows = [team_index[t] for t in field["team_id"]] if field is not None else list(range(len(teams)))
+        games_df = all_matchups(np.array(sorted(rows), dtype=np.intp))
+    else:
+        raise ValueError(f"Unknown matchups mode '{matchups}'")
+    contexts = build_contexts(games_df, teams, _team_names(db_path, season), feat_mod.team_season_features(games), P, games)
+
+    template_name = f"game_preview_{style}.j2" if (Path(template_dir) / f"game_preview_{style}.j2").exists() else "game_preview.j2"
+    export_file = Path(export_dir) / f"game_previews_{season}_{asof}.txt"
+    tmp = export_file.with_suffix(".txt.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for text in render_writeups(contexts, Path(template_dir), template_name, workers):
+            f.write(text)
+    os.replace(tmp, export_file)
+    logger.info(f"Wrote {len(contexts)} previews to {export_file}")
+    return export_file
@@ -6,6 +6,8 @@ from pathlib import Path
 # Add the project's src/ directory to sys.path so that `import src.*` works
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
+# Keep the tiered cache used by pipeline stages out of the source tree.
+import os
+import tempfile
 
-
-
+os.environ.setdefault("MM_CACHE_DIR", tempfile.mkdtemp(prefix="mm_cache_"))
@@ -0,0 +1,69 @@
+import numpy as np
+
+from src.evaluation import bracket_scoring
+from src.simulation import aggregators, monte_carlo
+
+
+def _bracket(n=8, seed=3):
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(0, 1, n)
+    P = 1 / (1 + np.exp(-(strength[:, None] - strength[None, :])))
+    return [f"T{i}" for i in range(n)], P
+
+
+def test_chunked_aggregates_match_stored_winners():
+    teams, P = _bracket()
+    sims = monte_carlo.simulate_bracket(teams, P, 3_000, seed=1)
+    winners = sims["winners"]
+    picks = winners[:2]
+    points = {"espn": np.array([10, 20, 40])[monte_carlo.game_rounds(8)]}
+    aggs = {
+        "reach": aggregators.RoundReach(8),
+        "f4": aggregators.ChampionFinalFour(8),
+        "meet": aggregators.Meetings(8),
+        "scores": aggregators.ScoreHistogram(8, picks, points),
+        "top": aggregators.TopBrackets(8, k=3, capacity=20),
+    }
+    for chunk in np.array_split(winners, 7):
+        for agg in aggs.values():
+            agg.update(chunk)
+    assert np.allclose(aggs["reach"].result()["advancement"], sims["advancement"])
+    assert np.allclose(aggs["f4"].result()["champion"], sims["advancement"][:, -1])
+    # A team plays in round r exactly when it won in round r - 1.
+    meetings = aggs["meet"].result()["by_round"]
+    assert np.allclose(meetings[1].sum(axis=1), sims["advancement"][:, 0])
+    scores = bracket_scoring.score_matrix(picks, winners, points["espn"])
+    hist = aggs["scores"].result()["espn"]
+    assert hist["histogram"].sum(axis=1).tolist() == [3_000, 3_000]
+    assert np.allclose(hist["mean"], scores.mean(axis=0))
+    # Sketch estimates undercount by at most the reported error.
+    top = aggs["top"].result()
+    keys, counts = np.unique(winners, axis=0, return_counts=True)
+    true = {tuple(k): c / 3_000 for k, c in zip(keys.tolist(), counts)}
+    best = max(true.values())
+    assert abs(top["frequency"][0] - best) <= top["error"] + 1e-12
+    for row, freq in zip(top["brackets"].tolist(), top["frequency"]):
+        assert freq <= true[tuple(row)] <= freq + top["error"] + 1e-12
+
+
+def test_simulate_stream_keeps_only_aggregates():
+    teams, P = _bracket(16)
+    out = monte_carlo.simulate_stream(
+        teams, P, 20_000, seed=5, aggregators={"reach": aggregators.RoundReach(16)}, chunk_size=3_000
+    )
+    assert "winners" not in out and out["n_sims"] == 20_000
+    assert np.allclose(out["reach"]["advancement"].sum(axis=0), [8, 4, 2, 1])
+    exact = monte_carlo.simulate_bracket(teams, P, 200_000, seed=9)["advancement"]
+    assert np.abs(out["reach"]["advancement"] - exact).max() < 0.03
+
+
+def test_final_four_combinations_sum_to_one():
+    teams, P = _bracket(16)
+    winners = monte_carlo.simulate_bracket(teams, P, 2_000, seed=2)["winners"]
+    agg = aggregators.ChampionFinalFour(16)
+    agg.update(winners)
+    combos = agg.result()["final_four"]
+    assert np.isclose(sum(f for _, f in combos), 1.0)
+    top, freq = combos[0]
+    rows = winners[:, monte_carlo.game_rounds(16) == 1]
+    assert np.isclose((rows == np.array(top)).all(axis=1).mean(), freq)
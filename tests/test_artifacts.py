@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.data_acquisition import etl, synthetic
+from src.simulation import artifacts, trainer
+
+
+def test_save_load_roundtrip_is_memory_mapped(tmp_path):
+    arrays = {"team_ids": np.array(["A", "B"]), "ratings": np.array([1510.0, 1490.0])}
+    path = artifacts.save_model(tmp_path, "elo", {"k": 20}, "abc", arrays)
+    assert artifacts.latest_version(tmp_path, "elo") == path.name
+    art = artifacts.load_model(tmp_path, "elo")
+    assert isinstance(art["arrays"]["ratings"], np.memmap)
+    assert art["arrays"]["ratings"].tolist() == [1510.0, 1490.0]
+    assert artifacts.gather_ratings(art, np.array(["B", "Z"])).tolist() == [1490.0, 1500.0]
+
+
+def test_train_then_predict_from_artifacts(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 32, "n_conferences": 4})
+    synthetic.generate_season(2021, tmp_path, {"n_teams": 32, "n_conferences": 4})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020, 2021], tmp_path, db)
+    cfg = {
+        "elo": {"k": 20, "home_adv": 65},
+        "logit": {"C": 1.0, "features": ["adj_o", "adj_d", "sos"]},
+        "bayes": {"prior_strength": 20},
+        "ensemble": {"members": ["elo", "logit", "bayes"], "weights": [0.4, 0.4, 0.2]},
+    }
+    root = tmp_path / "artifacts"
+    written = trainer.train_models(db, [2020], ["elo", "logit", "bayes", "ensemble"], cfg, "isotonic", root)
+    assert set(written) == {"elo", "logit", "bayes", "ensemble"}
+    ens = artifacts.load_model(root, "ensemble")
+    # One training season: logit has no out-of-fold predictions, elo and bayes are blended.
+    assert ens["manifest"]["weights_source"] == "optimized"
+    assert ens["manifest"]["oof_members"] == ["elo", "bayes"]
+    assert np.isclose(np.sum(ens["arrays"]["weights"]), 1.0) and ens["arrays"]["weights"][1] == 0.0
+    teams, mats = trainer.predict_matrices(db, 2021, "2021-03-01", ["elo", "logit", "bayes", "ensemble"], cfg, root)
+    assert set(mats) == {"elo", "logit", "bayes", "ensemble"}
+    for P in mats.values():
+        assert P.shape == (len(teams), len(teams))
+        assert np.allclose(P + P.T, 1.0, atol=1e-5)
+    # Bayes before logit (the `predict --models bayes,logit` order) gives the same matrices.
+    _, again = trainer.predict_matrices(db, 2021, "2021-03-01", ["bayes", "logit"], cfg, root)
+    assert list(again) == ["bayes", "logit"]
+    assert np.allclose(again["logit"], mats["logit"]) and np.allclose(again["bayes"], mats["bayes"])
+
+
+def test_predict_without_artifacts_uses_configured_ensemble(tmp_path):
+    synthetic.generate_season(2021, tmp_path, {"n_teams": 16, "n_conferences": 2})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2021], tmp_path, db)
+    cfg = {
+        "elo": {"k": 20, "home_adv": 65},
+        "bayes": {"prior_strength": 20},
+        "ensemble": {"members": ["elo", "logit", "bayes"], "weights": [0.4, 0.4, 0.2]},
+    }
+    teams, mats = trainer.predict_matrices(db, 2021, "2021-03-01", ["logit", "ensemble"], cfg, None)
+    # No logit coefficients without an artifact: the blend is elo and bayes only.
+    assert set(mats) == {"ensemble"}
+    assert np.allclose(mats["ensemble"] + mats["ensemble"].T, 1.0, atol=1e-5)
+
+
+def test_logit_oof_probs_do_not_see_the_game_result(tmp_path):
+    for season in (2020, 2021):
+        synthetic.generate_season(season, tmp_path, {"n_teams": 16, "n_conferences": 2})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020, 2021], tmp_path, db)
+    games = etl.load_games(db, [2020, 2021])
+    cfg = {"C": 1.0, "features": ["adj_o", "adj_d", "win_pct"]}
+    probs = trainer._member_oof_probs(games, "logit", cfg)
+    # Flip the result of the last game: its own prediction must not move.
+    flipped = games.copy()
+    last = flipped.index[-1:]
+    flipped.loc[last, ["home_score", "away_score"]] = flipped.loc[last, ["away_score", "home_score"]].to_numpy()
+    again = trainer._member_oof_probs(flipped, "logit", cfg)
+    assert np.allclose(probs[last], again[last])
+    # Opening-day games have no prior features: only the intercept is left.
+    first = (games["day"] == games.groupby("season")["day"].transform("min")).to_numpy()
+    assert np.allclose(probs[first & (games["season"] == 2020).to_numpy()], probs[first][0])
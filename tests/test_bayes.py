@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from src.simulation import bayes
+
+
+def _games():
+    return pd.DataFrame(
+        {
+            "season": [2020] * 4,
+            "date": ["2020-01-01", "2020-01-03", "2020-01-03", "2020-01-07"],
+            "home_team_id": ["A", "A", "C", "B"],
+            "away_team_id": ["B", "C", "B", "A"],
+            "home_score": [70, 65, 60, 80],
+            "away_score": [60, 66, 70, 75],
+        }
+    )
+
+
+def test_vectorized_posteriors_match_scalar_updates():
+    cfg = {"prior_strength": 10}
+    post = bayes.bayes_posteriors(_games(), cfg)
+    # A: win, loss, loss -> iterate the scalar update on the posterior mean.
+    mean = 0.5
+    for strength, result in zip([10, 11, 12], [1, 0, 0]):
+        mean = bayes.bayes_update(mean, result, strength)
+    a = post[post["team_id"] == "A"]
+    assert a["date"].tolist() == ["2020-01-01", "2020-01-03", "2020-01-07"]
+    assert np.isclose(a["mean"].iloc[-1], mean)
+
+    asof = bayes.posterior_asof(post, ["A", "B", "Z"], "2020-01-03", cfg)
+    assert asof.loc["B", "alpha"] == 5 + 1 and asof.loc["B", "beta"] == 5 + 1
+    assert asof.loc["Z", "mean"] == 0.5
+
+
+def test_pregame_probs_use_only_prior_games():
+    probs = bayes.pregame_probs(_games(), {"prior_strength": 10})
+    assert probs[0] == 0.5
+    assert probs[1] > 0.5  # A beat B in the opener, C has not played
+    P = bayes.bayes_prob_matrix(np.array([0.7, 0.5, 0.3]))
+    assert np.allclose(P + P.T, 1.0)
+
+
+def test_stored_posteriors_seed_next_season_priors():
+    cfg = {"prior_strength": 10}
+    stored = bayes.train_bayes(_games(), cfg)
+    priors = bayes.team_priors(stored["team_ids"], stored["alpha"], stored["beta"], cfg)
+    assert np.allclose(priors.sum(axis=1), 10.0)
+    nxt = _games().assign(season=2021, date=lambda d: d["date"].str.replace("2020", "2021"))
+    post = bayes.bayes_posteriors(nxt, cfg, priors)
+    # A team's first game of the new season starts from its carried-over prior.
+    b = post[post["team_id"] == "B"].iloc[0]
+    assert np.isclose(b["alpha"], priors.loc["B", "alpha"])
+    asof = bayes.posterior_asof(post, ["C", "Z"], "2021-01-01", cfg, priors)
+    assert np.isclose(asof.loc["C", "mean"], priors.loc["C", "alpha"] / 10)
+    assert asof.loc["Z", "mean"] == 0.5
@@ -0,0 +1,15 @@
+from benchmarks import bench_cli_startup, bench_pipeline
+
+
+def test_benchmark_suite_small_runs_and_compares():
+    report = bench_pipeline.run_suite(list(bench_pipeline.BENCHMARKS), ["small"], measure_memory=False)
+    assert {r["name"] for r in report["results"]} == set(bench_pipeline.BENCHMARKS)
+    assert all(r["seconds"] >= 0 and r["n_items"] > 0 for r in report["results"])
+    rows = bench_pipeline.compare_results(report, report)
+    assert rows and not any(r["regression"] for r in rows)
+
+
+def test_light_subcommand_runs_without_heavy_libraries():
+    [run] = bench_cli_startup.light_runs(repeat=1)
+    assert run["argv"][0] == "backtest" and run["median_s"] > 0
+    assert not set(run["imported"]) & set(bench_cli_startup.FORBIDDEN_IN_LIGHT)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.evaluation import bracket_scoring
 
 
@@ -7,3 +9,13 @@ def test_bracket_scoring_basic():
     config = {"systems": {"espn": {"round_points": [10, 20, 40, 80, 160, 320]}}}
     score = bracket_scoring.score_bracket(picks, truth, "espn", config)
     assert score == 1
+
+
+def test_round_points_and_score_matrix():
+    config = {"systems": {"espn": {"round_points": [10, 20, 40, 80, 160, 320]}}}
+    truth = {"R0G0": "A", "R0G1": "C", "R1G0": "A"}
+    assert bracket_scoring.score_bracket({"R0G0": "A", "R0G1": "D", "R1G0": "A"}, truth, "espn", config) == 30
+    picks = np.array([[0, 2, 0], [1, 3, 3]])
+    outcomes = np.array([[0, 2, 0], [0, 3, 3]])
+    scores = bracket_scoring.score_matrix(picks, outcomes, np.array([10, 10, 20]))
+    assert scores.tolist() == [[40, 0], [10, 30]]
@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import caching
+
+
+def _square_sum(root, n):
+    cache = caching.TieredCache("work", directory=root, memory_bytes=0)
+    return float(cache.get_or_compute(f"k{n % 3}", lambda: np.arange(1000.0) * (n % 3)).sum())
+
+
+def test_round_trips_arrays_frames_and_json(tmp_path):
+    cache = caching.TieredCache("t", directory=tmp_path, memory_bytes=0)
+    df = pd.DataFrame({"team": ["A", "B"], "rating": [1500.0, 1480.5]}, index=[3, 7])
+    cache.put("arr", np.arange(6, dtype=np.float32).reshape(2, 3))
+    cache.put("df", df)
+    cache.put("obj", {"a": [1, 2]})
+    assert cache.get("arr").dtype == np.float32
+    pd.testing.assert_frame_equal(cache.get("df"), df)
+    assert cache.get("obj") == {"a": [1, 2]}
+    assert {p.suffix for p in (tmp_path / "t").rglob("*") if p.is_file() and not p.name.startswith(".")} == {
+        ".npy", ".arrow", ".json"
+    }
+    assert cache.stats["disk_hits"] == 3 and cache.get("nope") is None and cache.stats["misses"] == 1
+
+
+def test_byte_caps_evict_least_recent(tmp_path):
+    cache = caching.TieredCache("t", directory=tmp_path, memory_bytes=2500, disk_bytes=2500)
+    for i in range(4):
+        cache.put(f"k{i}", np.zeros(100))  # 800 bytes each, ~928 on disk
+    assert cache.stats["memory_evictions"] == 1 and cache.stats["memory_bytes"] <= 2500
+    assert cache.stats["disk_evictions"] >= 1 and cache.stats["disk_bytes"] <= 2500
+    assert cache.get("k3") is not None
+
+
+def test_decorator_hashes_array_arguments(tmp_path, monkeypatch):
+    monkeypatch.setattr(caching, "_SETTINGS", dict(caching._SETTINGS))
+    monkeypatch.setattr(caching, "_CACHES", {})
+    monkeypatch.setenv("MM_CACHE_DIR", "unused")
+    caching.configure(str(tmp_path))
+    calls = []
+
+    @caching.disk_cache
+    def total(x):
+        calls.append(1)
+        return x.sum()
+
+    assert total(np.ones(5)) == total(np.ones(5)) == 5.0
+    assert total(np.ones(6)) == 6.0
+    assert len(calls) == 2
+    assert total.cache().stats["memory_hits"] == 1
+
+
+def test_parallel_processes_share_disk_tier(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_square_sum, [tmp_path] * 24, range(24)))
+    assert results == [float(np.arange(1000.0).sum() * (n % 3)) for n in range(24)]
+    assert not [p for p in (tmp_path / "work").rglob(".k*")]
+
+
+def test_pipeline_stages_use_the_tiered_cache(tmp_path, monkeypatch):
+    from src.data_acquisition import synthetic
+    from src.simulation import features
+
+    monkeypatch.setattr(caching, "_SETTINGS", dict(caching._SETTINGS))
+    monkeypatch.setenv("MM_CACHE_DIR", str(tmp_path / "cache"))
+    caching.configure(str(tmp_path / "cache"))
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 12, "n_conferences": 2})
+    games = pd.read_csv(tmp_path / "2020_games.csv")
+    first = features.team_season_features(games)
+    first["adj_o"] = 0.0  # callers get their own copy
+    second = features.team_season_features(games)
+    pd.testing.assert_frame_equal(second, features.team_season_features.__wrapped__(games))
+    stats = features.team_season_features.cache().stats
+    assert stats["misses"] == 1 and stats["memory_hits"] == 1
+
+
+def test_stats_are_consistent_under_threads(tmp_path):
+    cache = caching.TieredCache("t", directory=tmp_path, memory_bytes=0)
+    cache.put("k", np.arange(4))
+
+    def work():
+        for _ in range(200):
+            cache.get("k")
+            cache.get("missing")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.stats["disk_hits"] == cache.stats["misses"] == 800
+
+
+def test_keys_cover_every_value_of_series_and_index():
+    a = pd.Series(np.arange(1000, dtype=float))
+    b = a.copy()
+    b.iloc[500] = -1.0  # same head and tail, so the same truncated repr
+    assert repr(a) == repr(b)
+    assert caching.make_key(a) != caching.make_key(b)
+    assert caching.make_key(pd.Index(a)) != caching.make_key(pd.Index(b))
+    assert caching.make_key(a) == caching.make_key(a.copy())
+    with pytest.raises(TypeError):
+        caching.make_key(object())
@@ -0,0 +1,34 @@
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+
+from src.simulation import calibration
+
+
+def test_isotonic_breakpoints_match_sklearn_and_roundtrip(tmp_path):
+    rng = np.random.default_rng(0)
+    p = rng.random(500)
+    y = (rng.random(500) < p).astype(int)
+    cal = calibration.fit_calibrator(p, y, "isotonic")
+    iso = IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0).fit(p, y)
+    grid = np.linspace(-0.1, 1.1, 101)
+    assert np.allclose(calibration.apply_calibrator(grid, cal), iso.transform(grid))
+    # Matrices keep their shape and dtype
+    mat = rng.random((4, 5)).astype(np.float32)
+    out = calibration.apply_calibrator(mat, cal)
+    assert out.shape == (4, 5) and out.dtype == np.float32
+
+    path = tmp_path / "cal.npz"
+    calibration.save_calibrator(path, cal)
+    loaded = calibration.load_calibrator(path)
+    assert np.array_equal(loaded["x"], cal["x"]) and np.array_equal(loaded["y"], cal["y"])
+
+
+def test_fit_calibrators_by_fold():
+    rng = np.random.default_rng(1)
+    p = rng.random(300)
+    y = (rng.random(300) < p).astype(int)
+    folds = np.repeat([2019, 2020, 2021], 100)
+    cals = calibration.fit_calibrators_by_fold(p, y, folds, "isotonic")
+    assert set(cals) == {2019, 2020, 2021}
+    expected = calibration.fit_calibrator(p[100:], y[100:], "isotonic")
+    assert np.array_equal(cals[2019]["x"], expected["x"])
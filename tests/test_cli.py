@@ -11,3 +11,11 @@ def test_cli_help():
     assert result.returncode == 0
     # The help output should mention some subcommands
     assert "ingest" in result.stdout
+
+
+def test_cli_startup_is_light():
+    from benchmarks import bench_cli_startup
+
+    assert bench_cli_startup.heavy_imports_at_startup() == []
+    # Generous budget so slow CI machines pass; the benchmark enforces the tight one.
+    assert bench_cli_startup.time_invocation(["--help"], repeat=1)["median_s"] < 2.0
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_acquisition import etl, synthetic
+from src.visualization import dashboard_data
+
+
+def test_materialized_snapshot_answers_lookups(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 96, "n_conferences": 8})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    bt = tmp_path / "bt"
+    bt.mkdir()
+    pd.DataFrame({"season": [2019, 2020], "model": ["elo", "elo"], "brier": [0.2, 0.3]}).to_csv(
+        bt / "backtest_summary.csv", index=False
+    )
+    snaps = tmp_path / "snapshots"
+    path = dashboard_data.materialize_snapshot(
+        db, 2020, "2020-03-15", snaps, {"elo": {}}, field_path=tmp_path / "2020_field.csv", backtests_dir=bt, n_sims=2000
+    )
+    [manifest] = dashboard_data.list_snapshots(snaps)
+    assert manifest["path"] == str(path)
+    data = dashboard_data.load_snapshot(path)
+    a, b = data["teams"].index[:2]
+    p = dashboard_data.matchup_prob(data, "elo", a, b)
+    assert abs(p + dashboard_data.matchup_prob(data, "elo", b, a) - 1.0) < 1e-6
+    adv = data["advancement"]["elo"]
+    assert len(adv) == 68
+    assert np.isclose(adv["in_bracket"].sum(), 64)
+    assert np.isclose(adv["champion"].sum(), 1.0)
+    assert data["backtests"].loc[0, "brier"] == 0.25
+
+    # What-if: forcing a team to win the title from the stored field.
+    champ = adv["champion"].idxmin()
+    occupants = dashboard_data.bracket_occupants(data["field"], data["team_index"], data["matchups"]["elo"], [champ])
+    engine = dashboard_data.whatif_engine(data, "elo", occupants)
+    prob, table = dashboard_data.whatif_table(engine, {5: [champ]})
+    assert 0 < prob < 0.01
+    assert table.loc[champ].tolist() == [1.0] * 6
+
+    # Re-materializing unchanged inputs keeps the snapshot hash.
+    dashboard_data.materialize_snapshot(
+        db, 2020, "2020-03-15", snaps, {"elo": {}}, field_path=tmp_path / "2020_field.csv", backtests_dir=bt, n_sims=2000
+    )
+    assert dashboard_data.list_snapshots(snaps)[0]["snapshot"] == manifest["snapshot"]
+
+
+def test_failed_materialize_leaves_no_temp_dir(tmp_path, monkeypatch):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 16, "n_conferences": 2})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    snaps = tmp_path / "snapshots"
+
+    def broken(_):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dashboard_data, "backtest_summary", broken)
+    with pytest.raises(OSError, match="disk full"):
+        dashboard_data.materialize_snapshot(db, 2020, "2020-03-15", snaps, {"elo": {}}, n_sims=100)
+    assert list((snaps / "2020").iterdir()) == []
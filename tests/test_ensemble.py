@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.simulation import ensemble
+
+
+def test_blend_matrix_matches_scalar_blend():
+    probs = {"elo": 0.7, "logit": 0.6, "bayes": 0.4}
+    weights = [0.35, 0.45, 0.20]
+    scalar = ensemble.blend_probs(probs, "weighted", weights)
+    stacked = ensemble.blend_prob_matrix(np.array([[0.7], [0.6], [0.4]]), weights)
+    assert np.isclose(scalar, stacked[0])
+    assert np.isclose(scalar, 0.35 * 0.7 + 0.45 * 0.6 + 0.20 * 0.4)
+    # Logit blend of identical members is the identity
+    same = np.full((3, 5), 0.8)
+    assert np.allclose(ensemble.blend_prob_matrix(same, weights, "logit"), 0.8)
+
+
+def test_optimize_weights_prefers_informative_model():
+    rng = np.random.default_rng(0)
+    truth = rng.random(20000)
+    y = (rng.random(20000) < truth).astype(float)
+    good = np.clip(truth + rng.normal(0, 0.02, truth.size), 0.01, 0.99)
+    noisy = rng.random(20000)
+    P = np.vstack([noisy, good, np.full(truth.size, 0.5)])
+    def log_loss(q):
+        q = np.clip(q, 1e-9, 1 - 1e-9)
+        return -np.mean(y * np.log(q) + (1 - y) * np.log1p(-q))
+
+    for method in ("weighted", "logit"):
+        w = ensemble.optimize_weights(P, y, method)
+        assert np.isclose(w.sum(), 1.0) and (w >= 0).all()
+        assert w[1] > 0.8
+        # The optimum beats equal weights and every single member.
+        best = log_loss(ensemble.blend_prob_matrix(P, w, method))
+        assert best <= log_loss(ensemble.blend_prob_matrix(P, np.full(3, 1 / 3), method))
+        assert all(best <= log_loss(P[i]) + 1e-9 for i in range(3))
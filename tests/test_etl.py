@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.data_acquisition import etl, synthetic
+
+
+def test_chunked_ingest_matches_single_chunk(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 24, "n_conferences": 4})
+    calls = []
+    small = etl.ingest_to_sqlite([2020], tmp_path, str(tmp_path / "small.db"), chunksize=7, progress=calls.append)
+    whole = etl.ingest_to_sqlite([2020], tmp_path, str(tmp_path / "whole.db"))
+    assert small["games"] == whole["games"] > 0
+    assert len(calls) > small["games"] // 7
+    assert calls[-1]["rows"] == small["teams"]
+    a = etl.load_games(str(tmp_path / "small.db"), [2020])
+    b = etl.load_games(str(tmp_path / "whole.db"), [2020])
+    # uids follow first-seen order, so only the id columns must agree
+    uids = ["home_uid", "away_uid"]
+    assert a.drop(columns=uids).equals(b.drop(columns=uids))
+    assert a["day"].dtype == np.int32
+
+
+def test_invalid_row_reports_line(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 24, "n_conferences": 4})
+    path = tmp_path / "2020_games.csv"
+    lines = path.read_text().splitlines()
+    header = lines[0].split(",")
+    row = lines[4].split(",")
+    row[header.index("home_score")] = "7.5"
+    lines[4] = ",".join(row)
+    path.write_text("\n".join(lines) + "\n")
+    db = str(tmp_path / "mm.db")
+    with pytest.raises(ValueError, match=r"home_score on line\(s\) \[5\]"):
+        etl.ingest_to_sqlite([2020], tmp_path, db, chunksize=3)
+    assert len(etl.load_games(db, [2020])) == 0
@@ -11,3 +11,18 @@ def test_head_to_head_features_diff():
     diff = features.head_to_head_features(df, "A", "B")
     assert diff["adj_o_diff"] == 5.0
     assert diff["adj_d_diff"] == -5.0
+
+
+def test_rest_days_uses_day_ordinals():
+    games = pd.DataFrame(
+        {
+            "season": [2020, 2020, 2020],
+            "home_team_id": ["A", "B", "A"],
+            "away_team_id": ["B", "C", "C"],
+            "day": [18300, 18302, 18307],
+        }
+    )
+    rest = features.rest_days(games)
+    assert rest["home_rest"].tolist()[1:] == [2.0, 7.0]
+    assert rest["away_rest"].tolist()[2] == 5.0
+    assert rest["home_rest"].isna().tolist()[0]
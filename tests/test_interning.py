@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from src.data_acquisition import etl, synthetic
+from src.utils import interning
+
+
+def test_factorize_teams_from_string_ids():
+    games = pd.DataFrame({"home_team_id": ["A", "B", "C"], "away_team_id": ["B", "C", "A"]})
+    home, away, ids = interning.factorize_teams(games)
+    assert home.dtype == np.int32
+    assert ids[home].tolist() == ["A", "B", "C"] and ids[away].tolist() == ["B", "C", "A"]
+
+
+def test_factorize_teams_from_db_uids(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 24, "n_conferences": 4})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    games = etl.load_games(db, [2020])
+    assert games["home_uid"].dtype == np.int32
+    home, away, ids = interning.factorize_teams(games)
+    assert np.array_equal(ids[home], games["home_team_id"].to_numpy(dtype=str))
+    assert np.array_equal(ids[away], games["away_team_id"].to_numpy(dtype=str))
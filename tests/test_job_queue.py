@@ -0,0 +1,59 @@
+import time
+
+import pandas as pd
+
+from src.backtesting import job_queue, runner
+
+
+def test_queue_leases_and_checkpoints(tmp_path):
+    path = tmp_path / "q.db"
+    cells = [{"season": s, "model": "elo"} for s in (2019, 2020)]
+    assert job_queue.enqueue(path, cells) == 2
+    assert job_queue.enqueue(path, cells) == 0
+    first = job_queue.claim(path, "w1", lease_s=60)
+    second = job_queue.claim(path, "w2", lease_s=-1)  # already expired
+    assert first["task_id"] != second["task_id"]
+    # w2's lease has lapsed, so w1 can take the cell over and w2's result is dropped.
+    again = job_queue.claim(path, "w1")
+    assert again["task_id"] == second["task_id"] and again["attempts"] == 2
+    assert not job_queue.complete(path, second["task_id"], "w2", {"x": 0})
+    assert job_queue.complete(path, again["task_id"], "w1", {"x": 2})
+    assert job_queue.fail(path, first["task_id"], "w1", "boom", max_attempts=1)
+    assert job_queue.counts(path) == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+    assert job_queue.claim(path, "w1") is None
+    assert job_queue.reset(path) == 1 and job_queue.claim(path, "w1")["task_id"] == first["task_id"]
+
+
+def test_interrupted_queue_run_resumes_to_same_summary(tmp_path):
+    args = ([2018, 2019, 2020], "loso", ["elo", "logit"], ["espn"])
+    grid = {"elo": {"k": [5, 10]}}
+    runner.run_backtest(*args, str(tmp_path / "direct"), seed=7, grid=grid)
+    queue = str(tmp_path / "q.db")
+    out = str(tmp_path / "queued")
+    status = runner.run_backtest_queue(queue, *args, out, seed=7, grid=grid, worker="a", max_tasks=4)
+    assert status["computed"] == 4 and status["pending"] == 5
+    assert not (tmp_path / "queued" / "backtest_summary.csv").exists()
+    status = runner.run_backtest_queue(queue, *args, out, seed=7, grid=grid, worker="b")
+    assert status["computed"] == 5 and status["done"] == 9
+    direct = pd.read_csv(tmp_path / "direct" / "backtest_summary.csv")
+    queued = pd.read_csv(tmp_path / "queued" / "backtest_summary.csv")
+    pd.testing.assert_frame_equal(direct, queued)
+    assert queued.loc[queued["model"] == "elo", "k"].tolist() == [5, 10] * 3
+    # A different seed is a different set of tasks, not a stale checkpoint.
+    status = runner.run_backtest_queue(queue, *args, out, seed=8, grid=grid, worker="c")
+    assert status["computed"] == 9 and status["done"] == 18
+    runner.run_backtest(*args, str(tmp_path / "direct8"), seed=8, grid=grid)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "direct8" / "backtest_summary.csv"), pd.read_csv(tmp_path / "queued" / "backtest_summary.csv")
+    )
+
+
+def test_heartbeat_keeps_a_long_cell_leased(tmp_path):
+    path = tmp_path / "q.db"
+    job_queue.enqueue(path, [{"season": 2020}])
+    task = job_queue.claim(path, "w1", lease_s=0.3)
+    with job_queue.heartbeat(path, task["task_id"], "w1", lease_s=0.3) as lost:
+        time.sleep(0.8)
+        assert job_queue.claim(path, "w2", lease_s=0.3) is None
+    assert not lost.is_set()
+    assert job_queue.complete(path, task["task_id"], "w1", {"ok": 1})
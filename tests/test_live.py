@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.simulation import live, monte_carlo
+
+TEAMS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+
+def _matrix(seed=0):
+    r = np.random.default_rng(seed).uniform(-1.0, 1.0, 8)
+    return 1.0 / (1.0 + np.exp(-(r[:, None] - r[None, :])))
+
+
+def test_conditioning_matches_forced_resimulation():
+    P = _matrix()
+    state = live.LiveBracket(TEAMS, P, 100_000, seed=1, min_ess=1_000)
+    info = state.update({"R0G0": "B", "R0G1": "C"})
+    assert info["completed"] == 2 and not info["topped_up"]
+    exact = monte_carlo.simulate_bracket(TEAMS, P, 200_000, seed=2, forced={0: 1, 1: 2})["advancement"]
+    adv = state.advancement()
+    assert adv[0, 0] == 0.0 and np.isclose(adv[1, 0], 1.0)
+    assert np.allclose(adv, exact, atol=0.015)
+
+
+def test_top_up_and_reweight_keep_odds_consistent(tmp_path):
+    P, Q = _matrix(0), _matrix(1)
+    state = live.LiveBracket(TEAMS, P, 20_000, seed=3)
+    state.update(P=Q)
+    results = {"R0G0": "A", "R0G1": "D", "R0G2": "E", "R0G3": "H", "R1G0": "D"}
+    info = state.update(results)
+    assert info["topped_up"] and info["ess"] >= 5_000
+    exact = monte_carlo.simulate_bracket(TEAMS, Q, 200_000, seed=4, forced={0: 0, 1: 3, 2: 4, 3: 7, 4: 3})
+    assert np.allclose(state.advancement(), exact["advancement"], atol=0.02)
+
+    restored = live.LiveBracket.load(state.save(tmp_path / "live.npz"))
+    assert np.allclose(restored.advancement(), state.advancement())
+    with pytest.raises(ValueError):
+        restored.update({"R2G0": "A"})  # A lost R1G0's feeder path
+
+
+def test_forcing_a_later_round_implies_its_feeders():
+    teams = list("ABCDEFGH")
+    P = np.full((8, 8), 0.5)
+    live_b = live.LiveBracket(teams, P, 2_000, seed=1)
+    live_b.update({"R1G0": "C", "R1G1": "H"})
+    adv = live_b.advancement()
+    assert np.isclose(adv[2, 0], 1.0) and np.isclose(adv[3, 0], 0.0)
+    assert np.isclose(adv[7, 0], 1.0) and np.isclose(adv[2, 1], 1.0)
+    for w in (live_b.winners[live_b.weights > 0],
+              monte_carlo.simulate_bracket(teams, P, 500, 3, forced={4: 2})["winners"]):
+        assert (w[:, 1] == 2).all() and (w[:, 4] == 2).all()
@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.simulation import logit
+
+
+def _data(rng, n_teams=40, n_games=600, k=3):
+    F = rng.normal(size=(n_teams, k)).astype(np.float32)
+    a, b = rng.integers(0, n_teams, size=(2, n_games))
+    X = F[a] - F[b]
+    y = (rng.random(n_games) < 1 / (1 + np.exp(-(X @ np.array([1.0, -0.5, 0.2]))))).astype(int)
+    return F, np.vstack([X, -X]), np.concatenate([y, 1 - y])
+
+
+def test_batch_predictor_matches_sklearn_and_warm_start():
+    rng = np.random.default_rng(0)
+    F, X, y = _data(rng)
+    model = logit.train_logit(X, {"features": ["f0", "f1", "f2"]}, y=y)
+    coef = logit.logit_coefficients(model)
+    a, b = rng.integers(0, len(F), size=(2, 50))
+    expected = model["model"].predict_proba(F[a] - F[b])[:, 1]
+    got = logit.predict_logit_pairs(coef["coef"], coef["intercept"], F, a, b)
+    assert np.allclose(got, expected, atol=1e-5)
+
+    warm = logit.train_logit(X, {"features": ["f0", "f1", "f2"]}, y=y, warm_start=coef)
+    assert np.allclose(logit.logit_coefficients(warm)["coef"], coef["coef"], atol=1e-3)
+    # Started at the optimum, the warm fit needs fewer iterations than the cold one.
+    assert warm["model"].n_iter_[0] < model["model"].n_iter_[0]
+
+
+def test_full_matrix_matches_pairwise_predictor():
+    rng = np.random.default_rng(1)
+    F = rng.normal(size=(363, 9)).astype(np.float32)
+    coef = rng.normal(size=9)
+    P = logit.logit_prob_matrix(coef, np.zeros(1), F)
+    assert P.shape == (363, 363) and np.allclose(P + P.T, 1.0, atol=1e-5)
+    a, b = rng.integers(0, 363, size=(2, 200))
+    assert np.allclose(P[a, b], logit.predict_logit_pairs(coef, np.zeros(1), F, a, b), atol=1e-6)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.simulation import aggregators, monte_carlo
+
+
+def test_simulate_bracket_matches_exact_odds_for_four_teams():
+    teams = ["A", "B", "C", "D"]
+    P = np.array([
+        [0.5, 0.7, 0.6, 0.8],
+        [0.3, 0.5, 0.4, 0.6],
+        [0.4, 0.6, 0.5, 0.9],
+        [0.2, 0.4, 0.1, 0.5],
+    ])
+    res = monte_carlo.simulate_bracket(teams, P, 200_000, seed=7)
+    assert res["winners"].shape == (200_000, 3)
+    assert res["game_ids"] == ["R0G0", "R0G1", "R1G0"]
+    # Exact title odds for A: wins semi (0.7) then beats C (0.9 * 0.6) or D (0.1 * 0.8)
+    exact_a = 0.7 * (0.9 * 0.6 + 0.1 * 0.8)
+    assert abs(res["champion"]["A"] - exact_a) < 0.005
+    assert np.allclose(res["advancement"].sum(axis=0), [2.0, 1.0])
+    # Same seed, same draws
+    again = monte_carlo.simulate_bracket(teams, P, 1_000, seed=7)
+    assert np.array_equal(again["winners"], monte_carlo.simulate_bracket(teams, P, 1_000, seed=7)["winners"])
+
+
+def test_adaptive_simulation_stops_at_target_precision():
+    teams = ["A", "B", "C", "D"]
+    P = np.array([
+        [0.5, 0.7, 0.6, 0.8],
+        [0.3, 0.5, 0.4, 0.6],
+        [0.4, 0.6, 0.5, 0.9],
+        [0.2, 0.4, 0.1, 0.5],
+    ])
+    res = monte_carlo.simulate_bracket(teams, P, 0, seed=3, target_se=0.003, batch_size=2_000)
+    assert res["converged"] and res["max_se"] <= 0.003
+    assert res["n_sims"] == len(res["winners"]) < 10_000_000
+    exact_a = 0.7 * (0.9 * 0.6 + 0.1 * 0.8)
+    assert abs(res["champion"]["A"] - exact_a) < 4 * res["se"][0, -1]
+    # Stratified first round: each batch reproduces the first-round odds closely.
+    assert abs(res["advancement"][0, 0] - 0.7) < 0.002
+    # Common random numbers: a small change to P is measured more precisely than the odds.
+    Q = P.copy()
+    Q[0, 1], Q[1, 0] = 0.72, 0.28
+    cmp = monte_carlo.simulate_adaptive(teams, P, 0.003, seed=3, batch_size=2_000, compare={"q": Q})
+    assert (cmp["compare"]["q"]["difference_se"][:, -1] < cmp["se"][:, -1] / 3).all()
+    assert cmp["compare"]["q"]["difference"][0, 0] > 0
+    # Aggregates only: the same run without keeping every bracket.
+    lean = monte_carlo.simulate_adaptive(
+        teams, P, 0.003, seed=3, batch_size=2_000, aggregators={"reach": aggregators.RoundReach(4)}, keep_winners=False
+    )
+    assert "winners" not in lean and lean["n_sims"] == res["n_sims"]
+    assert lean["reach"]["counts"].sum() == 3 * res["n_sims"]
+    assert np.allclose(lean["reach"]["advancement"], res["advancement"])
@@ -0,0 +1,41 @@
+import numpy as np
+
+from src.evaluation import pool_simulator
+from src.simulation import monte_carlo
+
+CONFIG = {"systems": {"espn": {"round_points": [10, 20, 40, 80, 160, 320]}}}
+
+
+def _pool(n=16, seed=0):
+    teams = [f"T{i}" for i in range(n)]
+    r = np.random.default_rng(seed).normal(0, 150, n)
+    P = 1.0 / (1.0 + 10 ** (-(r[:, None] - r[None, :]) / 400.0))
+    # The public over-picks favourites: shares follow squared chalk odds.
+    winners = monte_carlo.simulate_bracket(teams, P, 20_000, 1)["winners"]
+    public = {}
+    for col, game in enumerate(monte_carlo.game_ids(n)):
+        w = np.bincount(winners[:, col], minlength=n).astype(float) ** 2
+        public[game] = {teams[i]: float(w[i] / w.sum()) for i in np.flatnonzero(w)}
+    return teams, P, public
+
+
+def test_set_winner_keeps_bracket_consistent():
+    teams, P, _ = _pool()
+    chalk = pool_simulator.chalk_bracket(P)
+    for cand in pool_simulator.neighbours(chalk):
+        a, b = monte_carlo.game_participants(cand[None, :], len(teams))
+        assert np.all((cand == a[0]) | (cand == b[0]))
+
+
+def test_optimized_bracket_beats_chalk_in_large_pool():
+    teams, P, public = _pool()
+    res = pool_simulator.optimize_bracket(teams, P, public, "espn", CONFIG, 1000, n_trials=4000, seed=2)
+    assert res["win_prob"] > res["chalk_win_prob"]
+    assert res["pruned"] > 0 and res["evaluated"] > res["pruned"]
+    # Fresh outcomes confirm the gain is not an artefact of the shared trials.
+    chalk = pool_simulator.slots_to_picks(pool_simulator.chalk_bracket(P), teams)
+    fresh = [
+        pool_simulator.simulate_pool(picks, public, ["espn"], 1000, 20_000, teams, P, CONFIG, seed=9)["espn"]["win_prob"]
+        for picks in (res["picks"], chalk)
+    ]
+    assert fresh[0] > fresh[1]
@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+
+from src.cli import main as cli_main
+from src.evaluation import pool_simulator
+from src.simulation import monte_carlo
+from src.utils import profiling
+
+
+def test_nested_spans_record_time_and_peak_memory():
+    prof = profiling.Profiler().activate()
+    try:
+        with profiling.span("outer"):
+            with profiling.span("inner", n=3):
+                block = np.ones(1_000_000)
+            del block
+    finally:
+        prof.deactivate()
+    rows = {r["name"]: r for r in prof.summary()}
+    assert rows["inner"]["n"] == 3
+    assert rows["inner"]["traced_peak_bytes"] >= 8_000_000
+    # The parent's peak includes its children's allocations
+    assert rows["outer"]["traced_peak_bytes"] >= rows["inner"]["traced_peak_bytes"]
+    # Without an active profiler, span is a no-op
+    with profiling.span("ignored"):
+        pass
+    assert len(prof.events) == 2
+
+
+def test_cli_profile_writes_trace(tmp_path):
+    trace = tmp_path / "trace.json"
+    rc = cli_main.main([
+        "--profile", "--profile-out", str(trace),
+        "backtest", "--seasons", "2019-2020", "--models", "elo", "--protocol", "loso",
+        "--scoring_systems", "espn", "--export", str(tmp_path / "bt"),
+    ])
+    assert rc == 0
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert {e["name"] for e in events} == {"backtest", "cli.backtest"}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_pool_simulation_and_scoring_are_spans():
+    teams = [f"T{i}" for i in range(8)]
+    P = np.full((8, 8), 0.5)
+    public = {"R0G0": {"T0": 1.0}}
+    config = {"systems": {"espn": {"round_points": [10, 20, 40]}}}
+    prof = profiling.Profiler().activate()
+    try:
+        with profiling.span("pool"):
+            pool_simulator.pool_context(teams, P, public, "espn", config, 10, 50, n_public=20)
+        monte_carlo.simulate_adaptive(teams, P, 0.05, seed=1, batch_size=100, max_sims=1_000)
+    finally:
+        prof.deactivate()
+    rows = prof.summary()
+    assert [r["name"] for r in rows] == ["simulate", "score", "pool", "simulate"]
+    assert rows[0]["n_sims"] == 50 and rows[0]["n_teams"] == 8
+    assert rows[1]["brackets"] == 20 and rows[1]["trials"] == 50
+    assert rows[3]["max_sims"] == 1_000
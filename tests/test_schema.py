@@ -0,0 +1,33 @@
+import sqlite3
+
+from src.data_acquisition import etl, schema
+from src.utils import dates
+
+
+def test_migration_adds_day_ordinals_to_existing_db(tmp_path):
+    db = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, season INTEGER NOT NULL, date TEXT NOT NULL, "
+        "home_team_id TEXT NOT NULL, away_team_id TEXT NOT NULL, home_score INTEGER NOT NULL, "
+        "away_score INTEGER NOT NULL, neutral INTEGER DEFAULT 0)"
+    )
+    conn.executemany(
+        "INSERT INTO games (season, date, home_team_id, away_team_id, home_score, away_score) VALUES (?, ?, ?, ?, ?, ?)",
+        [(2020, "2020-03-14", "A", "B", 70, 60), (2020, "2020-03-16", "B", "A", 65, 66)],
+    )
+    conn.commit()
+    conn.close()
+
+    schema.init_db(db)
+    schema.init_db(db)  # idempotent
+    games = etl.load_games(db, [2020], "2020-03-15")
+    assert len(games) == 1
+    assert games["day"].tolist() == [dates.day_ordinal(dates.parse_ymd("2020-03-14"))]
+    assert dates.ymd_to_ordinal(["2020-03-14"]).tolist() == games["day"].tolist()
+    conn = sqlite3.connect(db)
+    uids = dict(conn.execute("SELECT team_uid, team_id FROM team_uids").fetchall())
+    assert [uids[u] for u in games[["home_uid", "away_uid"]].to_numpy()[0].tolist()] == ["A", "B"]
+    row = conn.execute("SELECT selection_sunday, selection_sunday_day FROM seasons WHERE season = 2020").fetchone()
+    conn.close()
+    assert row == ("2020-03-15", dates.selection_sunday_ordinal(2020))
@@ -0,0 +1,50 @@
+import os
+import time
+
+import pandas as pd
+
+from src.data_acquisition import etl, snapshot_store, synthetic
+from src.data_cleaning import join_features
+
+
+def test_daily_snapshots_share_unchanged_chunks(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 96, "n_conferences": 8})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    root = tmp_path / "store"
+    first = snapshot_store.write_snapshot(db, 2020, "2020-02-01", root)
+    before = snapshot_store.store_stats(root)["bytes"]
+    join_features.build_feature_table(db, 2020, "2020-02-04")
+    second = snapshot_store.write_snapshot(db, 2020, "2020-02-04", root)
+    # Only the week(s) touched by the new games and the feature blocks are new.
+    assert 0 < second["chunks_written"] < len(second["tables"]["games"]["chunks"])
+    assert snapshot_store.store_stats(root)["bytes"] - before < before
+
+    games = snapshot_store.read_table(root, 2020, "2020-02-04", "games")
+    pd.testing.assert_frame_equal(games, etl.load_games(db, [2020], "2020-02-04"))
+    feats = snapshot_store.read_table(root, 2020, "2020-02-04", "team_features")
+    assert (feats["asof_date"] == "2020-02-04").all() and len(feats) == 96
+    assert snapshot_store.read_table(root, 2020, "2020-02-01", "team_features").empty
+    assert first["tables"]["games"]["chunks"][0] == second["tables"]["games"]["chunks"][0]
+
+    snapshot_store.manifest_path(root, 2020, "2020-02-01").unlink()
+    # Fresh unreferenced chunks may belong to a snapshot still being written.
+    assert snapshot_store.gc(root)["removed"] == 0
+    assert snapshot_store.gc(root, grace_s=0)["removed"] > 0
+    assert len(snapshot_store.read_table(root, 2020, "2020-02-04", "games")) == len(games)
+
+
+def test_reused_chunks_are_refreshed_for_gc(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 16, "n_conferences": 2})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    root = tmp_path / "store"
+    snapshot_store.write_snapshot(db, 2020, "2020-02-01", root)
+    old = time.time() - 2 * snapshot_store.GC_GRACE_S
+    for path in root.glob("objects/*/*.arrow"):
+        os.utime(path, (old, old))
+    # Between gc listing manifests and deleting objects, a writer reuses the chunks.
+    snapshot_store.manifest_path(root, 2020, "2020-02-01").unlink()
+    snapshot_store.write_snapshot(db, 2020, "2020-02-02", root)
+    snapshot_store.manifest_path(root, 2020, "2020-02-02").unlink()
+    assert snapshot_store.gc(root)["removed"] == 0
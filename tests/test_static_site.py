@@ -0,0 +1,35 @@
+import gzip
+import json
+import shutil
+
+from src.data_acquisition import etl, synthetic
+from src.visualization import dashboard_data, static_site
+
+
+def test_static_build_is_incremental(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 32, "n_conferences": 4})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    snaps, site = tmp_path / "snapshots", tmp_path / "site"
+    for asof in ("2020-01-15", "2020-02-15"):
+        dashboard_data.materialize_snapshot(db, 2020, asof, snaps, {"elo": {}})
+
+    assert static_site.build_static(snaps, site) == {"built": 2, "skipped": 0, "pruned": 0}
+    assert static_site.build_static(snaps, site) == {"built": 0, "skipped": 2, "pruned": 0}
+
+    index = json.loads((site / "data" / "index.json").read_text())
+    entry = index["snapshots"][0]
+    with gzip.open(site / entry["base"] / entry["shards"]["matchups_elo"]) as f:
+        matrix = json.load(f)
+    with gzip.open(site / entry["base"] / entry["shards"]["teams"]) as f:
+        assert len(json.load(f)["team_id"]) == len(matrix)
+    assert (site / "index.html").exists()
+
+    shutil.rmtree(dashboard_data.snapshot_dir(snaps, 2020, "2020-01-15"))
+    assert static_site.build_static(snaps, site) == {"built": 0, "skipped": 1, "pruned": 1}
+
+
+def test_page_renders_shard_values_as_text():
+    # Team names and other shard values must never be parsed as markup.
+    page = static_site.PAGE.read_text()
+    assert "innerHTML" not in page and "textContent = v" in page
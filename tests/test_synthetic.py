@@ -0,0 +1,19 @@
+import pandas as pd
+
+from src.data_acquisition import synthetic
+
+
+def test_generate_season_is_deterministic_and_d1_sized(tmp_path):
+    summary = synthetic.generate_season(2020, tmp_path / "a")
+    synthetic.generate_season(2020, tmp_path / "b")
+    games_a = (tmp_path / "a" / "2020_games.csv").read_bytes()
+    assert games_a == (tmp_path / "b" / "2020_games.csv").read_bytes()
+
+    assert summary["n_teams"] == 360
+    assert 5000 <= summary["n_regular_games"] <= 6000
+    assert summary["n_tournament_games"] == 67
+    field = pd.read_csv(tmp_path / "a" / "2020_field.csv")
+    assert len(field) == 68 and field["slot"].nunique() == 64
+    games = pd.read_csv(tmp_path / "a" / "2020_games.csv")
+    assert (games["home_score"] != games["away_score"]).all()
+    assert games["date"].is_monotonic_increasing
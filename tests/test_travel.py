@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.data_acquisition import etl, synthetic
+from src.data_cleaning import travel
+from src.utils import geo
+
+
+def test_travel_matrix_matches_scalar_haversine_and_is_cached(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 24, "n_conferences": 4})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    snaps = tmp_path / "snapshots"
+    mat = travel.season_travel(db, 2020, snaps)
+    assert mat["km"].shape == (24, synthetic.N_VENUES)
+    locs = etl.load_coordinates(db, "team_locations", 2020).set_index("team_id")
+    venues = etl.load_coordinates(db, "venues", 2020).set_index("venue_id")
+    team, venue = "D007", "V03"
+    expected = geo.haversine_km(locs.at[team, "lat"], locs.at[team, "lon"], venues.at[venue, "lat"], venues.at[venue, "lon"])
+    assert np.isclose(travel.travel_km(mat, [team], [venue])[0], expected, rtol=1e-5)
+    assert np.isnan(travel.travel_km(mat, ["nobody"], [venue])[0])
+    empty = {"team_ids": np.array([], dtype=str), "venue_ids": np.array([], dtype=str), "km": np.zeros((0, 0))}
+    assert np.isnan(travel.travel_km(empty, [team, team], [venue, venue])).all()
+    assert travel.matchup_travel(mat, [team], [team], [venue])[0] == 0.0
+
+    # Second call loads the cached file written next to the snapshots.
+    stamp = (snaps / "2020" / travel.TRAVEL_FILE).stat().st_mtime_ns
+    again = travel.season_travel(db, 2020, snaps)
+    assert (snaps / "2020" / travel.TRAVEL_FILE).stat().st_mtime_ns == stamp
+    assert np.array_equal(again["km"], mat["km"])
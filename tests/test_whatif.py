@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.simulation import monte_carlo, whatif
+
+TEAMS = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+
+def _matrix(n, seed=0):
+    r = np.random.default_rng(seed).normal(size=n)
+    return 1.0 / (1.0 + np.exp(-(r[:, None] - r[None, :])))
+
+
+def test_unconditional_and_forced_odds_match_simulation():
+    P = _matrix(8)
+    engine = whatif.WhatIf(TEAMS, P)
+    base = engine.query({})
+    assert np.isclose(base["probability"], 1.0)
+    sims = monte_carlo.simulate_bracket(TEAMS, P, 400_000, seed=1)
+    assert np.allclose(base["advancement"], sims["advancement"], atol=0.005)
+
+    # Forcing a later game also reshapes the odds inside the opposing subtree.
+    res = engine.query({"R0G2": "F", "R1G0": "C"})
+    forced = monte_carlo.simulate_bracket(TEAMS, P, 400_000, seed=2, forced={2: 5})
+    w = forced["winners"]
+    keep = w[:, 4] == 2  # condition on C winning R1G0 by rejection
+    for r, cols in enumerate([[0, 1, 2, 3], [4, 5], [6]]):
+        counts = np.stack([np.bincount(w[keep][:, c], minlength=8) for c in cols]).sum(axis=0)
+        assert np.allclose(res["advancement"][:, r], counts / keep.sum(), atol=0.006)
+    assert np.isclose(res["probability"], (forced["winners"][:, 4] == 2).mean() * P[5, 4], atol=0.005)
+
+
+def test_sixty_four_team_queries_reuse_memoized_subtrees():
+    teams = [f"T{i}" for i in range(64)]
+    engine = whatif.WhatIf(teams, _matrix(64))
+    engine.query({})
+    base = len(engine._up_cache)
+    assert base == len(engine.game_ids)
+    scenario = {"R0G0": "T1", "R0G17": "T35", "R2G3": "T30"}
+    out = engine.query(scenario)
+    # Only the games on the forced results' paths to the final are recomputed.
+    added = len(engine._up_cache) - base
+    assert 0 < added <= 3 * 6
+    # A repeated query is answered entirely from the memo.
+    engine.query(scenario)
+    assert len(engine._up_cache) == base + added
+    assert np.isclose(out["advancement"][:, -1].sum(), 1.0)
+    assert out["advancement"][1, 0] == 1.0 and out["advancement"][0].sum() == 0.0
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from src.data_acquisition import etl, synthetic
+from src.writeups import generator
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "src" / "writeups" / "templates"
+
+
+def test_bracket_writeups_cover_every_game(tmp_path):
+    synthetic.generate_season(2020, tmp_path, {"n_teams": 96, "n_conferences": 8})
+    db = str(tmp_path / "mm.db")
+    etl.ingest_to_sqlite([2020], tmp_path, db)
+    out = generator.generate_game_writeups(
+        2020, "2020-03-15", "stats-heavy", db, TEMPLATES, tmp_path, field_path=tmp_path / "2020_field.csv", workers=1
+    )
+    text = out.read_text(encoding="utf-8")
+    assert text.count("Model pick") == 67
+    assert text.startswith("First Four")
+    assert "Championship" in text
+
+
+def test_parallel_render_matches_serial():
+    ctx = {
+        "round_name": "Round of 64", "team_a_name": "A", "team_b_name": "B", "pick": "A", "prob_pick": 0.6,
+        "confidence_label": "medium", "key_factors_sentence": "k", "x_factors_sentence": "x", "historical_note": "h",
+    }
+    contexts = [dict(ctx, team_b_name=f"B{i}") for i in range(50)]
+    serial = "".join(generator.render_writeups(contexts, TEMPLATES, "game_preview.j2", workers=1, chunk_size=8))
+    parallel = "".join(generator.render_writeups(contexts, TEMPLATES, "game_preview.j2", workers=2, chunk_size=8))
+    assert serial == parallel
+    assert serial.count("Model pick") == 50